@@ -33,17 +33,34 @@
 #     Levels are created by loading level files that contain the information for each object
 #     Bad inputs in the files are handled properly and won't crash the program
 #-----------------------------------------------------------------------------
+import warnings
+from collections import deque
 import pygame
 import serial
 import serial.tools.list_ports as list_ports
 
 from moveable import *
 from wall import Wall
+from wall_compiler import compileWalls
+from gate import Gate
 from button import Button
 from attractor import Attractor
 from scene import Scene
 from goal import Goal
 from decal import Decal
+from spatial_hash import SpatialHash
+from neighbour_list import NeighbourList
+from wall_grid import WallGrid
+from ray_caster import getWallEdges, getEdges, castAvoidanceRays
+from distance_field import DistanceField
+from flow_field import loadFlowFields
+from quadtree import QuadTree
+from separation_solver import SeparationSolver
+from threat_map import ThreatMap
+from goal_capture import GoalGrid, captureSheep
+from herd_groups import HerdGroups
+from herd import Herd
+from parallel_herd import ParallelHerd
 
 pygame.init()
 
@@ -62,6 +79,85 @@ SUBTITLETEXT = pygame.font.SysFont("Impact", 40)
 LARGETEXT = pygame.font.SysFont("Impact", 25)
 SMALLTEXT = pygame.font.SysFont("Impact", 20)
 TINYTEXT = pygame.font.SysFont("Impact", 15)
+
+# Simulation
+# If True the herd is stored in arrays and moved all at once instead of one Sheep at a time
+USEHERDENGINE = False
+
+# If more than 0 the herd engine runs the movement algorithm in this many worker processes
+HERDPROCESSES = 0
+
+# The number of times the game is simulated each second, independent of the frame rate
+SIMULATIONRATE = 60
+SIMULATIONSTEP = 1 / SIMULATIONRATE
+
+# The most time that will be simulated in one frame
+MAXFRAMETIME = 0.25
+
+# Each sheep applies its movement algorithm every STEERINGINTERVAL simulation steps
+# The herd takes turns so only 1 / STEERINGINTERVAL of the sheep steer each step
+STEERINGINTERVAL = 1
+
+# If True sheep far from the sheepdogs are updated less often and calm, still sheep fall asleep until a sheepdog comes close
+LEVELOFDETAIL = False
+
+# If more than 0 each sheep only uses this many of its nearest sheep for cohesion and alignment
+# This limits the work each sheep does when the herd is crowded together
+TOPOLOGICALNEIGHBOURS = 0
+
+# If more than 0 each sheep keeps a list of the sheep within its visual range plus this distance
+# The lists are only rebuilt once a sheep has moved more than half of this distance
+NEIGHBOURSKIN = 0
+
+# If more than 0 groups of sheep are used for cohesion and alignment instead of each sheep
+# Groups on the edge of a sheep's visual range are used if their size / distance is less than this
+# Larger values are faster but less accurate
+FARFIELDACCURACY = 0
+
+# If True every sheep reads the positions, rotations and fear of the herd from the start of
+# the simulation step, so the result does not depend on the order the sheep are updated in
+DOUBLEBUFFER = False
+
+# Size of the cells used to find the walls near a position
+WALLGRIDCELLSIZE = 50
+
+# If True the wall avoidance rays of the whole herd are cast at once at the start of each simulation step
+# instead of each sheep casting its own rays after it moves
+BATCHWALLRAYS = False
+
+# If more than 0 the distance to the nearest wall is found on a grid with cells of this size when a level is loaded
+# Sheep steer away from the nearest wall instead of casting rays and collisions are skipped far from walls
+WALLFIELDCELLSIZE = 0
+
+# If True sheep and sheepdogs stop where they first touch a wall instead of being pushed out after they move
+# This stops fast objects from passing through thin walls when the simulation rate is low
+SWEPTCOLLISIONS = False
+
+# If more than 0 overlapping sheep are pushed apart, and out of the sheepdogs, after they move
+# Each pass can push sheep into others so more passes leave fewer overlaps in crowded herds
+SEPARATIONITERATIONS = 0
+
+# If more than 0 the shortest paths around the walls to each attractor and goal are found on a grid with cells of this size
+# Calm sheep follow the path to their attraction point when it is too far away or behind a wall
+# The paths are saved next to the level file so they are only found again when the level changes
+# When a gate opens, closes or moves only the paths through it are found again
+FLOWFIELDCELLSIZE = 0
+
+# How far the paths stay from the walls
+FLOWFIELDCLEARANCE = 10
+
+# If more than 0 the nearest sheepdog to each cell of a grid with cells of this size is found once each simulation step
+# Sheep look up the nearest sheepdog in their cell instead of testing every sheepdog
+THREATMAPCELLSIZE = 0
+
+# Size of the cells used to find the goal a sheep is in
+GOALGRIDCELLSIZE = 50
+
+# How long a capture is shown on the HUD for
+CAPTUREDISPLAYTIME = 2
+
+# If True the groups of sheep that can see each other are found every frame and their number is shown on the HUD
+HERDGROUPS = False
  
 # findMicrobitComPort function code by Mr. Brooks
 def findMicrobitComPort(pid=516, vid=3368, baud=115200):
@@ -164,7 +260,16 @@ def loadLevel(filepath):
         The sheep that are in the level.
     
     List<Wall()>
-        The walls that are in the level.
+        The walls that are in the level, including gates.
+    
+    WallGrid()
+        A grid containing the walls, used to find the walls near a position.
+    
+    DistanceField() or None
+        The distance to the nearest wall, or None if WALLFIELDCELLSIZE is 0.
+    
+    FlowFields() or None
+        The paths to the attractors and goals, or None if FLOWFIELDCELLSIZE is 0.
     
     List<Attractor()>
         The attractots that are in the level.
@@ -193,6 +298,7 @@ def loadLevel(filepath):
     sheepdogs = []
     herd = []
     walls = []
+    gates = []
     attractors = []
     goals = []
     decals = []
@@ -248,6 +354,17 @@ def loadLevel(filepath):
                     
                 walls.append(Wall([int(lineInfo[1]), int(lineInfo[2]), int(lineInfo[3]), int(lineInfo[4])], WALLCOLOR))
             
+            # If that line is a gate
+            # Make a new gate and add it to the gates list
+            # A gate with 2 more parameters is a fence that slides by them when it opens
+            elif(lineInfo[0] == 'gate'):
+                # If the line does not contain 7 or 9 parameters then raise an error
+                if(not len(lineInfo) in (7, 9)):
+                    raise ValueError(f'Gates must have 7 or 9 parameters not {len(lineInfo)}')
+                
+                offset = [int(lineInfo[7]), int(lineInfo[8])] if len(lineInfo) == 9 else [0, 0]
+                gates.append(Gate([int(lineInfo[1]), int(lineInfo[2]), int(lineInfo[3]), int(lineInfo[4])], WALLCOLOR, float(lineInfo[5]), int(lineInfo[6]), offset))
+            
             # If that line is an attractor
             # Make a new attractor and add it to the attractors list
             elif(lineInfo[0] == 'attractor'):
@@ -295,7 +412,267 @@ def loadLevel(filepath):
         sheepdogs = [Moveable(pygame.image.load('img//dog1.png'), [0, 0]),
                      Moveable(pygame.image.load('img//dog2.png'), [0, 0])]
     
-    return(gameScene, timeToComplete, sheepdogs, herd, walls, attractors, goals, decals)
+    # Join walls that overlap and remove the edges that can not be reached
+    # Gates are not joined since they can open and move
+    walls, wallEdges, removedWalls, removedEdges = compileWalls(walls)
+    print(f'Compiled walls: removed {removedWalls} walls and {removedEdges} edges, {len(walls)} walls and {len(wallEdges)} edges left')
+    walls += gates
+    
+    # Walls are put in the grid once and only gates are updated after they change
+    wallGrid = WallGrid(walls, WALLGRIDCELLSIZE)
+    wallField = DistanceField(walls, gameScene.surfaceSize, WALLFIELDCELLSIZE) if WALLFIELDCELLSIZE > 0 else None
+    
+    # Paths to each attractor and goal, stored in their flowField
+    flowFields = loadFlowFields(filepath, walls, wallGrid, gameScene.surfaceSize, FLOWFIELDCELLSIZE, FLOWFIELDCLEARANCE, attractors + goals) if FLOWFIELDCELLSIZE > 0 else None
+    
+    return(gameScene, timeToComplete, sheepdogs, herd, walls, wallGrid, wallField, flowFields, attractors, goals, decals)
+
+def initializeLevel(levelData, herdProcesses):
+    '''
+    Initializes a level
+
+    Set up the objects loaded from a level file and build the structures used to
+    simulate them, using the settings at the top of this file.
+    
+    Parameters
+    ----------
+    levelData: tuple
+        The values returned by loadLevel.
+        
+    herdProcesses: int
+        The number of worker processes used by the herd engine, 0 to use this process.
+        
+    Returns
+    -------
+    Dictionary<str, dynamic>
+        The state of the level, used by simulateStep and to draw the level.
+        
+    Raises:
+    -------
+    ValueError
+        If USEHERDENGINE is True with a setting that only changes how each Sheep moves.
+    '''
+    gameScene, timeToComplete, sheepdogs, herd, walls, wallGrid, wallField, flowFields, attractors, goals, decals = levelData
+    
+    # The herd engine moves the herd with its own algorithm and does not use these settings
+    if(USEHERDENGINE):
+        sheepSettings = {'STEERINGINTERVAL':not STEERINGINTERVAL == 1, 'LEVELOFDETAIL':LEVELOFDETAIL,
+                         'TOPOLOGICALNEIGHBOURS':TOPOLOGICALNEIGHBOURS > 0, 'NEIGHBOURSKIN':NEIGHBOURSKIN > 0,
+                         'FARFIELDACCURACY':FARFIELDACCURACY > 0, 'SEPARATIONITERATIONS':SEPARATIONITERATIONS > 0,
+                         'THREATMAPCELLSIZE':THREATMAPCELLSIZE > 0}
+        unusedSettings = [name for name, isSet in sheepSettings.items() if isSet]
+        if(not len(unusedSettings) == 0): raise ValueError(f'{", ".join(unusedSettings)} can not be used with USEHERDENGINE')
+        
+        # These are still used by the sheepdogs and the goals
+        sheepdogSettings = {'WALLFIELDCELLSIZE':WALLFIELDCELLSIZE > 0, 'SWEPTCOLLISIONS':SWEPTCOLLISIONS, 'FLOWFIELDCELLSIZE':FLOWFIELDCELLSIZE > 0}
+        for name, isSet in sheepdogSettings.items():
+            if(isSet): warnings.warn(f'{name} is not used by the herd engine, only by the sheepdogs and goals')
+    
+    # Distances further than this from a wall are not used to steer or skip collisions
+    wallFieldMargin = max([sheep.avoidanceRange for sheep in herd] + [moveable.size * 2 for moveable in sheepdogs + herd], default = 0) + WALLFIELDCELLSIZE
+    
+    for moveable in sheepdogs + herd:
+        moveable.sweepCollisions = SWEPTCOLLISIONS
+    
+    # Give each sheep a turn to steer in order
+    for sheepNumber, sheep in enumerate(herd):
+        sheep.steeringInterval = STEERINGINTERVAL
+        sheep.steeringCounter = sheepNumber % STEERINGINTERVAL
+        sheep.topologicalNeighbours = TOPOLOGICALNEIGHBOURS
+        sheep.applyLevelOfDetail = LEVELOFDETAIL
+    
+    # Grid used to find nearby sheep
+    # The cells are sized to the visual range so a search never walks through many empty cells
+    if(TOPOLOGICALNEIGHBOURS > 0 or FARFIELDACCURACY > 0):
+        # Searches for the nearest sheep stop once enough sheep are found, so cells a quarter of the
+        # visual range wide only search a few cells in a crowd and at most 9x9 cells when the herd is spread out
+        herdGrid = SpatialHash(max([max(sheep.visualRange, sheep.seperationDistance) for sheep in herd], default = 200) / 4)
+    else:
+        # Cells the size of the visual range are best for finding every sheep in range
+        herdGrid = SpatialHash(max([max(sheep.visualRange, sheep.seperationDistance) for sheep in herd], default = 200))
+    
+    # Lists of the sheep near each sheep that are reused between frames
+    if(NEIGHBOURSKIN > 0):
+        herdGrid.build(herd)
+        neighbourList = NeighbourList(max([max(sheep.visualRange, sheep.seperationDistance) for sheep in herd], default = 200), NEIGHBOURSKIN)
+        neighbourList.build(herd, herdGrid)
+    else:
+        neighbourList = None
+    
+    # Grid of the nearest sheepdog, covering every distance the sheep compare with the nearest sheepdog
+    if(THREATMAPCELLSIZE > 0):
+        threatRadius = max([max(sheep.fearDistance + sheep.wakeMargin, sheep.reducedUpdateDistance, sheep.sleepDistance) for sheep in herd], default = 0)
+        threatMap = ThreatMap(gameScene.surfaceSize, THREATMAPCELLSIZE, threatRadius)
+    else:
+        threatMap = None
+    
+    # Each gate is stored with its first row of wallEdges so its rows can be found without a search
+    gates = []
+    edgeRow = 0
+    for wall in walls:
+        if(isinstance(wall, Gate)): gates.append((edgeRow, wall))
+        edgeRow += len(getWallEdges(wall))
+    
+    level = {
+        'scene':gameScene,
+        'timeToComplete':timeToComplete,
+        'timeLeft':timeToComplete,
+        'sheepdogs':sheepdogs,
+        'herd':herd,
+        'herdSize':len(herd),
+        'walls':walls,
+        'wallGrid':wallGrid,
+        'wallField':wallField,
+        'flowFields':flowFields,
+        'wallFieldMargin':wallFieldMargin,
+        # Edges of the walls used to cast the rays of the whole herd at once
+        'wallEdges':getEdges(walls),
+        # Gates change during the level so the structures built from the walls are updated around them
+        'gates':gates,
+        'attractors':attractors,
+        'goals':goals,
+        'decals':decals,
+        'herdGrid':herdGrid,
+        'neighbourList':neighbourList,
+        'threatMap':threatMap,
+        # Grid used to find the goal each sheep is in
+        'goalGrid':GoalGrid(goals, GOALGRIDCELLSIZE),
+        # (captureTime, goal, sheepCount) of the captures from the last CAPTUREDISPLAYTIME seconds, oldest first
+        'captureEvents':deque(),
+        # Groups of sheep that can see each other, shown on the HUD
+        'herdGroups':HerdGroups(max([sheep.visualRange for sheep in herd], default = 200)) if HERDGROUPS else None,
+        'separationSolver':SeparationSolver(SEPARATIONITERATIONS) if SEPARATIONITERATIONS > 0 else None
+        }
+    
+    # Move the sheep into the herd engine
+    if(USEHERDENGINE and herdProcesses > 0):
+        level['herd'] = ParallelHerd(herd, attractors, walls, herdProcesses)
+    elif(USEHERDENGINE):
+        level['herd'] = Herd(herd)
+    
+    return(level)
+
+def simulateStep(level, deltatime, sheepdogInputs):
+    '''
+    Simulates a level for one step
+
+    Move the sheepdogs by their inputs, update the gates, sheepdogs and herd, then
+    capture the sheep that reached a goal.
+    
+    Parameters
+    ----------
+    level: Dictionary<str, dynamic>
+        The state of the level returned by initializeLevel.
+        
+    deltatime: float
+        The time of the step.
+        
+    sheepdogInputs: List<List<float> or None>
+        [rotate, accelerate] for each sheepdog, from -1 to 1, or None if a sheepdog has no input.
+        
+    Returns
+    -------
+    int
+        The number of sheep captured during the step.
+    '''
+    sheepdogs = level['sheepdogs']
+    herd = level['herd']
+    walls = level['walls']
+    attractors = level['attractors']
+    wallGrid = level['wallGrid']
+    wallField = level['wallField']
+    herdGrid = level['herdGrid']
+    neighbourList = level['neighbourList']
+    threatMap = level['threatMap']
+    
+    # Store the state before the step so it can be interpolated when drawing
+    for sheepdog in sheepdogs:
+        sheepdog.saveState()
+    
+    if(USEHERDENGINE):
+        herd.saveState()
+    else:
+        for sheep in herd: sheep.saveState()
+    
+    # Rotate and move the sheepdogs according to the inputs
+    for sheepdog, sheepdogInput in zip(sheepdogs, sheepdogInputs):
+        if(sheepdogInput == None): continue
+        
+        rotateDirection, accelerateDirection = sheepdogInput
+        if(not rotateDirection == 0): sheepdog.rotate(rotateDirection, deltatime)
+        sheepdog.accelerate(accelerateDirection, deltatime)
+    
+    # Open, close and move gates then update the walls near them
+    for edgeRow, gate in level['gates']:
+        changedArea = gate.update(deltatime, level['herdSize'] - len(herd))
+        if(changedArea == None): continue
+        
+        wallGrid.update(gate)
+        gateEdges = getWallEdges(gate)
+        level['wallEdges'][edgeRow:edgeRow + len(gateEdges)] = gateEdges
+        if(not wallField == None): wallField.update(wallGrid, changedArea, level['wallFieldMargin'])
+        
+        # Only the paths through the changed area are found again
+        if(not level['flowFields'] == None): level['flowFields'].update(wallGrid, changedArea)
+    
+    # Update sheep and sheepdogs
+    for sheepdog in sheepdogs:
+        sheepdog.update(walls, deltatime, wallGrid, wallField)
+    
+    if(USEHERDENGINE):
+        # Move the whole herd at once
+        herd.update(sheepdogs, attractors, walls, deltatime)
+    else:
+        # Bucket the herd so each sheep only looks at the sheep near it
+        herdGrid.build(herd)
+        
+        # Find the nearest sheepdog to each part of the level
+        if(not threatMap == None): threatMap.build(sheepdogs)
+        
+        # Find the walls in front of every sheep at once
+        if(BATCHWALLRAYS): castAvoidanceRays(herd, level['wallEdges'])
+        
+        # Sum the positions and rotations of groups of sheep for cohesion and alignment
+        herdTree = QuadTree(herd, FARFIELDACCURACY) if FARFIELDACCURACY > 0 else None
+    
+        # Update every sheep into its back buffer then move them all at once
+        if(DOUBLEBUFFER):
+            for sheep in herd:
+                sheep.updateBackBuffer(herd, sheepdogs, attractors, walls, deltatime, herdGrid, neighbourList, herdTree, wallGrid, wallField, threatMap)
+            
+            for sheep in herd:
+                sheep.swapBuffers()
+    
+        for sheep in herd:
+            if(not DOUBLEBUFFER):
+                sheep.update(herd, sheepdogs, attractors, walls, deltatime, herdGrid, neighbourList, herdTree, wallGrid, wallField, threatMap)
+            
+            # Keep the grid up to date for the sheep that are updated after this one
+            herdGrid.update(sheep)
+            
+            # Rebuild the neighbour lists if this sheep has moved too far
+            if(not neighbourList == None): neighbourList.update(sheep, herd, herdGrid)
+        
+        # Push apart the sheep that moved into each other or into a sheepdog
+        if(not level['separationSolver'] == None): level['separationSolver'].solve(herd, sheepdogs, walls, wallGrid, wallField)
+    
+    # Remove every sheep that has reached a goal from the game
+    sheepLeft = len(herd)
+    capturedSheep, newCaptureEvents = captureSheep(herd, level['goalGrid'], level['timeToComplete'] - level['timeLeft'])
+    level['captureEvents'].extend(newCaptureEvents)
+    
+    for sheep in capturedSheep:
+        herdGrid.remove(sheep)
+        if(not neighbourList == None): neighbourList.remove(sheep)
+    
+    # Deincrement the time
+    level['timeLeft'] -= deltatime
+    
+    # Forget the captures that are no longer shown
+    while(len(level['captureEvents']) > 0 and level['timeToComplete'] - level['timeLeft'] - level['captureEvents'][0][0] >= CAPTUREDISPLAYTIME):
+        level['captureEvents'].popleft()
+    
+    return(sheepLeft - len(herd))
 
 # Function addButtonColumn taken from maze-game project
 def addButtonColumn(buttonsToAdd, buttonInfo):
@@ -544,19 +921,8 @@ def main():
     
     clock = pygame.time.Clock()
     
-    gameScene = None
-    
-    # Game variables
-    timeToCompleteLevel = 40
-    timeLeft = 0
-    
-    # Gameobjects
-    sheepdogs = []
-    attractors = []
-    herd = []
-    walls = []
-    goals = []
-    decals = []
+    # The state of the level being played
+    level = None
     
     # Buttons
     gameStateButtons = []
@@ -571,8 +937,12 @@ def main():
     isDPressed = False
     
     microbit = None
+    microbitInput = [0, 0]
     THRESHOLD = 100
     
+    # Time that has passed but has not been simulated yet
+    simulationTime = 0
+    
     gameState = 'initializeMain'
     play = True
     while(play):
@@ -587,6 +957,9 @@ def main():
                 # exit the loop
                 play = False
         
+        # Stop the worker processes of the herd as soon as the level is left
+        if(not gameState in ('initializeGame', 'initializeMicrobit', 'game') and not level == None and isinstance(level['herd'], ParallelHerd)): level['herd'].close()
+
         # MAIN MENU
         if(gameState == 'initializeMain'):
             # Make Buttons: Start, Help, Quit
@@ -751,10 +1124,13 @@ def main():
                 gameState = 'initializeLevelSelect'
                 continue
             
-            gameScene, timeToCompleteLevel, sheepdogs, herd, walls, attractors, goals, decals = levelData
+            # Stop the worker processes of the previous level's herd
+            if(not level == None and isinstance(level['herd'], ParallelHerd)): level['herd'].close()
+            
+            level = initializeLevel(levelData, HERDPROCESSES)
             
             # If there are not 2 sheepdogs in the level, return to the level selector
-            if(not len(sheepdogs) == 2):
+            if(not len(level['sheepdogs']) == 2):
                 print(f'Level {selectedLevelPath} has does not have the right amount of sheepdogs')
                 gameState = 'initializeLevelSelect'
                 continue
@@ -777,12 +1153,13 @@ def main():
             gameStateButtons.clear()
             gameStateButtons = addButtonColumn(gameStateButtonsToAdd, gameStateButtonPositionInfo)
             
-            timeLeft = timeToCompleteLevel
+            simulationTime = 0
             
             gameState = 'initializeMicrobit'
         
         elif(gameState == 'initializeMicrobit'):
             # find the microbit and open the connection
+            microbitInput = [0, 0]
             microbit = findMicrobitComPort()
             if(not microbit):
                 microbit = None
@@ -820,14 +1197,6 @@ def main():
                     elif(event.key == 115): isSPressed = False
                     elif(event.key == 100): isDPressed = False
             
-            # Rotate and move the first sheepdog according to the inputs
-            if(isAPressed): sheepdogs[0].rotate(1, deltatime)
-            elif(isDPressed): sheepdogs[0].rotate(-1, deltatime)
-            
-            if(isWPressed): sheepdogs[0].accelerate(1, deltatime)
-            elif(isSPressed): sheepdogs[0].accelerate(-1, deltatime)
-            else: sheepdogs[0].accelerate(0, deltatime)
-            
             # PLAYER MICRO BIT CONTROLS
             if(not microbit == None):
                 line = microbit.readline()
@@ -839,69 +1208,82 @@ def main():
                         data = line.decode('utf-8').split()
                         data = [int(data[0]), int(data[1])]
                         
-                        gyroX, gyroY, = normalizeGyroValue(data[0], data[1], THRESHOLD)
-                        
-                        # Rotate and move the second sheepdog according to the microbit inputs
-                        sheepdogs[1].rotate(gyroX * -1, deltatime)
-                        sheepdogs[1].accelerate(gyroY * -1, deltatime)
+                        # Store the inputs, they are applied to the second sheepdog each simulation step
+                        microbitInput = normalizeGyroValue(data[0], data[1], THRESHOLD)
                     
                     except Exception as e:
                         print(f'Something went wrong with the microbit: {e}')
             
+            # SIMULATION
+            # Add the elapsed time to the time that still needs to be simulated
+            # A long frame is limited so that it does not cause a long chain of steps
+            simulationTime += min(deltatime, MAXFRAMETIME)
+            
+            # Run as many fixed steps as fit in the elapsed time
+            while(simulationTime >= SIMULATIONSTEP and not len(level['herd']) == 0):
+                simulationTime -= SIMULATIONSTEP
+                
+                # The first sheepdog is moved by the keyboard
+                # The second sheepdog is moved by the microbit if there is one
+                keyboardInput = [1 if isAPressed else -1 if isDPressed else 0, 1 if isWPressed else -1 if isSPressed else 0]
+                microbitSheepdogInput = [microbitInput[0] * -1, microbitInput[1] * -1] if not microbit == None else None
+                
+                simulateStep(level, SIMULATIONSTEP, [keyboardInput, microbitSheepdogInput])
+                
+                if(level['timeLeft'] < 0.000001): break
+            
+            # Find the groups the herd has split into
+            if(not level['herdGroups'] == None): level['herdGroups'].update(level['herd'])
+            
+            # How far the game is between the last two simulation steps
+            interpolation = simulationTime / SIMULATIONSTEP
+            
             # DRAWING
             mainSurface.fill(GAMEBACKGROUNDCOLOR)
             
-            renderedObjects = decals + sheepdogs + herd + walls
+            renderedObjects = level['decals'] + level['sheepdogs'] + list(level['herd']) + level['walls']
             
             # initialize the camera size 
             cameraSize = [int(surfaceSize * 0.80), int(surfaceSize * 0.5)]
             
+            # Follow the sheepdogs where they are drawn
+            sheepdogPositions = [interpolatePosition(sheepdog.previousPosition, sheepdog.position, interpolation) for sheepdog in level['sheepdogs']]
+            
             # If the sheepdogs are close enough, display one screen otherwise display 2 screens
-            xDistance = abs(sheepdogs[0].position[0] - sheepdogs[1].position[0])
-            yDistance = abs(sheepdogs[0].position[1] - sheepdogs[1].position[1])
+            xDistance = abs(sheepdogPositions[0][0] - sheepdogPositions[1][0])
+            yDistance = abs(sheepdogPositions[0][1] - sheepdogPositions[1][1])
             
             
             if(xDistance < cameraSize[0] - 50 and yDistance < cameraSize[1] - 50):
                 # Single Screen
                 # Set the camera position to be inbetween the two sheeepdogs
-                cameraPosition = [(sheepdogs[0].position[0] + sheepdogs[1].position[0]) / 2 - cameraSize[0]/2,
-                                  (sheepdogs[0].position[1] + sheepdogs[1].position[1]) / 2 - cameraSize[1]/2]
+                cameraPosition = [(sheepdogPositions[0][0] + sheepdogPositions[1][0]) / 2 - cameraSize[0]/2,
+                                  (sheepdogPositions[0][1] + sheepdogPositions[1][1]) / 2 - cameraSize[1]/2]
                 
-                gameScene.boundCameraPosition(cameraPosition, cameraSize)
+                level['scene'].boundCameraPosition(cameraPosition, cameraSize)
                 
                 # Render the objects and blit the output to mainSurface
-                mainSurface.blit(gameScene.render(renderedObjects, cameraPosition + cameraSize, cameraSize), (surfaceSize * 0.10, surfaceSize * 0.15))
+                mainSurface.blit(level['scene'].render(renderedObjects, cameraPosition + cameraSize, cameraSize, interpolation), (surfaceSize * 0.10, surfaceSize * 0.15))
             else:
                 # Split Screen
                 cameraSize[0] = int(cameraSize[0] / 2)
                 
                 # Set each camera position to be centered on one sheepdog
-                cameraOnePosition = [sheepdogs[0].position[0] - cameraSize[0]/2,
-                                     sheepdogs[0].position[1] - cameraSize[1]/2]
+                cameraOnePosition = [sheepdogPositions[0][0] - cameraSize[0]/2,
+                                     sheepdogPositions[0][1] - cameraSize[1]/2]
                                       
-                gameScene.boundCameraPosition(cameraOnePosition, cameraSize)
+                level['scene'].boundCameraPosition(cameraOnePosition, cameraSize)
                 
-                cameraTwoPosition = [sheepdogs[1].position[0] - cameraSize[1]/2,
-                                     sheepdogs[1].position[1] - cameraSize[1]/2]
+                cameraTwoPosition = [sheepdogPositions[1][0] - cameraSize[1]/2,
+                                     sheepdogPositions[1][1] - cameraSize[1]/2]
                     
-                gameScene.boundCameraPosition(cameraTwoPosition, cameraSize)
+                level['scene'].boundCameraPosition(cameraTwoPosition, cameraSize)
                 
                 # Render the cameras and bit them to mainSurface
-                mainSurface.blit(gameScene.render(renderedObjects, cameraOnePosition + cameraSize, (int(surfaceSize * 0.40), int(surfaceSize * 0.5))), (surfaceSize * 0.10, surfaceSize * 0.15))
-                mainSurface.blit(gameScene.render(renderedObjects, cameraTwoPosition + cameraSize, (int(surfaceSize * 0.40), int(surfaceSize * 0.5))), (surfaceSize * 0.50, surfaceSize * 0.15))                      
-            
-            # Update sheep, sheepdogs and buttons
-            for sheepdog in sheepdogs:
-                sheepdog.update(walls, deltatime)
-        
-            for sheep in herd:
-                sheep.update(herd, sheepdogs, attractors, walls, deltatime)
-                
-                # If a sheep has reached the goal remove it from the game
-                for goal in goals:
-                    if(goal.isSheepInGoal(sheep.position)): 
-                        herd.remove(sheep)
+                mainSurface.blit(level['scene'].render(renderedObjects, cameraOnePosition + cameraSize, (int(surfaceSize * 0.40), int(surfaceSize * 0.5)), interpolation), (surfaceSize * 0.10, surfaceSize * 0.15))
+                mainSurface.blit(level['scene'].render(renderedObjects, cameraTwoPosition + cameraSize, (int(surfaceSize * 0.40), int(surfaceSize * 0.5)), interpolation), (surfaceSize * 0.50, surfaceSize * 0.15))                      
             
+            # Update buttons
             for button in gameStateButtons: button.update(mainSurface, pygame.mouse.get_pos())
             
             # Write the menu's name
@@ -910,14 +1292,19 @@ def main():
             writeTextCentered(mainSurface, 'Game', subTitlePos, SUBTITLETEXT, TEXTCOLOR)
             
             # Write the time and sheep left
-            writeText(mainSurface, f'Sheep left: {len(herd)}', (surfaceSize * 0.1, surfaceSize * 0.8), SMALLTEXT, TEXTCOLOR)
-            writeText(mainSurface, f'Time left: {int(timeLeft)}', (surfaceSize * 0.1, surfaceSize * 0.8 + 30), SMALLTEXT, TEXTCOLOR)
+            writeText(mainSurface, f'Sheep left: {len(level["herd"])}', (surfaceSize * 0.1, surfaceSize * 0.8), SMALLTEXT, TEXTCOLOR)
+            writeText(mainSurface, f'Time left: {int(level["timeLeft"])}', (surfaceSize * 0.1, surfaceSize * 0.8 + 30), SMALLTEXT, TEXTCOLOR)
+            
+            # Write the number of groups the herd has split into
+            if(not level['herdGroups'] == None): writeText(mainSurface, f'Groups: {len(level["herdGroups"].groups)}', (surfaceSize * 0.5, surfaceSize * 0.8), SMALLTEXT, TEXTCOLOR)
             
-            # Deincrement the time
-            timeLeft -= deltatime
+            # Write the number of sheep that were captured recently
+            recentlyCaptured = sum([sheepCount for captureTime, goal, sheepCount in level['captureEvents']])
+            if(recentlyCaptured > 0):
+                writeText(mainSurface, f'Captured: +{recentlyCaptured}', (surfaceSize * 0.5, surfaceSize * 0.8 + 30), SMALLTEXT, TEXTCOLOR)
             
             # If the time has run out or there are no sheep left them go to the game over menu
-            if(len(herd) == 0 or timeLeft < 0.000001):
+            if(len(level['herd']) == 0 or level['timeLeft'] < 0.000001):
                 gameState = 'initializeGameOver'
             
                 
@@ -961,14 +1348,14 @@ def main():
             writeTextCentered(mainSurface, 'Game Over', (surfaceSize * 0.5, surfaceSize * 0.1), TITLETEXT, TEXTCOLOR)
             
             # If the players won
-            if(len(herd) == 0):
+            if(len(level['herd']) == 0):
                 writeTextCentered(mainSurface, 'YOU WIN!', (surfaceSize * 0.5, surfaceSize * 0.30), SUBTITLETEXT, TEXTCOLOR)
-                writeTextCentered(mainSurface, f'Time Left: {int(timeLeft)}', (surfaceSize * 0.5, surfaceSize * 0.5), LARGETEXT, TEXTCOLOR)
+                writeTextCentered(mainSurface, f'Time Left: {int(level["timeLeft"])}', (surfaceSize * 0.5, surfaceSize * 0.5), LARGETEXT, TEXTCOLOR)
             
             # If the players lost
-            elif(timeLeft < 0.00001):
+            elif(level['timeLeft'] < 0.00001):
                 writeTextCentered(mainSurface, 'YOU LOSE!', (surfaceSize * 0.5, surfaceSize * 0.30), SUBTITLETEXT, TEXTCOLOR)
-                writeTextCentered(mainSurface, f'Sheep Left: {len(herd)}', (surfaceSize * 0.5, surfaceSize * 0.5), LARGETEXT, TEXTCOLOR)
+                writeTextCentered(mainSurface, f'Sheep Left: {len(level["herd"])}', (surfaceSize * 0.5, surfaceSize * 0.5), LARGETEXT, TEXTCOLOR)
             
             # Draw Buttons: Main Menu, Play Again, Quit
             for button in gameStateButtons: button.update(mainSurface, pygame.mouse.get_pos())
@@ -982,7 +1369,12 @@ def main():
         
         
         pygame.display.flip()
+    
+    # Stop the worker processes of the herd
+    if(not level == None and isinstance(level['herd'], ParallelHerd)): level['herd'].close()
             
     pygame.quit()
-    
-main()
\ No newline at end of file
+
+# Only start the game when this file is run so worker processes can import it
+if __name__ == '__main__':
+    main()
\ No newline at end of file
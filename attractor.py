@@ -13,6 +13,9 @@ class Attractor:
         
         getPointInAttractor()
             returns a random point in the attractor
+        
+        getArea()
+            returns the sides of the square around the attractor
     '''
     def __init__(self, positionIn, radiusIn):
         '''
@@ -50,6 +53,11 @@ class Attractor:
         self.position = positionIn
         self.radius = radiusIn
         
+        # The direction of the shortest path around the walls to the attractor, set when the level is loaded
+        # and changed when a gate opens or closes
+        # None if there is no flow field
+        self.flowField = None
+        
     def getPointInAttractor(self):
         '''
         Returns a point in the attractor's radius.
@@ -73,4 +81,19 @@ class Attractor:
         return [round(math.cos(math.radians(randomAngle)) * randomMagnitude) + self.position[0],
                 round(math.sin(randomAngle) * randomMagnitude) + self.position[1]]
     
-    
\ No newline at end of file
+    
+    def getArea(self):
+        '''
+        Returns the sides of the square around the attractor.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        List<int> [left, top, right, bottom]
+            The sides of the square that the attractor's radius fits in.
+        '''
+        return [self.position[0] - self.radius, self.position[1] - self.radius,
+                self.position[0] + self.radius, self.position[1] + self.radius]
@@ -0,0 +1,232 @@
+import math
+import numpy as np
+
+def findWallDistances(rectangle, pointsX, pointsY):
+    '''
+    Finds the distance from points to a wall.
+
+    Parameters
+    ----------
+    rectangle: List<float> [left, top, width, height]
+        The rectangle of the wall.
+
+    pointsX, pointsY: numpy.ndarray<float>
+        The position of each point.
+
+    Returns
+    -------
+    numpy.ndarray<float>
+        The distance from each point to the wall. Negative inside the wall.
+    '''
+    # How far outside each pair of sides the points are, negative if between them
+    outsideX = np.maximum(rectangle[0] - pointsX, pointsX - rectangle[0] - rectangle[2])
+    outsideY = np.maximum(rectangle[1] - pointsY, pointsY - rectangle[1] - rectangle[3])
+
+    # Distance to the outside of the wall plus how deep inside the wall the point is
+    return np.hypot(np.maximum(outsideX, 0), np.maximum(outsideY, 0)) + np.minimum(np.maximum(outsideX, outsideY), 0)
+
+class DistanceField():
+    '''
+    DistanceField
+
+    The distance from points on a grid to the nearest wall.
+    Distances are negative inside walls.
+
+    The distances are found once when the level is loaded, and only the points
+    near a wall that changes are found again. The distance and the direction away
+    from the walls at any position are found by blending the 4 nearest grid points.
+
+    FUNCTIONS
+        __init__(self, walls, sceneSize, cellSizeIn)
+            Finds the distance to the nearest wall from each point on the grid.
+
+        findGradients(self, firstRow, lastRow, firstColumn, lastColumn)
+            Finds the direction away from the walls at the points in a block of the grid.
+
+        update(self, wallGrid, area, margin)
+            Finds the distances again near an area where a wall has changed.
+
+        sample(self, position)
+            Returns the distance to the nearest wall and the direction away from the walls at a position.
+    '''
+    def __init__(self, walls, sceneSize, cellSizeIn):
+        '''
+        Initializes a DistanceField
+
+        Parameters
+        ----------
+        walls: List<Wall()>
+            The walls that are in the level.
+
+        sceneSize: List<int> [width, height]
+            The size of the area covered by the grid.
+
+        cellSizeIn: int or float
+            The distance between points on the grid.
+            Smaller cells are more accurate but take longer to build.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(walls) is list): raise ValueError(f'Parameter 1 walls must be of type list not {type(walls)}')
+        if(not type(cellSizeIn) in (int, float)): raise ValueError(f'Parameter 3 cellSizeIn must be of type int or float not {type(cellSizeIn)}')
+        if(not cellSizeIn > 0): raise ValueError(f'Parameter 3 cellSizeIn must be greater than 0 not {cellSizeIn}')
+
+        self.cellSize = cellSizeIn
+        self.columns = math.ceil(sceneSize[0] / self.cellSize) + 1
+        self.rows = math.ceil(sceneSize[1] / self.cellSize) + 1
+
+        # Position of each point on the grid
+        pointsX, pointsY = np.meshgrid(np.arange(self.columns) * self.cellSize, np.arange(self.rows) * self.cellSize)
+
+        distances = np.full((self.rows, self.columns), np.inf)
+        for wall in walls:
+            if(not wall.isSolid()): continue
+            distances = np.minimum(distances, findWallDistances(wall.rectangle, pointsX, pointsY))
+
+        # If there are no walls every point is far away from them
+        distances = np.minimum(distances, (self.columns + self.rows) * self.cellSize)
+
+        # Direction that the distance increases fastest in
+        if(self.rows > 1 and self.columns > 1):
+            gradientY, gradientX = np.gradient(distances, self.cellSize)
+        else:
+            gradientY, gradientX = np.zeros_like(distances), np.zeros_like(distances)
+
+        # Stored as lists since they are read one value at a time
+        self.distances = distances.tolist()
+        self.gradientX = gradientX.tolist()
+        self.gradientY = gradientY.tolist()
+
+    def findGradients(self, firstRow, lastRow, firstColumn, lastColumn):
+        '''
+        Finds the direction away from the walls at the points in a block of the grid.
+
+        The distances of the points around the block are used, so they must already be up to date.
+
+        Parameters
+        ----------
+        firstRow, lastRow, firstColumn, lastColumn: int
+            The rows and columns of the block, including the last ones.
+
+        Returns
+        -------
+        None
+        '''
+        if(self.rows < 2 or self.columns < 2): return
+
+        # The block with one more point on each side so the edges use the same differences as the whole grid
+        outerFirstRow = max(firstRow - 1, 0)
+        outerLastRow = min(lastRow + 1, self.rows - 1)
+        outerFirstColumn = max(firstColumn - 1, 0)
+        outerLastColumn = min(lastColumn + 1, self.columns - 1)
+
+        distances = np.array([row[outerFirstColumn:outerLastColumn + 1] for row in self.distances[outerFirstRow:outerLastRow + 1]])
+        gradientY, gradientX = np.gradient(distances, self.cellSize)
+
+        rowOffset = firstRow - outerFirstRow
+        columnOffset = firstColumn - outerFirstColumn
+        for row in range(firstRow, lastRow + 1):
+            blockRow = row - firstRow + rowOffset
+            self.gradientX[row][firstColumn:lastColumn + 1] = gradientX[blockRow, columnOffset:columnOffset + lastColumn - firstColumn + 1].tolist()
+            self.gradientY[row][firstColumn:lastColumn + 1] = gradientY[blockRow, columnOffset:columnOffset + lastColumn - firstColumn + 1].tolist()
+
+    def update(self, wallGrid, area, margin):
+        '''
+        Finds the distances again near an area where a wall has changed.
+
+        Only the points within margin of the area are changed, so updating a small wall
+        does not rebuild the whole grid. Walls further than margin from a point are not
+        tested, so distances near the area are at most margin.
+
+        Parameters
+        ----------
+        wallGrid: WallGrid()
+            A grid containing every wall in the level.
+
+        area: List<float> [left, top, right, bottom]
+            The area that has changed.
+
+        margin: int or float
+            How far around the area the distances are found again.
+            It should be larger than any distance that is used to steer.
+
+        Returns
+        -------
+        None
+        '''
+        # The points that are changed
+        firstColumn = max(math.floor((area[0] - margin) / self.cellSize), 0)
+        lastColumn = min(math.ceil((area[2] + margin) / self.cellSize), self.columns - 1)
+        firstRow = max(math.floor((area[1] - margin) / self.cellSize), 0)
+        lastRow = min(math.ceil((area[3] + margin) / self.cellSize), self.rows - 1)
+        if(firstColumn > lastColumn or firstRow > lastRow): return
+
+        pointsX, pointsY = np.meshgrid(np.arange(firstColumn, lastColumn + 1) * self.cellSize, np.arange(firstRow, lastRow + 1) * self.cellSize)
+
+        # Every wall within margin of the changed points
+        centerX = (firstColumn + lastColumn) * self.cellSize / 2
+        centerY = (firstRow + lastRow) * self.cellSize / 2
+        radius = max(lastColumn - firstColumn, lastRow - firstRow) * self.cellSize / 2 + margin
+
+        distances = np.full(pointsX.shape, float(margin))
+        for wall in wallGrid.getNearby([centerX, centerY], radius):
+            if(not wall.isSolid()): continue
+            distances = np.minimum(distances, findWallDistances(wall.rectangle, pointsX, pointsY))
+
+        for row in range(firstRow, lastRow + 1):
+            self.distances[row][firstColumn:lastColumn + 1] = distances[row - firstRow].tolist()
+
+        # The gradient of the points next to the changed points also changes
+        self.findGradients(max(firstRow - 1, 0), min(lastRow + 1, self.rows - 1), max(firstColumn - 1, 0), min(lastColumn + 1, self.columns - 1))
+
+    def sample(self, position):
+        '''
+        Finds the distance to the nearest wall at a position.
+
+        Positions outside the grid use the nearest edge of the grid.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            A position in the scene.
+
+        Returns
+        -------
+        float
+            The distance to the nearest wall. Negative inside a wall.
+
+        float
+            The x part of the direction away from the walls.
+
+        float
+            The y part of the direction away from the walls.
+        '''
+        # Position on the grid
+        gridX = min(max(position[0] / self.cellSize, 0), self.columns - 1)
+        gridY = min(max(position[1] / self.cellSize, 0), self.rows - 1)
+
+        # The top left of the 4 nearest points
+        column = min(int(gridX), self.columns - 2) if self.columns > 1 else 0
+        row = min(int(gridY), self.rows - 2) if self.rows > 1 else 0
+        nextColumn = min(column + 1, self.columns - 1)
+        nextRow = min(row + 1, self.rows - 1)
+
+        # How far the position is between the points
+        fractionX = gridX - column
+        fractionY = gridY - row
+
+        values = []
+        for grid in (self.distances, self.gradientX, self.gradientY):
+            top = grid[row][column] + (grid[row][nextColumn] - grid[row][column]) * fractionX
+            bottom = grid[nextRow][column] + (grid[nextRow][nextColumn] - grid[nextRow][column]) * fractionX
+            values.append(top + (bottom - top) * fractionY)
+
+        return values[0], values[1], values[2]
@@ -0,0 +1,761 @@
+import math
+import heapq
+import hashlib
+import numpy as np
+from distance_field import findWallDistances
+from gate import Gate
+
+# Changing how the fields are found makes old cache files invalid
+FLOWFIELDVERSION = 4
+
+# The most arrangements of the gates that the fields are kept for
+MAXFLOWFIELDVARIANTS = 32
+
+# The 8 cells around a cell and the cost of moving to each one
+NEIGHBOURS = ((1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+              (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)))
+
+def findBlockedCells(walls, columns, rows, cellSize, clearance):
+    '''
+    Finds the cells of a grid that can not be walked through.
+
+    Parameters
+    ----------
+    walls: List<Wall()>
+        The walls that are in the level.
+
+    columns, rows: int
+        The size of the grid.
+
+    cellSize: int or float
+        The width and height of each cell.
+
+    clearance: int or float
+        Cells with a center closer than this to a wall are blocked.
+
+    Returns
+    -------
+    List<List<bool>>
+        True for each blocked cell, indexed by [row][column].
+    '''
+    # Position of the center of each cell
+    centersX, centersY = np.meshgrid((np.arange(columns) + 0.5) * cellSize, (np.arange(rows) + 0.5) * cellSize)
+
+    blocked = np.zeros((rows, columns), dtype = bool)
+    for wall in walls:
+        if(not wall.isSolid()): continue
+        blocked |= findWallDistances(wall.rectangle, centersX, centersY) < clearance
+
+    return blocked.tolist()
+
+def findCosts(blocked, targetCells):
+    '''
+    Finds the length of the shortest path from each cell to the target cells.
+
+    Uses Dijkstra's algorithm over the 8 cells around each cell.
+    Diagonal moves are only allowed if both cells beside them are not blocked,
+    so paths do not cut the corners of walls.
+
+    Parameters
+    ----------
+    blocked: List<List<bool>>
+        True for each blocked cell, indexed by [row][column].
+
+    targetCells: List<Tuple<int>> [(column, row), ...]
+        The cells the paths lead to.
+
+    Returns
+    -------
+    List<List<float>>
+        The length of the path from each cell in cells, infinity if there is no path.
+    '''
+    rows = len(blocked)
+    columns = len(blocked[0])
+
+    costs = [[math.inf] * columns for row in range(rows)]
+
+    # (cost, column, row) of the cells that have been reached but not finished
+    openCells = []
+    for column, row in targetCells:
+        costs[row][column] = 0
+        openCells.append((0, column, row))
+    heapq.heapify(openCells)
+
+    while(not len(openCells) == 0):
+        cost, column, row = heapq.heappop(openCells)
+
+        # Skip cells that were reached again by a shorter path
+        if(cost > costs[row][column]): continue
+
+        for offsetX, offsetY, moveCost in NEIGHBOURS:
+            nextColumn = column + offsetX
+            nextRow = row + offsetY
+
+            if(nextColumn < 0 or nextColumn >= columns or nextRow < 0 or nextRow >= rows): continue
+            if(blocked[nextRow][nextColumn]): continue
+            if(not offsetX == 0 and not offsetY == 0 and (blocked[row][nextColumn] or blocked[nextRow][column])): continue
+
+            nextCost = cost + moveCost
+            if(nextCost < costs[nextRow][nextColumn]):
+                costs[nextRow][nextColumn] = nextCost
+                heapq.heappush(openCells, (nextCost, nextColumn, nextRow))
+
+    return costs
+
+def findDirections(costs, blocked):
+    '''
+    Finds the direction of the shortest path from each cell.
+
+    Each cell points at the cell around it with the lowest cost. Blocked cells point
+    at the cell around them with the lowest cost so objects pushed into them find their way out.
+    The whole grid is compared with each of the 8 cells around it at once.
+
+    Parameters
+    ----------
+    costs: List<List<float>> or numpy.ndarray
+        The length of the path from each cell, from findCosts.
+
+    blocked: List<List<bool>> or numpy.ndarray
+        True for each blocked cell, indexed by [row][column].
+
+    Returns
+    -------
+    numpy.ndarray
+        The x part of the direction of each cell.
+
+    numpy.ndarray
+        The y part of the direction of each cell.
+        Both parts are 0 for target cells and cells with no path.
+    '''
+    costs = np.asarray(costs, dtype = float)
+    rows, columns = costs.shape
+
+    # One cell around the grid so every cell has 8 cells around it
+    # Cells outside the grid can not be reached and do not block corners
+    paddedCosts = np.full((rows + 2, columns + 2), np.inf)
+    paddedCosts[1:-1, 1:-1] = costs
+    paddedBlocked = np.zeros((rows + 2, columns + 2), dtype = bool)
+    paddedBlocked[1:-1, 1:-1] = blocked
+
+    lowestCosts = costs.copy()
+    directionsX = np.zeros((rows, columns))
+    directionsY = np.zeros((rows, columns))
+
+    # The cells around are compared in the same order as findCosts moves to them
+    # so a cell with two equally low costs around it points at the first one
+    for offsetX, offsetY, moveCost in NEIGHBOURS:
+        nextCosts = paddedCosts[1 + offsetY:1 + offsetY + rows, 1 + offsetX:1 + offsetX + columns]
+        isLower = nextCosts < lowestCosts
+
+        # Diagonal moves may not cut the corners of walls
+        if(not offsetX == 0 and not offsetY == 0):
+            isLower &= ~paddedBlocked[1:1 + rows, 1 + offsetX:1 + offsetX + columns] & ~paddedBlocked[1 + offsetY:1 + offsetY + rows, 1:1 + columns]
+
+        lowestCosts[isLower] = nextCosts[isLower]
+        directionsX[isLower] = offsetX / moveCost
+        directionsY[isLower] = offsetY / moveCost
+
+    return directionsX, directionsY
+
+class FlowField():
+    '''
+    FlowField
+
+    The direction of the shortest path around the walls to a target from each cell of a grid.
+
+    The length of the path from each cell is kept so the field can be changed where
+    the walls change without finding every path again.
+
+    FUNCTIONS
+        __init__(self, costsIn, blocked, targetCellsIn, cellSizeIn)
+            Stores the length of the path from each cell and finds their directions.
+
+        copy(self)
+            Copies the lists of the field so they can be changed without changing this field.
+
+        findDirections(self, blocked, firstColumn, lastColumn, firstRow, lastRow)
+            Finds the directions again in a block of the grid.
+
+        update(self, blocked, changedCells)
+            Finds the paths again around cells that have become blocked or unblocked.
+
+        getDirection(self, position)
+            Returns the direction of the shortest path to the target from a position.
+    '''
+    def __init__(self, costsIn, blocked, targetCellsIn, cellSizeIn):
+        '''
+        Initializes a FlowField
+
+        Parameters
+        ----------
+        costsIn: List<List<float>>
+            The length of the path from each cell, from findCosts.
+
+        blocked: List<List<bool>>
+            True for each blocked cell, indexed by [row][column].
+
+        targetCellsIn: List<Tuple<int>> [(column, row), ...]
+            The cells the paths lead to.
+
+        cellSizeIn: int or float
+            The width and height of each cell.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(costsIn) is list): raise ValueError(f'Parameter 1 costsIn must be of type list not {type(costsIn)}')
+        if(not type(targetCellsIn) is list): raise ValueError(f'Parameter 3 targetCellsIn must be of type list not {type(targetCellsIn)}')
+        if(not type(cellSizeIn) in (int, float)): raise ValueError(f'Parameter 4 cellSizeIn must be of type int or float not {type(cellSizeIn)}')
+
+        self.costs = costsIn
+        self.targetCells = set(targetCellsIn)
+        self.cellSize = cellSizeIn
+        self.rows = len(costsIn)
+        self.columns = len(costsIn[0]) if self.rows > 0 else 0
+
+        # Stored as lists since they are read one value at a time
+        self.directionsX = [[0] * self.columns for row in range(self.rows)]
+        self.directionsY = [[0] * self.columns for row in range(self.rows)]
+        self.findDirections(blocked, 0, self.columns - 1, 0, self.rows - 1)
+
+    def copy(self):
+        '''
+        Copies the field.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Tuple<List<List<float>>> (costs, directionsX, directionsY)
+            Copies of the lists of the field.
+        '''
+        return [row[:] for row in self.costs], [row[:] for row in self.directionsX], [row[:] for row in self.directionsY]
+
+    def findDirections(self, blocked, firstColumn, lastColumn, firstRow, lastRow):
+        '''
+        Finds the directions again in a block of the grid.
+
+        Parameters
+        ----------
+        blocked: List<List<bool>>
+            True for each blocked cell, indexed by [row][column].
+
+        firstColumn, lastColumn, firstRow, lastRow: int
+            The columns and rows of the block, including the last ones.
+
+        Returns
+        -------
+        None
+        '''
+        if(firstColumn > lastColumn or firstRow > lastRow): return
+
+        # The block with one more cell on each side so its edges compare the same cells as the whole grid
+        outerFirstColumn = max(firstColumn - 1, 0)
+        outerLastColumn = min(lastColumn + 1, self.columns - 1)
+        outerFirstRow = max(firstRow - 1, 0)
+        outerLastRow = min(lastRow + 1, self.rows - 1)
+
+        directionsX, directionsY = findDirections([costRow[outerFirstColumn:outerLastColumn + 1] for costRow in self.costs[outerFirstRow:outerLastRow + 1]],
+                                                  [blockedRow[outerFirstColumn:outerLastColumn + 1] for blockedRow in blocked[outerFirstRow:outerLastRow + 1]])
+
+        rowOffset = firstRow - outerFirstRow
+        columnOffset = firstColumn - outerFirstColumn
+        for row in range(firstRow, lastRow + 1):
+            blockRow = row - firstRow + rowOffset
+            self.directionsX[row][firstColumn:lastColumn + 1] = directionsX[blockRow, columnOffset:columnOffset + lastColumn - firstColumn + 1].tolist()
+            self.directionsY[row][firstColumn:lastColumn + 1] = directionsY[blockRow, columnOffset:columnOffset + lastColumn - firstColumn + 1].tolist()
+
+    def update(self, blocked, changedCells):
+        '''
+        Finds the paths again around cells that have become blocked or unblocked.
+
+        First the costs that came from a cell that is now blocked, or from a move that is
+        no longer allowed, are removed. Then Dijkstra's algorithm is run again from the cells
+        around the change and the removed cells, so only costs that change are found again.
+
+        Parameters
+        ----------
+        blocked: List<List<bool>>
+            True for each blocked cell, indexed by [row][column], after the change.
+
+        changedCells: List<Tuple<int>> [(column, row), ...]
+            The cells that have become blocked or unblocked.
+
+        Returns
+        -------
+        None
+        '''
+        costs = self.costs
+        columns = self.columns
+        rows = self.rows
+        targetCells = self.targetCells
+
+        # Cells that may have lost the path their cost came from
+        # Every cell next to a cell that became blocked may have used a move through it
+        uncheckedCells = []
+        for column, row in changedCells:
+            if(not blocked[row][column]): continue
+            uncheckedCells.append((column, row))
+            uncheckedCells += [(column + offsetX, row + offsetY) for offsetX, offsetY, moveCost in NEIGHBOURS]
+
+        removedCells = []
+        while(not len(uncheckedCells) == 0):
+            column, row = uncheckedCells.pop()
+            if(column < 0 or column >= columns or row < 0 or row >= rows): continue
+
+            cost = costs[row][column]
+            if(cost == math.inf or (column, row) in targetCells): continue
+
+            # A cell keeps its cost if a cell around it still has a path that is that much shorter
+            if(not blocked[row][column]):
+                isReached = False
+                for offsetX, offsetY, moveCost in NEIGHBOURS:
+                    previousColumn = column + offsetX
+                    previousRow = row + offsetY
+                    if(previousColumn < 0 or previousColumn >= columns or previousRow < 0 or previousRow >= rows): continue
+                    if(abs(costs[previousRow][previousColumn] + moveCost - cost) > 0.000001): continue
+                    if(not offsetX == 0 and not offsetY == 0 and (blocked[row][previousColumn] or blocked[previousRow][column])): continue
+
+                    isReached = True
+                    break
+
+                if(isReached): continue
+
+            costs[row][column] = math.inf
+            removedCells.append((column, row))
+
+            # The cells around it may have had their cost from it
+            uncheckedCells += [(column + offsetX, row + offsetY) for offsetX, offsetY, moveCost in NEIGHBOURS]
+
+        # Start from every cell that still has a path next to the changed and removed cells
+        openCells = []
+        for column, row in removedCells + changedCells:
+            for offsetX, offsetY, moveCost in NEIGHBOURS + ((0, 0, 0),):
+                nextColumn = column + offsetX
+                nextRow = row + offsetY
+                if(nextColumn < 0 or nextColumn >= columns or nextRow < 0 or nextRow >= rows): continue
+                if(costs[nextRow][nextColumn] < math.inf): openCells.append((costs[nextRow][nextColumn], nextColumn, nextRow))
+        heapq.heapify(openCells)
+
+        foundCells = []
+        while(not len(openCells) == 0):
+            cost, column, row = heapq.heappop(openCells)
+
+            # Skip cells that were reached again by a shorter path
+            if(cost > costs[row][column]): continue
+
+            for offsetX, offsetY, moveCost in NEIGHBOURS:
+                nextColumn = column + offsetX
+                nextRow = row + offsetY
+
+                if(nextColumn < 0 or nextColumn >= columns or nextRow < 0 or nextRow >= rows): continue
+                if(blocked[nextRow][nextColumn]): continue
+                if(not offsetX == 0 and not offsetY == 0 and (blocked[row][nextColumn] or blocked[nextRow][column])): continue
+
+                nextCost = cost + moveCost
+                if(nextCost < costs[nextRow][nextColumn]):
+                    costs[nextRow][nextColumn] = nextCost
+                    foundCells.append((nextColumn, nextRow))
+                    heapq.heappush(openCells, (nextCost, nextColumn, nextRow))
+
+        # The directions change where the costs or the blocked cells around a cell change
+        changedCells = removedCells + foundCells + changedCells
+        if(len(changedCells) == 0): return
+
+        changedColumns = [column for column, row in changedCells]
+        changedRows = [row for column, row in changedCells]
+        self.findDirections(blocked, max(min(changedColumns) - 1, 0), min(max(changedColumns) + 1, columns - 1),
+                            max(min(changedRows) - 1, 0), min(max(changedRows) + 1, rows - 1))
+
+    def getDirection(self, position):
+        '''
+        Finds the direction of the shortest path to the target.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            A position in the scene.
+
+        Returns
+        -------
+        Tuple<float> (x, y)
+            The direction of the path, with a length of 1.
+
+        None
+            If the position is outside of the grid, in a target cell or has no path to the target.
+        '''
+        column = math.floor(position[0] / self.cellSize)
+        row = math.floor(position[1] / self.cellSize)
+        if(column < 0 or column >= self.columns or row < 0 or row >= self.rows): return None
+
+        directionX = self.directionsX[row][column]
+        directionY = self.directionsY[row][column]
+        if(directionX == 0 and directionY == 0): return None
+
+        return (directionX, directionY)
+
+def findTargetCells(blocked, cellSize, left, top, right, bottom):
+    '''
+    Finds the cells that have their center in an area.
+
+    Parameters
+    ----------
+    blocked: List<List<bool>>
+        True for each blocked cell, indexed by [row][column].
+
+    cellSize: int or float
+        The width and height of each cell.
+
+    left, top, right, bottom: float
+        The sides of the area.
+
+    Returns
+    -------
+    List<Tuple<int>> [(column, row), ...]
+        The cells in the area, or the cell at the center of the area if it is smaller than a cell.
+        Cells outside the grid are not returned.
+    '''
+    rows = len(blocked)
+    columns = len(blocked[0])
+
+    targetCells = [(column, row)
+                   for column in range(max(math.ceil(left / cellSize - 0.5), 0), min(math.floor(right / cellSize - 0.5), columns - 1) + 1)
+                   for row in range(max(math.ceil(top / cellSize - 0.5), 0), min(math.floor(bottom / cellSize - 0.5), rows - 1) + 1)]
+
+    if(len(targetCells) == 0):
+        column = math.floor((left + right) / 2 / cellSize)
+        row = math.floor((top + bottom) / 2 / cellSize)
+        if(0 <= column < columns and 0 <= row < rows): targetCells.append((column, row))
+
+    return targetCells
+
+class FlowFields():
+    '''
+    FlowFields
+
+    The flow field of each attractor and goal in a level and the blocked cells they share.
+
+    When a gate changes, only the blocked cells near it are found again and each field
+    only finds its paths again where they changed. The fields found for each arrangement
+    of the gates are kept, so a gate that opens and closes again and again only finds
+    its paths once. The fields with each gate changed on its own are found when the level
+    is loaded, so a single gate never finds paths during the level.
+
+    FUNCTIONS
+        __init__(self, walls, wallGrid, sceneSize, cellSizeIn, clearanceIn, targets, costs)
+            Finds the blocked cells and the flow field of each target.
+
+        getGateState(self)
+            Returns the position and state of every gate.
+
+        getCosts(self)
+            Returns the length of the path from each cell of each field for each arrangement found when loading.
+
+        storeVariant(self)
+            Keeps the fields of the current arrangement of the gates.
+
+        findBlockedCells(self, wallGrid, area)
+            Finds the blocked cells again near an area.
+
+        update(self, wallGrid, area, costs)
+            Finds the blocked cells and paths again near an area where a gate has changed.
+    '''
+    def __init__(self, walls, wallGrid, sceneSize, cellSizeIn, clearanceIn, targets, costs = None):
+        '''
+        Initializes a FlowFields
+
+        The field of each target is stored in its flowField.
+
+        Parameters
+        ----------
+        walls: List<Wall()>
+            The walls that are in the level.
+
+        wallGrid: WallGrid()
+            A grid containing every wall in the level.
+
+        sceneSize: List<int> [width, height]
+            The size of the level.
+
+        cellSizeIn: int or float
+            The width and height of each cell.
+
+        clearanceIn: int or float
+            How far paths stay from the walls.
+
+        targets: List<Attractor() or Goal()>
+            The attractors and goals that are in the level.
+
+        costs: numpy.ndarray or None
+            The length of the path from each cell, from getCosts.
+            If None the paths are found.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(walls) is list): raise ValueError(f'Parameter 1 walls must be of type list not {type(walls)}')
+        if(not type(cellSizeIn) in (int, float)): raise ValueError(f'Parameter 4 cellSizeIn must be of type int or float not {type(cellSizeIn)}')
+        if(not cellSizeIn > 0): raise ValueError(f'Parameter 4 cellSizeIn must be greater than 0 not {cellSizeIn}')
+        if(not type(clearanceIn) in (int, float)): raise ValueError(f'Parameter 5 clearanceIn must be of type int or float not {type(clearanceIn)}')
+
+        self.cellSize = cellSizeIn
+        self.clearance = clearanceIn
+        self.columns = math.ceil(sceneSize[0] / cellSizeIn)
+        self.rows = math.ceil(sceneSize[1] / cellSizeIn)
+        self.gates = [wall for wall in walls if isinstance(wall, Gate)]
+
+        self.blocked = findBlockedCells(walls, self.columns, self.rows, cellSizeIn, clearanceIn)
+
+        self.flowFields = []
+        for targetNumber, target in enumerate(targets):
+            targetCells = findTargetCells(self.blocked, cellSizeIn, *target.getArea())
+            targetCosts = costs[0][targetNumber].tolist() if not costs is None else findCosts(self.blocked, targetCells)
+
+            target.flowField = FlowField(targetCosts, self.blocked, targetCells, cellSizeIn)
+            self.flowFields.append(target.flowField)
+
+        # gate state -> (blocked, [(costs, directionsX, directionsY) of each field])
+        # The stored lists are never changed, each change is made to copies of them
+        self.variants = {}
+        self.storeVariant()
+
+        # Find the fields with each gate changed on its own, then change it back
+        # The arrangements are kept in order so their costs can be saved
+        self.loadedStates = [self.getGateState()]
+        for gateNumber, gate in enumerate(self.gates):
+            changedArea = gate.setOpen(not gate.isOpen)
+            wallGrid.update(gate)
+            self.update(wallGrid, changedArea, costs[gateNumber + 1] if not costs is None else None)
+            self.loadedStates.append(self.getGateState())
+
+            changedArea = gate.setOpen(not gate.isOpen)
+            wallGrid.update(gate)
+            self.update(wallGrid, changedArea)
+
+    def getGateState(self):
+        '''
+        Finds the position and state of every gate.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Tuple
+            The rectangle and whether it is solid of each gate.
+        '''
+        return tuple((gate.isSolid(), *gate.rectangle) for gate in self.gates)
+
+    def getCosts(self):
+        '''
+        Finds the length of the path from each cell of each field for the arrangements found when loading.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        numpy.ndarray
+            The length of each path, indexed by [arrangement][target][row][column].
+            The first arrangement has every gate as the level starts, then each one has one gate changed.
+        '''
+        return np.array([[fieldLists[0] for fieldLists in self.variants[gateState][1]] for gateState in self.loadedStates],
+                        dtype = float).reshape(len(self.loadedStates), len(self.flowFields), self.rows, self.columns)
+
+    def storeVariant(self):
+        '''
+        Keeps the fields of the current arrangement of the gates.
+
+        Only MAXFLOWFIELDVARIANTS arrangements are kept.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        if(len(self.variants) >= MAXFLOWFIELDVARIANTS): return
+
+        self.variants[self.getGateState()] = (self.blocked, [(flowField.costs, flowField.directionsX, flowField.directionsY) for flowField in self.flowFields])
+
+    def findBlockedCells(self, wallGrid, area):
+        '''
+        Finds the blocked cells again near an area.
+
+        Only the cells with a center within the clearance of the area are tested
+        against the walls near them.
+
+        Parameters
+        ----------
+        wallGrid: WallGrid()
+            A grid containing every wall in the level.
+
+        area: List<float> [left, top, right, bottom]
+            The area that has changed.
+
+        Returns
+        -------
+        List<Tuple<int>> [(column, row), ...]
+            The cells that have become blocked or unblocked.
+        '''
+        # The cells that can be blocked by a wall in the area
+        firstColumn = max(math.floor((area[0] - self.clearance) / self.cellSize), 0)
+        lastColumn = min(math.floor((area[2] + self.clearance) / self.cellSize), self.columns - 1)
+        firstRow = max(math.floor((area[1] - self.clearance) / self.cellSize), 0)
+        lastRow = min(math.floor((area[3] + self.clearance) / self.cellSize), self.rows - 1)
+        if(firstColumn > lastColumn or firstRow > lastRow): return []
+
+        centersX, centersY = np.meshgrid((np.arange(firstColumn, lastColumn + 1) + 0.5) * self.cellSize, (np.arange(firstRow, lastRow + 1) + 0.5) * self.cellSize)
+
+        # Every wall within the clearance of the cells
+        centerX = (firstColumn + lastColumn + 1) * self.cellSize / 2
+        centerY = (firstRow + lastRow + 1) * self.cellSize / 2
+        radius = (max(lastColumn - firstColumn, lastRow - firstRow) + 1) * self.cellSize / 2 + self.clearance
+
+        blocked = np.zeros(centersX.shape, dtype = bool)
+        for wall in wallGrid.getNearby([centerX, centerY], radius):
+            if(not wall.isSolid()): continue
+            blocked |= findWallDistances(wall.rectangle, centersX, centersY) < self.clearance
+
+        changedCells = []
+        for row in range(firstRow, lastRow + 1):
+            for column in range(firstColumn, lastColumn + 1):
+                if(blocked[row - firstRow, column - firstColumn] == self.blocked[row][column]): continue
+
+                self.blocked[row][column] = bool(blocked[row - firstRow, column - firstColumn])
+                changedCells.append((column, row))
+
+        return changedCells
+
+    def update(self, wallGrid, area, costs = None):
+        '''
+        Finds the blocked cells and paths again near an area where a gate has changed.
+
+        If the gates have been in this arrangement before, the fields found then are used.
+
+        Parameters
+        ----------
+        wallGrid: WallGrid()
+            A grid containing every wall in the level, after the gate has changed.
+
+        area: List<float> [left, top, right, bottom]
+            The area that has changed.
+
+        costs: numpy.ndarray or None
+            The length of the path from each cell of each field in this arrangement, indexed by [target][row][column].
+            If None the paths are found again where they changed.
+
+        Returns
+        -------
+        None
+        '''
+        variant = self.variants.get(self.getGateState())
+        if(not variant == None):
+            self.blocked = variant[0]
+            for flowField, fieldLists in zip(self.flowFields, variant[1]):
+                flowField.costs, flowField.directionsX, flowField.directionsY = fieldLists
+
+            return
+
+        # Change copies so the kept arrangements stay the same
+        self.blocked = [row[:] for row in self.blocked]
+        changedCells = self.findBlockedCells(wallGrid, area)
+
+        for fieldNumber, flowField in enumerate(self.flowFields):
+            flowField.costs, flowField.directionsX, flowField.directionsY = flowField.copy()
+
+            if(costs is None):
+                flowField.update(self.blocked, changedCells)
+            else:
+                flowField.costs = costs[fieldNumber].tolist()
+                flowField.findDirections(self.blocked, 0, self.columns - 1, 0, self.rows - 1)
+
+        self.storeVariant()
+
+def loadFlowFields(levelPath, walls, wallGrid, sceneSize, cellSize, clearance, targets):
+    '''
+    Finds the flow field to each attractor and goal of a level.
+
+    The length of the paths, with the gates as the level starts and with each gate
+    changed on its own, are saved next to the level file and loaded from there the next
+    time the level is loaded, unless the level file or the settings have changed.
+    Each field is stored in the flowField of its target.
+
+    Parameters
+    ----------
+    levelPath: str
+        The filepath of the level file.
+
+    walls: List<Wall()>
+        The walls that are in the level, with every gate closed.
+
+    wallGrid: WallGrid()
+        A grid containing every wall in the level.
+
+    sceneSize: List<int> [width, height]
+        The size of the level.
+
+    cellSize: int or float
+        The width and height of each cell.
+
+    clearance: int or float
+        How far paths stay from the walls.
+
+    targets: List<Attractor() or Goal()>
+        The attractors and goals that are in the level.
+
+    Returns
+    -------
+    FlowFields()
+        The flow fields of the level.
+
+    None
+        If the level has no attractors or goals or the grid has no cells.
+    '''
+    if(math.ceil(sceneSize[0] / cellSize) == 0 or math.ceil(sceneSize[1] / cellSize) == 0 or len(targets) == 0): return None
+
+    # The fields only need to be found again if something they depend on has changed
+    file = open(levelPath, 'rb')
+    key = hashlib.sha1(file.read() + f'{FLOWFIELDVERSION} {cellSize} {clearance} {sceneSize}'.encode()).hexdigest()
+    file.close()
+
+    cachePath = levelPath.rsplit('.', 1)[0] + '.flow.npz'
+
+    costs = None
+    try:
+        cache = np.load(cachePath)
+        if(str(cache['key']) == key and cache['costs'].shape[:2] == (len([wall for wall in walls if isinstance(wall, Gate)]) + 1, len(targets))):
+            costs = cache['costs']
+        cache.close()
+    except (OSError, KeyError, ValueError):
+        pass
+
+    flowFields = FlowFields(walls, wallGrid, sceneSize, cellSize, clearance, targets, costs)
+
+    if(costs is None):
+        try:
+            np.savez_compressed(cachePath, key = key, costs = flowFields.getCosts())
+        except OSError as e:
+            print(f'Flow fields not saved: {e}')
+
+    return flowFields
@@ -0,0 +1,255 @@
+import pygame
+from wall import Wall
+
+class Gate(Wall):
+    '''
+    Gate
+
+    A wall that can open and close during a level.
+
+    An open gate is drawn as an outline and nothing collides with it. A gate with an
+    offset is a fence that slides by its offset when it opens, and back when it closes,
+    so it is always solid. Each change returns the area of the level it affects, so the
+    structures built from the walls only need to be updated in that area.
+
+    FUNCTIONS
+        __init__(self, rectangleIn, colorIn, intervalIn, sheepToOpenIn, offsetIn)
+            Creates a closed gate.
+
+        draw(self, surfaceIn)
+            Draws the gate, or its outline if it is open.
+
+        isSolid(self)
+            Returns true if the gate is closed or slides open.
+
+        getArea(self)
+            Returns the sides of the gate's rectangle.
+
+        setOpen(self, isOpenIn)
+            Opens or closes the gate.
+
+        moveTo(self, rectangleIn)
+            Moves the gate to a new rectangle.
+
+        update(self, deltatime, capturedSheep)
+            Opens or closes the gate when its timer runs out or enough sheep reach the goals.
+    '''
+    def __init__(self, rectangleIn, colorIn, intervalIn = 0, sheepToOpenIn = 0, offsetIn = (0, 0)):
+        '''
+        Initializes a Gate
+
+        Parameters
+        ----------
+        rectangleIn: [left, top, width, height]
+            The rectangle of the gate.
+
+        colorIn: pygame.Color()
+            The color of the gate.
+
+        intervalIn: int or float
+            If more than 0 the gate opens and closes every interval seconds.
+
+        sheepToOpenIn: int
+            If more than 0 the gate opens and stays open once this many sheep have reached the goals.
+
+        offsetIn: List<int or float> [x, y]
+            How far the gate slides when it opens. If [0, 0] the gate lets things through when it opens.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        super().__init__(rectangleIn, colorIn)
+
+        # Check if the input values are bad
+        if(not type(intervalIn) in (int, float)): raise ValueError(f'Parameter 3 intervalIn must be of type int or float not {type(intervalIn)}')
+        if(not type(sheepToOpenIn) is int): raise ValueError(f'Parameter 4 sheepToOpenIn must be of type int not {type(sheepToOpenIn)}')
+        if(not type(offsetIn) in (list, tuple)): raise ValueError(f'Parameter 5 offsetIn must be of type list or tuple not {type(offsetIn)}')
+        if(not len(offsetIn) == 2): raise ValueError(f'Parameter 5 offsetIn must be of length 2 not {len(offsetIn)}')
+        if(any([not type(offsetValue) in (int, float) for offsetValue in offsetIn])): raise ValueError('Each value in offsetIn must be of type int or float')
+
+        self.isOpen = False
+
+        # Sliding
+        self.closedRectangle = list(rectangleIn)
+        self.offset = list(offsetIn)
+        self.isSliding = not (offsetIn[0] == 0 and offsetIn[1] == 0)
+
+        # Timer
+        self.interval = intervalIn
+        self.timeLeft = intervalIn
+
+        # Trigger
+        self.sheepToOpen = sheepToOpenIn
+
+    def draw(self, surfaceIn):
+        '''
+        Draws the gate.
+
+        Parameters
+        ----------
+        surfaceIn: pygame.Surface()
+            The surface that the gate will be drawn onto.
+
+        Returns
+        -------
+        None
+        '''
+        if(not self.isSolid()):
+            pygame.draw.rect(surfaceIn, self.color, self.rectangle, 2)
+        else:
+            super().draw(surfaceIn)
+
+    def isSolid(self):
+        '''
+        Checks if the gate can be collided with.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bool
+            True if the gate is closed or slides open.
+        '''
+        return not self.isOpen or self.isSliding
+
+    def isCircleColliding(self, circlePosition, circleSize, result = None):
+        '''
+        The same as Wall.isCircleColliding, but an open gate is never colliding.
+        '''
+        if(self.isSolid()): return super().isCircleColliding(circlePosition, circleSize, result)
+
+        if(result == None): return (False, False, False, circlePosition.copy())
+
+        result[0] = False
+        result[1] = False
+        result[2] = False
+        result[3][0] = circlePosition[0]
+        result[3][1] = circlePosition[1]
+
+        return result
+
+    def raycast(self, origin, direction, maxT):
+        '''
+        The same as Wall.raycast, but an open gate is never hit.
+        '''
+        if(not self.isSolid()): return None
+
+        return super().raycast(origin, direction, maxT)
+
+    def sweep(self, circlePosition, movement, circleSize):
+        '''
+        The same as Wall.sweep, but an open gate is never touched.
+        '''
+        if(not self.isSolid()): return None
+
+        return super().sweep(circlePosition, movement, circleSize)
+
+    def getArea(self):
+        '''
+        Finds the sides of the gate's rectangle.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        List<float> [left, top, right, bottom]
+            The sides of the gate.
+        '''
+        return [self.rectangle[0], self.rectangle[1], self.rectangle[0] + self.rectangle[2], self.rectangle[1] + self.rectangle[3]]
+
+    def setOpen(self, isOpenIn):
+        '''
+        Opens or closes the gate.
+
+        Parameters
+        ----------
+        isOpenIn: bool
+            True to open the gate, False to close it.
+
+        Returns
+        -------
+        List<float> [left, top, right, bottom]
+            The area that changed.
+
+        None
+            If the gate was already open or closed.
+        '''
+        if(self.isOpen == isOpenIn): return None
+
+        self.isOpen = isOpenIn
+
+        # A sliding gate moves out of the way instead of letting things through
+        if(self.isSliding):
+            if(self.isOpen):
+                return self.moveTo([self.closedRectangle[0] + self.offset[0], self.closedRectangle[1] + self.offset[1], self.closedRectangle[2], self.closedRectangle[3]])
+
+            return self.moveTo(self.closedRectangle)
+
+        return self.getArea()
+
+    def moveTo(self, rectangleIn):
+        '''
+        Moves the gate.
+
+        Call WallGrid.update with the gate after it moves so it is in the correct cells.
+
+        Parameters
+        ----------
+        rectangleIn: [left, top, width, height]
+            The new rectangle of the gate.
+
+        Returns
+        -------
+        List<float> [left, top, right, bottom]
+            The area that changed, covering the old and new rectangle.
+        '''
+        oldArea = self.getArea()
+        self.rectangle = list(rectangleIn)
+        newArea = self.getArea()
+
+        return [min(oldArea[0], newArea[0]), min(oldArea[1], newArea[1]), max(oldArea[2], newArea[2]), max(oldArea[3], newArea[3])]
+
+    def update(self, deltatime, capturedSheep):
+        '''
+        Updates the gate.
+
+        Opens the gate for good once enough sheep have reached the goals,
+        otherwise opens or closes it each time its timer runs out.
+
+        Parameters
+        ----------
+        deltatime: float
+            The elapsed time between frames.
+
+        capturedSheep: int
+            The number of sheep that have reached the goals.
+
+        Returns
+        -------
+        List<float> [left, top, right, bottom]
+            The area that changed.
+
+        None
+            If the gate did not change.
+        '''
+        if(self.sheepToOpen > 0 and capturedSheep >= self.sheepToOpen):
+            return self.setOpen(True)
+
+        if(self.interval > 0):
+            self.timeLeft -= deltatime
+
+            if(self.timeLeft <= 0):
+                self.timeLeft += self.interval
+                return self.setOpen(not self.isOpen)
+
+        return None
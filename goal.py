@@ -11,6 +11,9 @@ class Goal():
         
     isSheepInGoal(self, sheepPosition):
         Determins if the sheep is in the goal.
+        
+    getArea(self):
+        Returns the sides of the goal.
     '''    
     def __init__(self, rectIn):
         '''
@@ -40,6 +43,11 @@ class Goal():
         
         self.rect = rectIn
         
+        # The direction of the shortest path around the walls to the goal, set when the level is loaded
+        # and changed when a gate opens or closes
+        # None if there is no flow field
+        self.flowField = None
+        
     def isSheepInGoal(self, sheepPosition):
         '''
         Determines if the sheep is in the goal.
@@ -60,4 +68,20 @@ class Goal():
         return (sheepPosition[0] > self.rect[0] and
                 sheepPosition[0] < self.rect[0] + self.rect[2] and
                 sheepPosition[1] > self.rect[1] and
-                sheepPosition[1] < self.rect[1] + self.rect[3])
\ No newline at end of file
+                sheepPosition[1] < self.rect[1] + self.rect[3])
+    
+    def getArea(self):
+        '''
+        Returns the sides of the goal.
+        
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        List<float> [left, top, right, bottom]
+            The sides of the Goal's rectangle.
+        '''
+        
+        return [self.rect[0], self.rect[1], self.rect[0] + self.rect[2], self.rect[1] + self.rect[3]]
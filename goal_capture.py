@@ -0,0 +1,152 @@
+import math
+from herd import Herd
+
+class GoalGrid():
+    '''
+    GoalGrid
+
+    A uniform grid that stores each goal in every cell its rectangle overlaps
+    so that each sheep only tests the goals in its own cell.
+
+    FUNCTIONS
+        __init__(self, goals, cellSizeIn)
+            Creates a grid containing the goals.
+
+        getGoal(self, position)
+            Returns the goal that contains a position.
+    '''
+    def __init__(self, goals, cellSizeIn):
+        '''
+        Initializes a GoalGrid
+
+        Parameters
+        ----------
+        goals: List<Goal()>
+            The goals that are in the level.
+
+        cellSizeIn: int or float
+            The width and height of each cell.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(goals) is list): raise ValueError(f'Parameter 1 goals must be of type list not {type(goals)}')
+        if(not type(cellSizeIn) in (int, float)): raise ValueError(f'Parameter 2 cellSizeIn must be of type int or float not {type(cellSizeIn)}')
+        if(not cellSizeIn > 0): raise ValueError(f'Parameter 2 cellSizeIn must be greater than 0 not {cellSizeIn}')
+
+        self.cellSize = cellSizeIn
+
+        # cell -> goals that overlap that cell, in the same order as goals
+        self.cells = {}
+
+        for goal in goals:
+            for column in range(math.floor(goal.rect[0] / self.cellSize), math.floor((goal.rect[0] + goal.rect[2]) / self.cellSize) + 1):
+                for row in range(math.floor(goal.rect[1] / self.cellSize), math.floor((goal.rect[1] + goal.rect[3]) / self.cellSize) + 1):
+                    self.cells.setdefault((column, row), []).append(goal)
+
+    def getGoal(self, position):
+        '''
+        Finds the goal that contains a position.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            A position in the scene.
+
+        Returns
+        -------
+        Goal()
+            The first goal that contains the position.
+
+        None
+            If the position is not in a goal.
+        '''
+        cell = self.cells.get((math.floor(position[0] / self.cellSize), math.floor(position[1] / self.cellSize)))
+        if(cell == None): return None
+
+        for goal in cell:
+            if(goal.isSheepInGoal(position)): return goal
+
+        return None
+
+def swapRemove(herd, indices):
+    '''
+    Removes sheep from a list by moving the last sheep into each gap.
+
+    Each removal takes the same time no matter how long the list is,
+    but the order of the sheep that are left changes.
+
+    Parameters
+    ----------
+    herd: List<Sheep()>
+        The sheep that are in the level.
+
+    indices: List<int>
+        The index of each sheep that will be removed.
+
+    Returns
+    -------
+    None
+    '''
+    # Remove from the back so the last sheep is never one that is being removed
+    for index in sorted(indices, reverse = True):
+        herd[index] = herd[-1]
+        herd.pop()
+
+def captureSheep(herd, goalGrid, captureTime):
+    '''
+    Removes every sheep that has reached a goal.
+
+    Every sheep is tested against the goals in its cell, then the captured
+    sheep are removed from the herd at once.
+
+    Parameters
+    ----------
+    herd: List<Sheep()> or Herd()
+        The sheep that are in the level.
+
+    goalGrid: GoalGrid()
+        A grid containing the goals.
+
+    captureTime: float
+        The time that the sheep were captured at, stored in the capture events.
+
+    Returns
+    -------
+    List<Sheep()>
+        The sheep that were captured. Empty for a Herd().
+
+    List<Tuple> [(captureTime, goal, sheepCount), ...]
+        One capture event for each goal that captured sheep.
+    '''
+    # The herd engine stores its positions in one array
+    positions = herd.position.tolist() if isinstance(herd, Herd) else [sheep.position for sheep in herd]
+
+    capturedIndices = []
+    sheepCounts = {}
+    for index, position in enumerate(positions):
+        goal = goalGrid.getGoal(position)
+        if(goal == None): continue
+
+        capturedIndices.append(index)
+        sheepCounts[goal] = sheepCounts.get(goal, 0) + 1
+
+    if(len(capturedIndices) == 0): return [], []
+
+    events = [(captureTime, goal, sheepCount) for goal, sheepCount in sheepCounts.items()]
+
+    if(isinstance(herd, Herd)):
+        herd.swapRemove(capturedIndices)
+        return [], events
+
+    capturedSheep = [herd[index] for index in capturedIndices]
+    swapRemove(herd, capturedIndices)
+
+    return capturedSheep, events
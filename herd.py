@@ -0,0 +1,740 @@
+import random
+import numpy as np
+from moveable import Moveable
+from ray_caster import AVOIDANCEANGLES, getEdges, castRays
+
+# Algorithm settings that are shared by the whole herd
+SETTINGS = ('size', 'acceleration', 'rotationSpeed',
+            'applySheepdogAvoidance', 'applyAttraction', 'applyCohesion',
+            'applySeperation', 'applyAlignment', 'applyWallAvoidance',
+            'visualRange', 'seperationDistance', 'avoidanceRange', 'avoidance',
+            'fearDistance', 'fear', 'fearTimerDefault', 'attraction')
+
+# Arrays that store a value for each sheep
+STATEARRAYS = ('position', 'rotationAngle', 'speed', 'maxSpeed', 'isScared', 'fearTimer',
+               'hasAttractionPoint', 'attractionPoint', 'cohesion', 'alignment', 'seperation')
+
+# The number of cells across the radius of the grid used to pair sheep
+# Smaller cells leave out more of the sheep that are too far away before their distance is found
+CELLDIVISIONS = 2
+
+# The most pairs of sheep that are stored at once, the herd is split into chunks with this many pairs
+CHUNKPAIRS = 1 << 18
+
+# Arrays that store the state of each sheep before the last simulation step
+PREVIOUSARRAYS = ('previousPosition', 'previousRotationAngle')
+
+class SheepView():
+    '''
+    SheepView
+
+    A thin view of one sheep stored in a Herd.
+    It lets the Scene draw the sheep and lets goals read its position
+    without the sheep being its own object.
+
+    FUNCTIONS
+        __init__(self, herdIn, indexIn, spriteIn)
+            Creates a view of the sheep at an index in the herd.
+
+        draw(self, surfaceIn, interpolation)
+            Rotates the sprite and blits it to the given surface.
+    '''
+    def __init__(self, herdIn, indexIn, spriteIn):
+        '''
+        Initializes a SheepView
+
+        Parameters
+        ----------
+        herdIn: Herd()
+            The herd that stores the sheep's values.
+
+        indexIn: int
+            The index of the sheep in the herd's arrays.
+
+        spriteIn: pygame.Surface()
+            The scaled sprite that represents the sheep.
+
+        Returns
+        -------
+        None
+        '''
+        self.herd = herdIn
+        self.index = indexIn
+        self.sprite = spriteIn
+        self.size = herdIn.size
+
+    @property
+    def position(self):
+        '''
+        The position of the sheep as a list [x, y].
+        '''
+        return [float(self.herd.position[self.index, 0]), float(self.herd.position[self.index, 1])]
+
+    @property
+    def rotationAngle(self):
+        '''
+        The rotation of the sheep in degrees.
+        '''
+        return float(self.herd.rotationAngle[self.index])
+
+    @property
+    def previousPosition(self):
+        '''
+        The position of the sheep before the last simulation step as a list [x, y].
+        '''
+        return [float(self.herd.previousPosition[self.index, 0]), float(self.herd.previousPosition[self.index, 1])]
+
+    @property
+    def previousRotationAngle(self):
+        '''
+        The rotation of the sheep before the last simulation step in degrees.
+        '''
+        return float(self.herd.previousRotationAngle[self.index])
+
+    @property
+    def isScared(self):
+        '''
+        True if the sheep is running from a sheepdog.
+        '''
+        return bool(self.herd.isScared[self.index])
+
+    def draw(self, surfaceIn, interpolation = 1):
+        '''
+        Draws the sheep.
+
+        Draws the sheep the same way that a Moveable is drawn.
+
+        Parameters
+        ----------
+        surfaceIn: pygame.Surface()
+            The surface that the sheep will be drawn onto.
+
+        interpolation: float
+            How far between the previous and current simulation step to draw
+            the sheep, from 0 to 1.
+
+        Returns
+        -------
+        None
+        '''
+        Moveable.draw(self, surfaceIn, interpolation)
+
+class Herd():
+    '''
+    Herd
+
+    Stores every sheep in the level as NumPy arrays and moves the whole
+    flock at once. This follows the same movement algorithm as Sheep but
+    each step is done for every sheep at the same time.
+
+    Each sheep is shown to the rest of the game as a SheepView, so the herd
+    can be iterated over, drawn and have sheep removed like a list of Sheep.
+
+    FUNCTIONS
+        __init__(self, herdIn)
+            Copies the values from a list of Sheep into arrays.
+
+        remove(self, sheepView)
+            Removes a sheep from the herd.
+
+        swapRemove(self, indices)
+            Removes many sheep from the herd at once.
+
+        saveState(self)
+            Stores the position and rotation of every sheep before a simulation step.
+
+        update(self, sheepdogs, attractors, walls, deltatime)
+            Moves every sheep then calculates how each sheep should move next.
+
+        move(self, deltatime)
+            Calculates the new position of every sheep.
+
+        detectCollisions(self, walls)
+            Pushes every sheep out of the walls it is colliding with.
+
+        applyMovementAlgorithm(self, sheepdogs, attractors, walls, deltatime)
+            Calculates which direction every sheep should go in and how fast.
+
+        findNeighbourPairs(self, radius)
+            Finds every pair of sheep within a radius of each other, in chunks.
+    '''
+    def __init__(self, herdIn):
+        '''
+        Initializes a Herd
+
+        Copies the position, movement and algorithm values of each Sheep into arrays.
+        The algorithm settings (visualRange, fear, etc.) are taken from the first sheep.
+
+        Parameters
+        ----------
+        herdIn: List<Sheep()>
+            The sheep that are in the level.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        if(not type(herdIn) is list): raise ValueError(f'Parameter 1 herdIn must be of type list not {type(herdIn)}')
+
+        # Algorithm settings shared by the whole herd
+        template = herdIn[0] if not len(herdIn) == 0 else None
+
+        self.size = template.size if template else 20
+        self.acceleration = template.acceleration if template else 300
+        self.rotationSpeed = template.rotationSpeed if template else 100
+
+        self.applySheepdogAvoidance = template.applySheepdogAvoidance if template else True
+        self.applyAttraction = template.applyAttraction if template else True
+        self.applyCohesion = template.applyCohesion if template else True
+        self.applySeperation = template.applySeperation if template else True
+        self.applyAlignment = template.applyAlignment if template else True
+        self.applyWallAvoidance = template.applyWallAvoidance if template else True
+
+        self.visualRange = template.visualRange if template else 200
+        self.seperationDistance = template.seperationDistance if template else 30
+        self.avoidanceRange = template.avoidanceRange if template else 50
+        self.avoidance = template.avoidance if template else 15
+        self.fearDistance = template.fearDistance if template else 70
+        self.fear = template.fear if template else 15
+        self.fearTimerDefault = template.fearTimerDefault if template else 0.5
+        self.attraction = template.attraction if template else 15
+
+        # Values for each sheep
+        self.position = np.array([sheep.position for sheep in herdIn], dtype = float).reshape(-1, 2)
+        self.rotationAngle = np.array([sheep.rotationAngle for sheep in herdIn], dtype = float)
+        self.speed = np.array([sheep.speed for sheep in herdIn], dtype = float)
+        self.maxSpeed = np.array([sheep.maxSpeed for sheep in herdIn], dtype = float)
+
+        self.isScared = np.array([sheep.isScared for sheep in herdIn], dtype = bool)
+        self.fearTimer = np.array([sheep.fearTimer for sheep in herdIn], dtype = float)
+
+        self.hasAttractionPoint = np.array([not sheep.attractionPoint == None for sheep in herdIn], dtype = bool)
+        self.attractionPoint = np.array([sheep.attractionPoint if not sheep.attractionPoint == None else [0, 0] for sheep in herdIn], dtype = float).reshape(-1, 2)
+
+        self.cohesion = np.array([sheep.cohesion for sheep in herdIn], dtype = float)
+        self.alignment = np.array([sheep.alignment for sheep in herdIn], dtype = float)
+        self.seperation = np.array([sheep.seperation for sheep in herdIn], dtype = float)
+
+        # Position and rotation before the last simulation step
+        self.previousPosition = self.position.copy()
+        self.previousRotationAngle = self.rotationAngle.copy()
+
+        # Views used to draw the sheep and check goals
+        self.views = [SheepView(self, index, sheep.sprite) for index, sheep in enumerate(herdIn)]
+
+    def __len__(self):
+        return len(self.rotationAngle)
+
+    def __iter__(self):
+        return iter(list(self.views))
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def remove(self, sheepView):
+        '''
+        Removes a sheep from the herd.
+
+        Deletes the sheep's values from each array and updates the index of the other views.
+
+        Parameters
+        ----------
+        sheepView: SheepView()
+            The view of the sheep that will be removed.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If the sheep is not in this herd.
+        '''
+        if(not sheepView.herd is self or not self.views[sheepView.index] is sheepView):
+            raise ValueError('Herd.remove(x): x not in herd')
+
+        index = sheepView.index
+
+        for name in STATEARRAYS + PREVIOUSARRAYS:
+            setattr(self, name, np.delete(getattr(self, name), index, axis = 0))
+
+        del self.views[index]
+
+        # Every sheep after the removed one has moved down by one
+        for view in self.views[index:]:
+            view.index -= 1
+
+    def swapRemove(self, indices):
+        '''
+        Removes sheep from the herd by moving the last sheep into each gap.
+
+        Only the removed sheep and the sheep moved into their places are copied,
+        so removing a few sheep from a large herd does not copy every array.
+        The order of the sheep that are left changes.
+
+        Parameters
+        ----------
+        indices: List<int>
+            The index of each sheep that will be removed.
+
+        Returns
+        -------
+        None
+        '''
+        sheepCount = len(self)
+
+        # Remove from the back so the last sheep is never one that is being removed
+        for index in sorted(indices, reverse = True):
+            sheepCount -= 1
+
+            if(not index == sheepCount):
+                for name in STATEARRAYS + PREVIOUSARRAYS:
+                    values = getattr(self, name)
+                    values[index] = values[sheepCount]
+
+                self.views[index] = self.views[sheepCount]
+                self.views[index].index = index
+
+            self.views.pop()
+
+        for name in STATEARRAYS + PREVIOUSARRAYS:
+            setattr(self, name, getattr(self, name)[:sheepCount])
+
+    def saveState(self):
+        '''
+        Stores the position and rotation of every sheep.
+
+        Call this before each simulation step so the sheep can be
+        drawn between the previous and current step.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self.previousPosition = self.position.copy()
+        self.previousRotationAngle = self.rotationAngle.copy()
+
+    def update(self, sheepdogs, attractors, walls, deltatime):
+        '''
+        Updates every sheep in the herd.
+
+        Moves the herd, pushes it out of walls, then uses the movement algorithm
+        to determine how each sheep should move next. This is the same order that
+        Sheep.update uses.
+
+        Parameters
+        ----------
+        sheepdogs: List<Moveable()>
+            Moveable objects that are in the level
+
+        attractors: List<Attractor()>
+            Attractor objects that are in the level
+
+        walls: List<Wall()>
+            Wall objects that are in the level
+
+        deltatime: float
+            The time that has passed between frames
+
+        Returns
+        -------
+        None
+        '''
+        if(len(self) == 0): return
+
+        self.move(deltatime)
+        self.detectCollisions(walls)
+        self.applyMovementAlgorithm(sheepdogs, attractors, walls, deltatime)
+
+    def move(self, deltatime):
+        '''
+        Moves every sheep.
+
+        Uses the speed and rotation of each sheep to update its position.
+        Sheep that are not moving fast enough do not move.
+
+        Parameters
+        ----------
+        deltatime: float
+            The elapsed time between frames.
+
+        Returns
+        -------
+        None
+        '''
+        moving = np.abs(self.speed) >= 1
+        radians = np.radians(self.rotationAngle + 90)
+
+        self.position[:, 0] += np.where(moving, np.sin(radians) * self.speed * deltatime, 0)
+        self.position[:, 1] += np.where(moving, np.cos(radians) * self.speed * deltatime, 0)
+
+    def detectCollisions(self, walls):
+        '''
+        Detects collisions with walls
+
+        Does the same test as Wall.isCircleColliding for every sheep at once.
+        Colliding sheep are pushed out by 1 pixel and their rotation is flipped.
+
+        Parameters
+        ----------
+        walls: List<Wall()>
+            Walls that the sheep might be colliding with.
+
+        Returns
+        -------
+        None
+        '''
+        x = self.position[:, 0]
+        y = self.position[:, 1]
+
+        # Walls are tested in order since each one can move the sheep
+        for wall in walls:
+            if(not wall.isSolid()): continue
+            
+            wallLeft = wall.rectangle[0]
+            wallRight = wall.rectangle[0] + wall.rectangle[2]
+            wallTop = wall.rectangle[1]
+            wallBottom = wall.rectangle[1] + wall.rectangle[3]
+
+            # Which side of the wall each sheep is on
+            isLeft = x < wallLeft
+            isRight = ~isLeft & (x > wallRight)
+            isAbove = y < wallTop
+            isBelow = ~isAbove & (y > wallBottom)
+
+            # If the sheep's edge is inside the wall
+            xCollision = (isLeft & (x + self.size > wallLeft)) | (isRight & (x - self.size < wallRight))
+            yCollision = (isAbove & (y + self.size > wallTop)) | (isBelow & (y - self.size < wallBottom))
+
+            colliding = (xCollision | ~(isLeft | isRight)) & (yCollision | ~(isAbove | isBelow))
+            if(not colliding.any()): continue
+
+            # Flip the rotation angle to move away from the wall
+            radians = np.radians(self.rotationAngle)
+            flippedAngle = np.degrees(np.arctan2(np.where(yCollision, -1, 1) * np.sin(radians),
+                                                 np.where(xCollision, -1, 1) * np.cos(radians)))
+            self.rotationAngle = np.where(colliding, flippedAngle, self.rotationAngle)
+
+            # Move the sheep to be outside of the wall
+            x += np.where(colliding & xCollision, np.where(isLeft, -1, 1), 0)
+            y += np.where(colliding & yCollision, np.where(isAbove, -1, 1), 0)
+
+    def findNeighbourPairs(self, radius):
+        '''
+        Finds every pair of sheep within a radius of each other.
+
+        Buckets the sheep into a grid with CELLDIVISIONS cells across the radius, then pairs each
+        sheep with the sheep in the cells around it that are close enough to hold a sheep within
+        the radius. Only the pairs within the radius are kept. Each sheep is also paired with itself.
+
+        The pairs are returned in chunks of about CHUNKPAIRS pairs before the far pairs are
+        removed, or the pairs of one sheep if it has more, so a crowded herd does not use
+        too much memory. Every pair of a sheep is in the same chunk.
+
+        Parameters
+        ----------
+        radius: float
+            The largest distance between two sheep in a pair that matters.
+
+        Returns
+        -------
+        Generator<Tuple>
+            (firstSheep, secondSheep, pairDistance) for each chunk.
+            The index of the first and second sheep in each pair and the distance between them.
+        '''
+        sheepCount = len(self)
+        cellSize = radius / CELLDIVISIONS
+        cells = np.floor(self.position / cellSize).astype(np.int64)
+        cells -= cells.min(axis = 0) - CELLDIVISIONS
+
+        # Give each cell a single key so that neighbouring cells are a fixed offset away
+        columnHeight = cells[:, 1].max() + CELLDIVISIONS + 1
+        keys = cells[:, 0] * columnHeight + cells[:, 1]
+
+        order = np.argsort(keys, kind = 'stable')
+        sortedKeys = keys[order]
+
+        # The range of sorted sheep in each neighbouring cell of each sheep, one row for each offset
+        # Cells where every point is further than the radius from every point of the sheep's cell are skipped
+        starts = []
+        counts = []
+        for xOffset in range(-CELLDIVISIONS, CELLDIVISIONS + 1):
+            for yOffset in range(-CELLDIVISIONS, CELLDIVISIONS + 1):
+                if(max(abs(xOffset) - 1, 0)**2 + max(abs(yOffset) - 1, 0)**2 >= CELLDIVISIONS**2): continue
+
+                neighbourKeys = keys + xOffset * columnHeight + yOffset
+                start = np.searchsorted(sortedKeys, neighbourKeys, 'left')
+                starts.append(start)
+                counts.append(np.searchsorted(sortedKeys, neighbourKeys, 'right') - start)
+
+        starts = np.array(starts)
+        counts = np.array(counts)
+
+        # Split the herd into chunks of sheep with about CHUNKPAIRS pairs each
+        pairEnds = np.cumsum(counts.sum(axis = 0))
+        chunkEnds = np.unique(np.append(np.searchsorted(pairEnds, np.arange(CHUNKPAIRS, pairEnds[-1], CHUNKPAIRS), 'right'), sheepCount))
+        chunkEnds = chunkEnds[chunkEnds > 0]
+
+        chunkStart = 0
+        for chunkEnd in chunkEnds:
+            chunkSheep = np.arange(chunkStart, chunkEnd)
+            chunkStart = chunkEnd
+
+            firstSheep = []
+            secondSheep = []
+            for start, count in zip(starts[:, chunkSheep], counts[:, chunkSheep]):
+                # Pair each sheep with every sheep in the cell
+                first = np.repeat(chunkSheep, count)
+                offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+
+                firstSheep.append(first)
+                secondSheep.append(order[np.repeat(start, count) + offsets])
+
+            firstSheep = np.concatenate(firstSheep)
+            secondSheep = np.concatenate(secondSheep)
+
+            difference = self.position[secondSheep] - self.position[firstSheep]
+            pairDistance = np.hypot(difference[:, 0], difference[:, 1])
+            inRange = pairDistance < radius
+
+            yield firstSheep[inRange], secondSheep[inRange], pairDistance[inRange]
+
+    def applyMovementAlgorithm(self, sheepdogs, attractors, walls, deltatime):
+        '''
+        Determines how every Sheep should move.
+
+        Uses the same forces as Sheep.applyMovementAlgorithm.
+        Every sheep reads the positions of the herd at the start of the step so the
+        result does not depend on the order of the sheep.
+        Seperation is applied from the nearest sheep within the seperationDistance.
+
+        Parameters
+        ----------
+        sheepdogs: List<Moveable()>
+            Moveable objects that are in the level
+
+        attractors: List<Attractor()>
+            Attractor objects that are in the level
+
+        walls: List<Wall()>
+            Wall objects that are in the level
+
+        deltatime: float
+            The time that has passed between frames
+
+        Returns
+        -------
+        None
+        '''
+        sheepCount = len(self)
+        finalVector = np.zeros((sheepCount, 2))
+
+        # Find the closest sheepdog to each sheep
+        sheepdogPositions = np.array([sheepdog.position for sheepdog in sheepdogs], dtype = float).reshape(-1, 2)
+        if(len(sheepdogPositions) == 0):
+            distanceToClosestSheepdog = np.full(sheepCount, 10000000.0)
+            closestSheepdogPosition = np.zeros((sheepCount, 2))
+        else:
+            sheepdogDistances = np.hypot(self.position[:, None, 0] - sheepdogPositions[None, :, 0],
+                                         self.position[:, None, 1] - sheepdogPositions[None, :, 1])
+            closestSheepdog = sheepdogDistances.argmin(axis = 1)
+            distanceToClosestSheepdog = sheepdogDistances[np.arange(sheepCount), closestSheepdog]
+            closestSheepdogPosition = sheepdogPositions[closestSheepdog]
+
+        # CONDITIONAL FORCES
+        # Sheep with a sheepdog nearby
+        nearSheepdog = distanceToClosestSheepdog < self.fearDistance
+
+        # If there was not a sheepdog nearby on the previous frame
+        becameScared = nearSheepdog & ~self.isScared
+        self.isScared |= becameScared
+        self.maxSpeed[becameScared] = 150
+        self.cohesion[becameScared] = 1
+        self.alignment[becameScared] = 6
+        self.seperation[becameScared] = 7
+        self.hasAttractionPoint[becameScared] = False
+
+        # Turn away from the sheepdog
+        self.rotationAngle[becameScared] = direction(closestSheepdogPosition[becameScared], self.position[becameScared]) % 360
+
+        # Reset the fear timer
+        self.fearTimer[nearSheepdog] = self.fearTimerDefault
+
+        # Sheep with no sheepdog nearby and no fear left
+        becameCalm = ~nearSheepdog & (self.fearTimer < 0.000001) & self.isScared
+        self.isScared &= ~becameCalm
+        self.maxSpeed[becameCalm] = 30
+        self.cohesion[becameCalm] = 1
+        self.alignment[becameCalm] = 2
+        self.seperation[becameCalm] = 8
+
+        # Choose a new attraction point
+        if(not len(attractors) == 0):
+            for index in np.flatnonzero(becameCalm):
+                self.attractionPoint[index] = random.choice(attractors).getPointInAttractor()
+                self.hasAttractionPoint[index] = True
+
+        # Sheep with no sheepdog nearby whose timer has not run out
+        self.fearTimer[~nearSheepdog & ~(self.fearTimer < 0.000001)] -= deltatime
+
+        # Scared sheep run from the sheepdog
+        if(self.applySheepdogAvoidance):
+            self.hasAttractionPoint &= ~self.isScared
+
+            directionToClosestSheepdog = direction(self.position, closestSheepdogPosition)
+            finalVector[:, 0] += np.where(self.isScared, -1 * directionToClosestSheepdog * self.fear, 0)
+            finalVector[:, 1] += np.where(self.isScared, self.fear, 0)
+
+        # Calm sheep stop at their attraction point
+        calm = ~self.isScared & self.hasAttractionPoint
+        distanceToAttractionPoint = np.hypot(self.attractionPoint[:, 0] - self.position[:, 0],
+                                             self.attractionPoint[:, 1] - self.position[:, 1])
+        self.maxSpeed[calm] = np.where(distanceToAttractionPoint[calm] < 30, 0, 30)
+
+        if(self.applyAttraction):
+            # Only apply attraction if the sheep can see the attraction point
+            attracted = calm & (distanceToAttractionPoint < self.visualRange)
+
+            directionToAttractionPoint = relativeDirection(direction(self.position, self.attractionPoint), self.rotationAngle)
+            finalVector[:, 0] += np.where(attracted, directionToAttractionPoint * self.attraction, 0)
+            finalVector[:, 1] += np.where(attracted, self.attraction, 0)
+
+        # CONSTANT FORCES
+        # Number of nearby sheep and the sums of their positions and rotations
+        nearbySheep = np.zeros(sheepCount)
+        midpoint = np.zeros((sheepCount, 2))
+        averageRotation = np.zeros(sheepCount)
+
+        for firstSheep, secondSheep, pairDistance in self.findNeighbourPairs(max(self.visualRange, self.seperationDistance)):
+            # Sheep that can be seen and are not the same sheep
+            visible = (pairDistance < self.visualRange) & ~(pairDistance == 0)
+            visibleFirst = firstSheep[visible]
+            visibleSecond = secondSheep[visible]
+
+            nearbySheep += np.bincount(visibleFirst, minlength = sheepCount)
+            midpoint[:, 0] += np.bincount(visibleFirst, self.position[visibleSecond, 0], sheepCount)
+            midpoint[:, 1] += np.bincount(visibleFirst, self.position[visibleSecond, 1], sheepCount)
+            averageRotation += np.bincount(visibleFirst, self.rotationAngle[visibleSecond], sheepCount)
+
+            if(self.applySeperation):
+                # The nearest sheep within the seperationDistance
+                # Every pair of a sheep is in the same chunk so the nearest sheep is found in one chunk
+                tooClose = (pairDistance < self.seperationDistance) & ~(pairDistance == 0)
+                closeFirst = firstSheep[tooClose]
+                closeSecond = secondSheep[tooClose]
+                closeDistance = pairDistance[tooClose]
+
+                # The first pair of each sheep with the smallest distance
+                nearestDistance = np.full(sheepCount, np.inf)
+                np.minimum.at(nearestDistance, closeFirst, closeDistance)
+                isNearest = closeDistance == nearestDistance[closeFirst]
+                sheepWithNeighbour, firstIndex = np.unique(closeFirst[isNearest], return_index = True)
+                closestSheepPosition = self.position[closeSecond[isNearest][firstIndex]]
+
+                directionToClosestSheep = relativeDirection(direction(self.position[sheepWithNeighbour], closestSheepPosition),
+                                                            self.rotationAngle[sheepWithNeighbour])
+                finalVector[sheepWithNeighbour, 0] += -1 * directionToClosestSheep * self.seperation[sheepWithNeighbour]
+                finalVector[sheepWithNeighbour, 1] += self.seperation[sheepWithNeighbour]
+
+        hasNearbySheep = nearbySheep > 0
+        nearbySheepDivisor = np.where(hasNearbySheep, nearbySheep, 1)
+
+        if(self.applyCohesion):
+            # Midpoint of all nearby sheep
+            midpoint = midpoint / nearbySheepDivisor[:, None]
+
+            directionToMidpoint = relativeDirection(direction(self.position, midpoint), self.rotationAngle)
+            finalVector[:, 0] += np.where(hasNearbySheep, directionToMidpoint * self.cohesion, 0)
+            finalVector[:, 1] += np.where(hasNearbySheep, self.cohesion, 0)
+
+        if(self.applyAlignment):
+            # Average rotation of all nearby sheep relative to each sheep's rotation
+            averageRotation = averageRotation / nearbySheepDivisor
+            averageRotation = relativeDirection(averageRotation, self.rotationAngle)
+
+            finalVector[:, 0] += np.where(hasNearbySheep, averageRotation * self.alignment, 0)
+            finalVector[:, 1] += np.where(hasNearbySheep, self.alignment, 0)
+
+        if(self.applyWallAvoidance and not len(walls) == 0):
+            averageAvoidanceRotation = np.zeros(sheepCount)
+            avoidanceRays = np.zeros(sheepCount)
+
+            # Cast every ray of every sheep against every wall at once, one angle after another
+            radians = np.radians(np.array(AVOIDANCEANGLES)[:, np.newaxis] - self.rotationAngle).reshape(-1)
+            rayDirections = np.stack([np.cos(radians), np.sin(radians)], axis = 1) * self.avoidanceRange
+            closestCollisions = castRays(np.tile(self.position, (len(AVOIDANCEANGLES), 1)), rayDirections, getEdges(walls)).reshape(len(AVOIDANCEANGLES), sheepCount)
+
+            for angle, closestCollision in zip(AVOIDANCEANGLES, closestCollisions):
+                # Distance along the ray to the nearest wall
+                hit = np.isfinite(closestCollision)
+                closestCollisionDistance = closestCollision * self.avoidanceRange
+
+                averageAvoidanceRotation += np.where(hit, (angle / abs(angle)) * 180 - ((closestCollisionDistance / self.visualRange) * 180), 0)
+                avoidanceRays += hit
+
+            avoiding = avoidanceRays > 0
+            averageAvoidanceRotation /= np.maximum(avoidanceRays, 1)
+
+            finalVector[:, 0] += np.where(avoiding, averageAvoidanceRotation * self.avoidance, 0)
+            finalVector[:, 1] += np.where(avoiding, self.avoidance, 0)
+
+        # Move the sheep according to the vector found by the algorithm
+        self.speed = np.minimum(np.maximum(self.speed + self.acceleration * deltatime, -1 * self.maxSpeed), self.maxSpeed)
+
+        turning = ~(finalVector[:, 1] == 0)
+        rotation = (finalVector[:, 0] / np.where(turning, finalVector[:, 1], 1)) / 180
+        self.rotationAngle = np.where(turning, (self.rotationAngle + rotation * self.rotationSpeed * deltatime) % 360, self.rotationAngle)
+
+def direction(points1, points2):
+    '''
+    Calculates the direction from each point to another
+
+    Array version of math_utilities.direction
+
+    Parameters
+    ----------
+    points1: numpy.ndarray<float> [[x, y], ...]
+        the first points
+
+    points2: numpy.ndarray<float> [[x, y], ...]
+        the second points
+
+    Return
+    -------
+    numpy.ndarray<float>
+        The direction from each of points1 to each of points2 in degrees
+    '''
+    return np.degrees(np.arctan2(-1 * (points2[..., 1] - points1[..., 1]), points2[..., 0] - points1[..., 0]))
+
+def relativeDirection(directions, rotationAngles):
+    '''
+    Makes directions relative to the rotation of each sheep.
+
+    Matches relativeAngle, which Sheep uses, from -360 to 180.
+
+    Parameters
+    ----------
+    directions: numpy.ndarray<float>
+        Directions in degrees
+
+    rotationAngles: numpy.ndarray<float>
+        Rotation of each sheep in degrees
+
+    Return
+    -------
+    numpy.ndarray<float>
+        The relative directions
+    '''
+    relativeDirections = directions % 360 - rotationAngles
+
+    return np.where(relativeDirections > 180, relativeDirections - 360, relativeDirections)
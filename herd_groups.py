@@ -0,0 +1,195 @@
+import math
+from herd import Herd
+
+# The cells around a cell that can hold a sheep within the radius, when cells are half of the radius wide
+# Only the cells after the cell are included so each pair of cells is only tested once
+FORWARDCELLS = [(column, row) for row in range(0, 3) for column in range(-2, 3) if row > 0 or column > 0]
+
+class HerdGroups():
+    '''
+    HerdGroups
+
+    Splits the herd into groups of sheep that can see each other.
+
+    Two sheep are in the same group if they are within the radius of each other, or of
+    a chain of sheep that connects them. The sheep are put in a grid with cells half
+    as wide as the radius, so every sheep in a cell can see each other and a cell only
+    needs to be joined to the cells around it once. Cells are joined with union-find,
+    so finding the groups takes time proportional to the number of sheep.
+    The sheep in two cells are only compared when the bounds of the sheep in each cell
+    can not tell if the cells are in range.
+
+    FUNCTIONS
+        __init__(self, radiusIn)
+            Creates an empty list of groups.
+
+        findRoot(self, cell)
+            Returns the cell that represents the group a cell is in.
+
+        isPairInRange(self, firstCell, secondCell)
+            Returns true if a sheep in one cell is within the radius of a sheep in another.
+
+        update(self, herd)
+            Finds the groups of a herd.
+    '''
+    def __init__(self, radiusIn):
+        '''
+        Initializes a HerdGroups
+
+        Parameters
+        ----------
+        radiusIn: int or float
+            Sheep within this distance of each other are in the same group.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(radiusIn) in (int, float)): raise ValueError(f'Parameter 1 radiusIn must be of type int or float not {type(radiusIn)}')
+        if(not radiusIn > 0): raise ValueError(f'Parameter 1 radiusIn must be greater than 0 not {radiusIn}')
+
+        self.radius = radiusIn
+        self.cellSize = radiusIn / 2
+
+        # (sheepCount, [centerX, centerY]) of each group, largest first
+        self.groups = []
+
+        # The number of the group each sheep is in, in the same order as the herd
+        self.groupNumbers = []
+
+        # cell -> positions of the sheep in that cell
+        self.cells = {}
+
+        # cell -> [left, top, right, bottom] of the sheep in that cell
+        self.cellBounds = {}
+
+        # cell -> the cell it was joined to, used by union-find
+        self.parents = {}
+
+    def findRoot(self, cell):
+        '''
+        Finds the cell that represents the group a cell is in.
+
+        Parameters
+        ----------
+        cell: Tuple<int> (column, row)
+            A cell that has sheep in it.
+
+        Returns
+        -------
+        Tuple<int> (column, row)
+            The same cell for every cell in the group.
+        '''
+        while(not self.parents[cell] == cell):
+            # Point the cell at its grandparent so later searches are shorter
+            self.parents[cell] = self.parents[self.parents[cell]]
+            cell = self.parents[cell]
+
+        return cell
+
+    def isPairInRange(self, firstCell, secondCell):
+        '''
+        Checks if two cells have sheep that can see each other.
+
+        Parameters
+        ----------
+        firstCell, secondCell: Tuple<int> (column, row)
+            Cells that have sheep in them.
+
+        Returns
+        -------
+        bool
+            True if a sheep in the first cell is within the radius of a sheep in the second cell.
+        '''
+        radiusSquared = self.radius * self.radius
+
+        firstLeft, firstTop, firstRight, firstBottom = self.cellBounds[firstCell]
+        secondLeft, secondTop, secondRight, secondBottom = self.cellBounds[secondCell]
+
+        # The closest the bounds get to each other along each axis
+        gapX = max(firstLeft - secondRight, secondLeft - firstRight, 0)
+        gapY = max(firstTop - secondBottom, secondTop - firstBottom, 0)
+        if(gapX * gapX + gapY * gapY >= radiusSquared): return False
+
+        # The furthest apart the bounds get along each axis
+        spanX = max(firstRight, secondRight) - min(firstLeft, secondLeft)
+        spanY = max(firstBottom, secondBottom) - min(firstTop, secondTop)
+        if(spanX * spanX + spanY * spanY < radiusSquared): return True
+
+        for firstPosition in self.cells[firstCell]:
+            for secondPosition in self.cells[secondCell]:
+                differenceX = firstPosition[0] - secondPosition[0]
+                differenceY = firstPosition[1] - secondPosition[1]
+                if(differenceX * differenceX + differenceY * differenceY < radiusSquared): return True
+
+        return False
+
+    def update(self, herd):
+        '''
+        Finds the groups of a herd.
+
+        Parameters
+        ----------
+        herd: List<Sheep()> or Herd()
+            The sheep that are in the level.
+
+        Returns
+        -------
+        None
+        '''
+        # The herd engine stores its positions in one array
+        positions = herd.position.tolist() if isinstance(herd, Herd) else [sheep.position for sheep in herd]
+
+        self.cells.clear()
+        self.cellBounds.clear()
+        self.parents.clear()
+
+        sheepCells = []
+        for position in positions:
+            cell = (math.floor(position[0] / self.cellSize), math.floor(position[1] / self.cellSize))
+            sheepCells.append(cell)
+
+            if(not cell in self.cells):
+                self.cells[cell] = []
+                self.cellBounds[cell] = [position[0], position[1], position[0], position[1]]
+                self.parents[cell] = cell
+            self.cells[cell].append(position)
+
+            bounds = self.cellBounds[cell]
+            if(position[0] < bounds[0]): bounds[0] = position[0]
+            if(position[1] < bounds[1]): bounds[1] = position[1]
+            if(position[0] > bounds[2]): bounds[2] = position[0]
+            if(position[1] > bounds[3]): bounds[3] = position[1]
+
+        # Join each cell to the cells around it that have sheep it can see
+        for cell in self.cells:
+            for offsetX, offsetY in FORWARDCELLS:
+                otherCell = (cell[0] + offsetX, cell[1] + offsetY)
+                if(not otherCell in self.cells): continue
+
+                root = self.findRoot(cell)
+                otherRoot = self.findRoot(otherCell)
+                if(root == otherRoot): continue
+
+                if(self.isPairInRange(cell, otherCell)): self.parents[otherRoot] = root
+
+        # Add up the sheep in each group
+        groupSums = {}
+        for position, cell in zip(positions, sheepCells):
+            groupSum = groupSums.setdefault(self.findRoot(cell), [0, 0, 0])
+            groupSum[0] += 1
+            groupSum[1] += position[0]
+            groupSum[2] += position[1]
+
+        # Number the groups from largest to smallest
+        roots = sorted(groupSums, key = lambda root: -groupSums[root][0])
+        groupNumberOfRoot = {root: groupNumber for groupNumber, root in enumerate(roots)}
+
+        self.groups = [(groupSums[root][0], [groupSums[root][1] / groupSums[root][0], groupSums[root][2] / groupSums[root][0]]) for root in roots]
+        self.groupNumbers = [groupNumberOfRoot[self.findRoot(cell)] for cell in sheepCells]
@@ -44,7 +44,67 @@ def direction(point1, point2):
     '''
     return math.degrees(math.atan2(-1*(point2[1]-point1[1]), (point2[0]-point1[0])))
 
-def findPointOfIntersection(p1, p2, q1, q2):
+def relativeDirection(heading, point1, point2):
+    '''
+    Calculates the direction from one point to another relative to a heading
+    
+    Uses the cross and dot products of the heading and the vector between the points
+    so the heading's angle does not need to be known.
+    
+    Parameters
+    ----------
+    heading: List<float> [x, y]
+        The direction that the angle is measured from
+    
+    point1: List<float> [x, y]
+        the first point
+    
+    point2: List<float> [x, y]
+        the second point
+    
+    Return
+    -------
+    float
+        The direction from point1 to point2 in degrees from -180 to 180.
+        Positive values are counterclockwise from the heading.
+    '''
+    vectorX = point2[0] - point1[0]
+    vectorY = point2[1] - point1[1]
+    
+    # The y axis points down so the cross product is flipped
+    cross = heading[1] * vectorX - heading[0] * vectorY
+    dot = heading[0] * vectorX + heading[1] * vectorY
+    
+    return math.degrees(math.atan2(cross, dot))
+
+def relativeAngle(angle, rotationAngle):
+    '''
+    Makes an angle relative to a rotation angle
+    
+    Measures the turn the same way the movement algorithm always has: the angle is taken
+    from 0 to 360 then the rotation angle is subtracted, and only turns of more than 180
+    degrees counterclockwise are measured clockwise instead. Turns that pass 0 degrees
+    counterclockwise are measured clockwise the long way, from -360 to -180.
+    
+    Parameters
+    ----------
+    angle: float
+        The angle in degrees
+    
+    rotationAngle: float
+        The rotation angle from 0 to 360 that the angle is measured from
+    
+    Return
+    -------
+    float
+        The angle relative to the rotation angle in degrees from -360 to 180.
+    '''
+    relative = angle % 360 - rotationAngle
+    if(relative > 180): relative -= 360
+    
+    return relative
+
+def findPointOfIntersection(p1, p2, q1, q2, result = None):
     '''
     Finds the point of intersection of 2 line segments.
     
@@ -65,9 +125,12 @@ def findPointOfIntersection(p1, p2, q1, q2):
     q2: List<float> [x, y]
         A point on line q
         
+    result: List<float> or None [x, y]
+        If given, the POI is written into this list instead of a new one.
+        
     Returns
     -------
-    Tuple<float> (x, y)
+    List<float> [x, y]
         The point of intersection (POI)
         
     None
@@ -85,7 +148,7 @@ def findPointOfIntersection(p1, p2, q1, q2):
         q1 = q2
         q2 = temp
         
-    poi = [None, None]
+    poi = [None, None] if result == None else result
     
     # if both lines are vertical
     if(p2[0] - p1[0] == 0 and q2[0] - q1[0] == 0):
@@ -131,4 +194,60 @@ def findPointOfIntersection(p1, p2, q1, q2):
     # if the POI exists on both lines
     # return it
     # otherwise return None   
-    return poi if (poi[0] >= p1[0] and poi[0] <= p2[0] and poi[0] >= q1[0] and poi[0] <= q2[0]) else None
\ No newline at end of file
+    return poi if (poi[0] >= p1[0] and poi[0] <= p2[0] and poi[0] >= q1[0] and poi[0] <= q2[0]) else None
+
+def interpolatePosition(point1, point2, fraction, result = None):
+    '''
+    Finds a point between two points
+    
+    Parameters
+    ----------
+    point1: List<float> [x, y]
+        The point at fraction 0
+    
+    point2: List<float> [x, y]
+        The point at fraction 1
+        
+    fraction: float
+        How far between the points to go from 0 to 1
+        
+    result: List<float> or None [x, y]
+        If given, the point is written into this list instead of a new one.
+    
+    Return
+    -------
+    List<float> [x, y]
+        The point between point1 and point2
+    '''
+    if(result == None):
+        return [point1[0] + (point2[0] - point1[0]) * fraction,
+                point1[1] + (point2[1] - point1[1]) * fraction]
+    
+    result[0] = point1[0] + (point2[0] - point1[0]) * fraction
+    result[1] = point1[1] + (point2[1] - point1[1]) * fraction
+    
+    return result
+
+def interpolateAngle(angle1, angle2, fraction):
+    '''
+    Finds an angle between two angles
+    
+    Turns the shortest way from the first angle to the second angle.
+    
+    Parameters
+    ----------
+    angle1: float
+        The angle in degrees at fraction 0
+    
+    angle2: float
+        The angle in degrees at fraction 1
+        
+    fraction: float
+        How far between the angles to go from 0 to 1
+    
+    Return
+    -------
+    float
+        The angle between angle1 and angle2 in degrees
+    '''
+    return angle1 + (((angle2 - angle1) + 180) % 360 - 180) * fraction
@@ -1,7 +1,12 @@
 import pygame
 import math
 import random
+import heapq
 from math_utilities import *
+from vector import Vec2
+
+# Angle of each wall avoidance ray with its cosine and sine
+AVOIDANCERAYS = [(angle, math.cos(math.radians(angle)), math.sin(math.radians(angle))) for angle in [60, 30, -30, -60]]
 
 class Moveable():
     '''
@@ -14,9 +19,12 @@ class Moveable():
         __init__(self, spriteIn, positionIn)
             Initiates a new moveable
             
-        draw(self, surfaceIn)
+        draw(self, surfaceIn, interpolation)
             Rotates the sprite and blits it to the given surface
             
+        saveState(self)
+            Stores the position and rotation before a simulation step
+            
         update(self, surfaceIn, deltatime)
             Calls the move and detectCollisions functions.
             Call this every frame if the object is being shown.
@@ -26,15 +34,40 @@ class Moveable():
             
         rotate(self, direction, deltatime)
             Changes the rotation of the moveable object
+            
+        reflectHeading(self, xCollision, yCollision)
+            Flips the direction of the moveable object off a wall
+            
+        findRotationAngle(self)
+            Finds the rotation angle again after the heading changes
         
         move(self, deltatime)
             Calculates the new position of the moveable object
             
-        detectCollisions(self, walls)
+        sweep(self, walls, deltatime, wallGrid, wallField)
+            Moves the moveable object and stops it where it first touches a wall
+            
+        detectCollisions(self, walls, wallGrid, wallField)
             Determines if the Moveable is colliding with a wall.
             Updates the Moveable's position if it needs to.
     '''
     
+    @property
+    def rotationAngle(self):
+        '''
+        The direction the moveable is facing in degrees, counterclockwise from the right.
+        
+        Found from the heading, which is the only stored direction, each time the heading
+        changes, so reading it in drawing and alignment does not call atan2 again.
+        '''
+        return self.cachedRotationAngle
+    
+    @rotationAngle.setter
+    def rotationAngle(self, angle):
+        # Find the heading that points in the direction of the angle
+        self.heading = [math.cos(math.radians(angle)), -1 * math.sin(math.radians(angle))]
+        self.cachedRotationAngle = angle % 360
+    
     def __init__(self, spriteIn, positionIn):
         '''
         Initializes a Moveable Object
@@ -71,15 +104,37 @@ class Moveable():
         self.sprite =  pygame.transform.scale(spriteIn, (self.size, self.size))
         
         # Position and movement
-        self.position = positionIn
+        # The position is changed in place so other objects can keep a reference to it
+        self.position = Vec2(positionIn)
         self.speed = 0
         self.maxSpeed = 150
         self.acceleration = 300
         
+        # heading is the direction the moveable is facing as a vector with a length of 1
+        # It is used to move and steer without calculating sines and cosines every frame
         self.rotationAngle = 0
         self.rotationSpeed = 100
         
-    def draw(self, surfaceIn):
+        # Rotation matrix of a full turn in one step, found again only when the turn changes
+        self.turnStep = 0
+        self.turnCosine = 1
+        self.turnSine = 0
+        
+        # Position and rotation before the last simulation step
+        self.previousPosition = Vec2(positionIn)
+        self.previousRotationAngle = 0
+        
+        # Reused by detectCollisions so no new lists are made for each wall that is tested
+        self.collisionResult = [False, False, False, Vec2()]
+        self.sweepMovement = Vec2()
+        
+        # Reused by draw for the position between the last two simulation steps
+        self.drawPosition = Vec2()
+        
+        # If True the moveable stops where it first touches a wall instead of being pushed out after it moves
+        self.sweepCollisions = False
+        
+    def draw(self, surfaceIn, interpolation = 1):
         '''
         Draws the moveable.
 
@@ -91,16 +146,42 @@ class Moveable():
         surfaceIn: pygame.Surface()
             The surface that the moveable will be drawn onto.
             
+        interpolation: float
+            How far between the previous and current simulation step to draw
+            the moveable, from 0 to 1.
+            
         Returns
         -------
         None
         '''
+        # Find where the moveable is between the last two simulation steps
+        position = interpolatePosition(self.previousPosition, self.position, interpolation, self.drawPosition)
+        rotationAngle = interpolateAngle(self.previousRotationAngle, self.rotationAngle, interpolation)
+        
         # Render and rotate the sprite onto a tempSurface
-        tempSurface = pygame.transform.rotate(self.sprite, self.rotationAngle)
+        tempSurface = pygame.transform.rotate(self.sprite, rotationAngle)
         tempSurface.set_colorkey((0, 255, 0))
         
-        # Blit the tempSurface to surfaceIn using self.position as a center
-        surfaceIn.blit(tempSurface, [self.position[0] - self.size /2, self.position[1] - self.size / 2])
+        # Blit the tempSurface to surfaceIn using position as a center
+        surfaceIn.blit(tempSurface, [position[0] - self.size /2, position[1] - self.size / 2])
+    
+    def saveState(self):
+        '''
+        Stores the moveable's position and rotation.
+        
+        Call this before each simulation step so the moveable can be
+        drawn between the previous and current step.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        '''
+        self.previousPosition.setVector(self.position)
+        self.previousRotationAngle = self.rotationAngle
     
     def accelerate(self, direction, deltatime):
         '''
@@ -151,14 +232,79 @@ class Moveable():
         if(self.speed > -1 and self.speed < 1): return
         
         # Update the position
-        self.position[0] += math.sin(math.radians(self.rotationAngle + 90)) * self.speed * deltatime
-        self.position[1] += math.cos(math.radians(self.rotationAngle + 90)) * self.speed * deltatime
+        self.position.addScaled(self.heading, self.speed * deltatime)
+    
+    def sweep(self, walls, deltatime, wallGrid = None, wallField = None):
+        '''
+        Move the object without passing through walls
+        
+        Finds the first wall the object would touch while it moves and stops it there,
+        so fast objects and large steps can not pass through thin walls.
+        The rotation is flipped like in detectCollisions and the rest of the
+        movement slides along the wall.
+        
+        Parameters
+        ----------
+        walls: List<Wall()>
+            Walls that the moveable might be colliding with.
+            
+        deltatime: float
+            The elapsed time between frames.
+            
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only nearby walls are tested.
+            
+        wallField: DistanceField() or None
+            The distance to the nearest wall. If given, no walls are tested when the nearest wall is far away.
+        
+        Returns
+        -------
+        None
+        '''
+        # If the object is not moveing fast enough do nothing
+        if(self.speed > -1 and self.speed < 1): return
+        
+        movement = self.sweepMovement
+        movement.set(self.heading[0] * self.speed * deltatime,
+                     self.heading[1] * self.speed * deltatime)
+        
+        # Only walls within the object's size plus the length of the movement can be reached
+        reach = self.size * 2 + math.sqrt(movement[0]**2 + movement[1]**2)
+        if(not wallField == None and wallField.sample(self.position)[0] > reach + wallField.cellSize):
+            nearbyWalls = []
+        else:
+            nearbyWalls = wallGrid.getNearby(self.position, reach) if not wallGrid == None else walls
+        
+        # A moving object can slide along at most 2 sides of walls
+        for slide in range(3):
+            # Find the first wall the object touches
+            firstCollision = None
+            for wall in nearbyWalls:
+                collision = wall.sweep(self.position, movement, self.size)
+                if(not collision == None and (firstCollision == None or collision[0] < firstCollision[0])):
+                    firstCollision = collision
+            
+            # If no walls are touched finish the movement
+            if(firstCollision == None):
+                self.position.addScaled(movement, 1)
+                return
+            
+            # Stop just before the wall
+            fraction = max(firstCollision[0] - 0.000001, 0)
+            self.position.addScaled(movement, fraction)
+            
+            # Flip its rotaion angle to move away from the wall
+            self.reflectHeading(firstCollision[1], firstCollision[2])
+            
+            # Slide the rest of the movement along the wall
+            movement.set(0 if firstCollision[1] else movement[0] * (1 - fraction),
+                         0 if firstCollision[2] else movement[1] * (1 - fraction))
         
     def rotate(self, direction, deltatime):
         '''
         Rotates the object.
         
-        Changes the rotation angle depending on the direction and elapsed time.
+        Turns the heading depending on the direction and elapsed time.
         
         Parameters
         ----------
@@ -174,10 +320,75 @@ class Moveable():
         -------
         None
         '''
-        # Rotate the object
-        self.rotationAngle = (self.rotationAngle + direction * self.rotationSpeed * deltatime) % 360
+        turnStep = self.rotationSpeed * deltatime
+        
+        if(direction == 1 or direction == -1):
+            # Full turns use the rotation matrix found for this turn, which only changes with the time step
+            if(not turnStep == self.turnStep):
+                self.turnStep = turnStep
+                self.turnCosine = math.cos(math.radians(turnStep))
+                self.turnSine = math.sin(math.radians(turnStep))
+            
+            cosine = self.turnCosine
+            sine = self.turnSine * direction
+        else:
+            # Partial turns are small so they use the first terms of the sine and cosine series
+            radians = direction * turnStep * (math.pi / 180)
+            if(-0.1 < radians < 0.1):
+                radiansSquared = radians * radians
+                cosine = 1 - radiansSquared * (0.5 - radiansSquared / 24)
+                sine = radians * (1 - radiansSquared / 6)
+            else:
+                cosine = math.cos(radians)
+                sine = math.sin(radians)
+        
+        # Rotate the heading counterclockwise
+        heading = self.heading
+        headingX = heading[0] * cosine + heading[1] * sine
+        headingY = heading[1] * cosine - heading[0] * sine
+        
+        # Keep the heading's length at 1 so small errors do not build up
+        lengthCorrection = 1.5 - (headingX * headingX + headingY * headingY) / 2
+        heading[0] = headingX * lengthCorrection
+        heading[1] = headingY * lengthCorrection
+        self.findRotationAngle()
+    
+    def reflectHeading(self, xCollision, yCollision):
+        '''
+        Flips the direction of the object off a wall
+        
+        Parameters
+        ----------
+        xCollision: bool
+            True if the object hit the left or right side of a wall.
+            
+        yCollision: bool
+            True if the object hit the top or bottom side of a wall.
+            
+        Returns
+        -------
+        None
+        '''
+        # Flip the part of the heading that points into the wall
+        if(xCollision): self.heading[0] *= -1
+        if(yCollision): self.heading[1] *= -1
+        self.findRotationAngle()
+    
+    def findRotationAngle(self):
+        '''
+        Finds the rotation angle again after the heading has been changed.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        '''
+        self.cachedRotationAngle = math.degrees(math.atan2(-1 * self.heading[1], self.heading[0])) % 360
     
-    def detectCollisions(self, walls):
+    def detectCollisions(self, walls, wallGrid = None, wallField = None):
         '''
         Detects collisions with walls
         
@@ -188,27 +399,38 @@ class Moveable():
         ----------
         walls: List<Wall()>
             Walls that the moveable might be colliding with.
-            Each one will be tested.
+            Each one will be tested if wallGrid is None.
+            
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only nearby walls are tested.
+            
+        wallField: DistanceField() or None
+            The distance to the nearest wall. If given, no walls are tested when the nearest wall is far away.
             
         Returns
         --------
         None
         '''
+        # The object can not be touching a wall if the nearest wall is further than its size
+        # The cell size is added since the distance is blended between grid points
+        if(not wallField == None and wallField.sample(self.position)[0] > self.size * 2 + wallField.cellSize): return
+        
+        # Each collision moves the object 1 pixel so walls further than its size can not be reached
+        nearbyWalls = wallGrid.getNearby(self.position, self.size * 2) if not wallGrid == None else walls
+        
         # For every wall the object could collide with
-        for wall in walls:
-            result = wall.isCircleColliding(self.position, self.size)
+        for wall in nearbyWalls:
+            result = wall.isCircleColliding(self.position, self.size, self.collisionResult)
             # If the object collided with a wall
             if(result[0]):
                 # Flip its rotaion angle to move away from the wall
-                self.rotationAngle = math.degrees(math.atan2(
-                    math.sin(math.radians(self.rotationAngle)) * -1 if result[2] else math.sin(math.radians(self.rotationAngle))* 1,
-                    math.cos(math.radians(self.rotationAngle)) * -1 if result[1] else math.cos(math.radians(self.rotationAngle)) * 1))
+                self.reflectHeading(result[1], result[2])
                 
                 # Change the position to be outside of the wall
-                self.position = result[3].copy()
+                self.position.setVector(result[3])
                 
     
-    def update(self, walls, deltatime):
+    def update(self, walls, deltatime, wallGrid = None, wallField = None):
         '''
         Update the moveable.
         
@@ -221,14 +443,25 @@ class Moveable():
             
         deltatime: float
             The elapsed time between frames.
+            
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only nearby walls are tested.
+            
+        wallField: DistanceField() or None
+            The distance to the nearest wall. If given, no walls are tested when the nearest wall is far away.
         
         Returns
         -------
         None
         '''
         
-        self.move(deltatime)
-        self.detectCollisions(walls)
+        if(self.sweepCollisions):
+            self.sweep(walls, deltatime, wallGrid, wallField)
+        else:
+            self.move(deltatime)
+            
+        # Push the object out of any walls it is inside of
+        self.detectCollisions(walls, wallGrid, wallField)
         
 class Sheep(Moveable):
     '''
@@ -240,12 +473,33 @@ class Sheep(Moveable):
     __init__(spriteIn, positionIn)
         Initialize with position, sprite, and values for the sheep's movement and movement algorithm
     
-    update(self, herd, sheepdogs, attractors, surfaceIn, walls, deltatime)
+    update(self, herd, sheepdogs, attractors, walls, deltatime, herdGrid, neighbourList, herdTree, wallGrid, wallField, threatMap)
             Calculates how the sheep should move then moves the sheep.
             Call this every frame that the object is being shown.
     
-    applyMovementAlgorithm(self, herd, sheepdogs, attractors, deltatime)
+    updateBackBuffer(self, herd, sheepdogs, attractors, walls, deltatime, herdGrid, neighbourList, herdTree, wallGrid, wallField, threatMap)
+        Updates the sheep but keeps showing its old state to the other sheep until swapBuffers is called.
+        
+    swapBuffers(self)
+        Shows the state calculated by updateBackBuffer to the other sheep.
+    
+    applyMovementAlgorithm(self, herd, sheepdogs, attractors, walls, deltatime, herdGrid, neighbourList, herdTree, wallGrid, wallField, threatMap)
         Calculates which direction the sheep should go in and how fast.
+    
+    getLevelOfDetailTime(self, sheepdogs, deltatime, threatMap)
+        Decides if the sheep should be updated this frame based on how far away the sheepdogs are.
+    
+    updateSleep(self, herd, herdGrid)
+        Puts the sheep to sleep if it is calm, still, and far from the sheepdogs.
+        
+    wake(self)
+        Wakes the sheep up so it is updated every frame.
+        
+    canSeePoint(self, point, walls, wallGrid)
+        Checks if there is a wall between the sheep and a point.
+        
+    findNearestSheep(self, herd, herdGrid, count, radius)
+        Finds the nearest sheep that this sheep can see.
     '''
     def __init__(self, spriteIn, positionIn):
         '''
@@ -274,6 +528,7 @@ class Sheep(Moveable):
         self.applySeperation = True
         self.applyAlignment = True
         self.applyWallAvoidance = True
+        self.applyLevelOfDetail = False
         
         # Algorithm values
         self.visualRange = 200
@@ -298,12 +553,71 @@ class Sheep(Moveable):
         self.attraction = 15
         self.attractionPoint = [0, 0]
         
-    def update(self, herd, sheepdogs, attractors, walls, deltatime):
+        # Flow field of the attractor that the attraction point is in
+        # If it is not None the sheep follows the shortest path around the walls to the attraction point
+        self.attractionField = None
+        
+        # Level of detail values
+        # Sheep at least this far from both sheepdogs are updated every reducedUpdateInterval frames
+        self.reducedUpdateDistance = 250
+        self.reducedUpdateInterval = 3
+        
+        # Calm sheep that are not moving and are at least this far from both sheepdogs fall asleep
+        self.sleepDistance = 300
+        
+        # Sleeping sheep wake up when a sheepdog is closer than fearDistance + wakeMargin
+        self.wakeMargin = 30
+        
+        self.isSleeping = False
+        self.wasMoving = False
+        self.distanceToClosestSheepdog = 10000000
+        
+        # Time that has passed since the sheep was last updated
+        self.skippedTime = 0
+        
+        # Start the counter at a random frame so the reduced updates are spread out
+        self.levelOfDetailCounter = random.randrange(self.reducedUpdateInterval)
+        
+        # Staggered steering values
+        # The movement algorithm is applied every steeringInterval updates
+        # The sheep still moves and collides with walls every update
+        self.steeringInterval = 1
+        self.steeringCounter = 0
+        
+        # Time that has passed since the movement algorithm was last applied
+        self.steeringTime = 0
+        
+        # If more than 0 only this many of the nearest sheep are used for cohesion and alignment
+        self.topologicalNeighbours = 0
+        
+        # Distance to the nearest wall along each wall avoidance ray, cast for the whole herd at once
+        # None if the rays are cast by the sheep itself
+        self.avoidanceRayDistances = None
+        
+        # (rotation angle, isScared, isSleeping, wasMoving) calculated by updateBackBuffer
+        # None if there is no new state to swap in
+        self.backBuffer = None
+        
+        # The position and heading from before and after updateBackBuffer
+        # They are copied in and out of the position and heading so those stay the same objects
+        self.frontPosition = Vec2()
+        self.backPosition = Vec2()
+        self.frontHeading = [1, 0]
+        self.backHeading = [1, 0]
+        
+        # True while updateBackBuffer is running, so the sheep it wakes are only woken in swapBuffers
+        self.isUpdatingBackBuffer = False
+        
+        # True if another sheep woke this sheep during updateBackBuffer
+        self.isWakePending = False
+        
+    def update(self, herd, sheepdogs, attractors, walls, deltatime, herdGrid = None, neighbourList = None, herdTree = None, wallGrid = None, wallField = None, threatMap = None):
         '''
         Updates the sheep's position
 
         Uses the movement agorithm to determine how the sheep should move then
-        moves the sheep.
+        moves the sheep. The movement algorithm is only applied every steeringInterval
+        updates, using the time that has passed since it was last applied.
         
         Parameters
         ----------
@@ -321,16 +635,286 @@ class Sheep(Moveable):
             
         deltatime: float
             The time that has passed between frames
+            
+        herdGrid: SpatialHash() or None
+            A grid containing the herd. If given, only nearby sheep are tested.
+            
+        neighbourList: NeighbourList() or None
+            Lists of the sheep near each sheep. If given, only the sheep in this sheep's list are tested.
+            
+        herdTree: QuadTree() or None
+            A tree containing the herd. If given, groups of sheep are used for cohesion and alignment
+            instead of testing each sheep.
+            
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only nearby walls are tested.
+            
+        wallField: DistanceField() or None
+            The distance to the nearest wall. If given, the sheep steers away from the nearest wall
+            instead of casting rays.
+            
+        threatMap: ThreatMap() or None
+            The nearest sheepdog to each part of the level. If given, the sheepdogs are not tested.
+        
+        Returns
+        -------
+        None
+        '''
+        # Skip the update if the sheep is asleep or far away from the sheepdogs
+        if(self.applyLevelOfDetail):
+            deltatime = self.getLevelOfDetailTime(sheepdogs, deltatime, threatMap)
+            if(deltatime == 0): return
+        
+        super().update(walls, deltatime, wallGrid, wallField)
+        
+        # Only apply the movement algorithm on this sheep's turn
+        self.steeringTime += deltatime
+        self.steeringCounter += 1
+        
+        if(self.steeringCounter % self.steeringInterval == 0):
+            self.applyMovementAlgorithm(herd, sheepdogs, attractors, walls, self.steeringTime, herdGrid, neighbourList, herdTree, wallGrid, wallField, threatMap)
+            self.steeringTime = 0
+        
+        if(self.applyLevelOfDetail):
+            self.updateSleep(herd, herdGrid)
+    
+    def updateBackBuffer(self, herd, sheepdogs, attractors, walls, deltatime, herdGrid = None, neighbourList = None, herdTree = None, wallGrid = None, wallField = None, threatMap = None):
+        '''
+        Updates the sheep without changing the state that other sheep can see.
+        
+        The new position, rotation, fear and sleep of the sheep are stored in a back buffer
+        and the old ones are put back, so every sheep updated this frame sees the herd
+        as it was at the start of the frame no matter what order they are updated in.
+        The position and heading are copied in place, so they stay the same objects.
+        The sheep this sheep wakes up are only woken when the buffers are swapped.
+        Call swapBuffers on every sheep once the whole herd has been updated.
+        
+        Parameters
+        ----------
+        The same as update.
+        
+        Returns
+        -------
+        None
+        '''
+        frontBuffer = (self.cachedRotationAngle, self.isScared, self.isSleeping, self.wasMoving)
+        self.frontPosition.setVector(self.position)
+        self.frontHeading[:] = self.heading
+        
+        self.isUpdatingBackBuffer = True
+        self.update(herd, sheepdogs, attractors, walls, deltatime, herdGrid, neighbourList, herdTree, wallGrid, wallField, threatMap)
+        self.isUpdatingBackBuffer = False
+        
+        # Keep the new state in the back buffer and put the old state back before the next sheep is updated
+        self.backBuffer = (self.cachedRotationAngle, self.isScared, self.isSleeping, self.wasMoving)
+        self.backPosition.setVector(self.position)
+        self.backHeading[:] = self.heading
+        
+        self.cachedRotationAngle, self.isScared, self.isSleeping, self.wasMoving = frontBuffer
+        self.position.setVector(self.frontPosition)
+        self.heading[:] = self.frontHeading
+    
+    def swapBuffers(self):
+        '''
+        Shows the state calculated by updateBackBuffer to the other sheep.
+        
+        Wakes the sheep up if another sheep woke it during updateBackBuffer.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        '''
+        if(not self.backBuffer == None):
+            self.cachedRotationAngle, self.isScared, self.isSleeping, self.wasMoving = self.backBuffer
+            self.position.setVector(self.backPosition)
+            self.heading[:] = self.backHeading
+            self.backBuffer = None
+        
+        if(self.isWakePending):
+            self.isWakePending = False
+            self.wake()
+    
+    def getLevelOfDetailTime(self, sheepdogs, deltatime, threatMap = None):
+        '''
+        Decides if the sheep should be updated this frame.
+        
+        Sleeping sheep are not updated until a sheepdog comes close.
+        Sheep that are far from both sheepdogs are only updated every reducedUpdateInterval
+        frames, using all the time that has passed since their last update.
+        
+        Parameters
+        ----------
+        sheepdogs: List<Moveable()>
+            Moveable objects that are in the level
+            
+        deltatime: float
+            The time that has passed between frames
+            
+        threatMap: ThreatMap() or None
+            The nearest sheepdog to each part of the level. If given, the sheepdogs are not tested.
+        
+        Returns
+        -------
+        float
+            The time that the sheep should be updated with.
+            0 if the sheep should not be updated this frame.
+        '''
+        if(not threatMap == None):
+            self.distanceToClosestSheepdog = threatMap.sample(self.position)[0]
+        else:
+            self.distanceToClosestSheepdog = min([distance(sheepdog.position, self.position) for sheepdog in sheepdogs], default = 10000000)
+        
+        # Sleeping sheep wake up if a sheepdog is almost close enough to scare them
+        if(self.isSleeping):
+            if(self.distanceToClosestSheepdog < self.fearDistance + self.wakeMargin): self.wake()
+            else: return 0
+        
+        self.skippedTime += deltatime
+        self.levelOfDetailCounter += 1
+        
+        # Sheep that are far from the sheepdogs are updated less often
+        if(self.distanceToClosestSheepdog >= self.reducedUpdateDistance and not self.levelOfDetailCounter % self.reducedUpdateInterval == 0):
+            return 0
+        
+        elapsedTime = self.skippedTime
+        self.skippedTime = 0
+        
+        return elapsedTime
+    
+    def updateSleep(self, herd, herdGrid = None):
+        '''
+        Puts the sheep to sleep or wakes up the sheep around it.
+        
+        Calm sheep that are not moving and are far from both sheepdogs fall asleep.
+        If the sheep has just started moving it wakes up the sleeping sheep that can see it.
+        
+        Parameters
+        ----------
+        herd: List<Sheep()>
+            Sheep objects that are in the level
+            
+        herdGrid: SpatialHash() or None
+            A grid containing the herd. If given, only nearby sheep are tested.
+        
+        Returns
+        -------
+        None
+        '''
+        isMoving = not (self.speed > -1 and self.speed < 1)
+        
+        # If the sheep just started moving wake up the sheep that can see it
+        if(isMoving and not self.wasMoving):
+            nearbyHerd = herdGrid.getNearby(self.position, self.visualRange) if not herdGrid == None else herd
+            
+            for sheep in nearbyHerd:
+                if(sheep.isSleeping and distance(sheep.position, self.position) < sheep.visualRange):
+                    # Other sheep are only changed once every sheep has been updated into its back buffer
+                    if(self.isUpdatingBackBuffer): sheep.isWakePending = True
+                    else: sheep.wake()
+        
+        self.wasMoving = isMoving
+        
+        # Calm sheep that are not moving and are far from the sheepdogs fall asleep
+        if(not self.isScared and not isMoving and self.distanceToClosestSheepdog >= self.sleepDistance):
+            self.isSleeping = True
+    
+    def wake(self):
+        '''
+        Wakes up the sheep.
+        
+        The sheep will be updated on the next frame.
+        
+        Parameters
+        ----------
+        None
         
         Returns
         -------
         None
         '''
+        self.isSleeping = False
+        self.skippedTime = 0
         
-        super().update(walls, deltatime)
-        self.applyMovementAlgorithm(herd, sheepdogs, attractors, walls, deltatime)
+        # Update the sheep on the next frame even if it is far from the sheepdogs
+        self.levelOfDetailCounter = -1
        
-    def applyMovementAlgorithm(self, herd, sheepdogs, attractors, walls, deltatime):
+    def canSeePoint(self, point, walls, wallGrid = None):
+        '''
+        Checks if there is a wall between the sheep and a point.
+        
+        Parameters
+        ----------
+        point: List<float> [x, y]
+            The point the sheep is looking at.
+            
+        walls: List<Wall()>
+            Wall objects that are in the level
+            
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only the walls near the line to the point are tested.
+        
+        Returns
+        -------
+        bool
+            True if no solid wall crosses the line from the sheep to the point.
+        '''
+        lineDirection = [point[0] - self.position[0], point[1] - self.position[1]]
+        
+        if(not wallGrid == None):
+            # The square around the middle of the line covers the whole line
+            middle = [(point[0] + self.position[0]) / 2, (point[1] + self.position[1]) / 2]
+            walls = wallGrid.getNearby(middle, max(abs(lineDirection[0]), abs(lineDirection[1])) / 2)
+        
+        for wall in walls:
+            if(not wall.raycast(self.position, lineDirection, 1) == None): return False
+        
+        return True
+    
+    def findNearestSheep(self, herd, herdGrid = None, count = None, radius = None):
+        '''
+        Finds the nearest sheep that this sheep can see.
+        
+        Finds up to topologicalNeighbours sheep within the visualRange.
+        
+        Parameters
+        ----------
+        herd: List<Sheep()>
+            Sheep objects that are in the level
+            
+        herdGrid: SpatialHash() or None
+            A grid containing the herd. If given, only the cells near the sheep are searched.
+            
+        count: int or None
+            The most sheep to find. Uses topologicalNeighbours if None.
+            
+        radius: float or None
+            Only sheep closer than this distance are found. Uses visualRange if None.
+        
+        Returns
+        -------
+        List<Sheep()>
+            The nearest sheep, nearest first.
+        '''
+        if(count == None): count = self.topologicalNeighbours
+        if(radius == None): radius = self.visualRange
+        
+        if(not herdGrid == None):
+            return herdGrid.getNearest(self.position, count, radius, self)
+        
+        # Select the nearest sheep without sorting the whole herd
+        visibleSheep = []
+        for sheepNumber, sheep in enumerate(herd):
+            distanceToOtherSheep = distance(sheep.position, self.position)
+            if(distanceToOtherSheep < radius and not sheep is self):
+                visibleSheep.append((distanceToOtherSheep, sheepNumber, sheep))
+        
+        return [visible[2] for visible in heapq.nsmallest(count, visibleSheep)]
+    
+    def applyMovementAlgorithm(self, herd, sheepdogs, attractors, walls, deltatime, herdGrid = None, neighbourList = None, herdTree = None, wallGrid = None, wallField = None, threatMap = None):
         '''
         Determines how the Sheep should move.
 
@@ -354,6 +938,26 @@ class Sheep(Moveable):
             
         deltatime: float
             The time that has passed between frames
+            
+        herdGrid: SpatialHash() or None
+            A grid containing the herd. If given, only sheep in nearby cells are tested.
+            
+        neighbourList: NeighbourList() or None
+            Lists of the sheep near each sheep. If given, only the sheep in this sheep's list are tested.
+            
+        herdTree: QuadTree() or None
+            A tree containing the herd. If given, groups of sheep are used for cohesion and alignment
+            instead of testing each sheep.
+            
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only nearby walls are tested.
+            
+        wallField: DistanceField() or None
+            The distance to the nearest wall. If given, the sheep steers away from the nearest wall
+            instead of casting rays.
+            
+        threatMap: ThreatMap() or None
+            The nearest sheepdog to each part of the level. If given, the sheepdogs are not tested.
         
         Returns
         -------
@@ -365,14 +969,18 @@ class Sheep(Moveable):
         distanceToClosestSheepDog = 10000000
         closestSheepdog = None
         
-        # For every sheepdog
-        for sheepdog in sheepdogs:
-            # If it is closer than the distanceToClosestSheepDog
-            distanceToSheepdog = distance(sheepdog.position, self.position)
-            if distanceToClosestSheepDog > distanceToSheepdog:
-                # Store that sheepdog and its position
-                distanceToClosestSheepDog = distanceToSheepdog
-                closestSheepdog = sheepdog
+        if(not threatMap == None):
+            # Look up the closest sheepdog instead of testing every sheepdog
+            distanceToClosestSheepDog, closestSheepdog = threatMap.sample(self.position)
+        else:
+            # For every sheepdog
+            for sheepdog in sheepdogs:
+                # If it is closer than the distanceToClosestSheepDog
+                distanceToSheepdog = distance(sheepdog.position, self.position)
+                if distanceToClosestSheepDog > distanceToSheepdog:
+                    # Store that sheepdog and its position
+                    distanceToClosestSheepDog = distanceToSheepdog
+                    closestSheepdog = sheepdog
         
         # CONDITIONAL FORCES
         # If there is a sheep dog nearby
@@ -388,6 +996,7 @@ class Sheep(Moveable):
                 self.seperation = 7
                 
                 self.attractionPoint = None
+                self.attractionField = None
                 
                 # Turn away from the sheepdog
                 self.rotationAngle = direction(closestSheepdog.position, self.position) % 360
@@ -409,7 +1018,9 @@ class Sheep(Moveable):
                 
                 # Choose a new attraction point
                 if(not len(attractors) == 0):
-                    self.attractionPoint = random.choice(attractors).getPointInAttractor()
+                    attractor = random.choice(attractors)
+                    self.attractionPoint = attractor.getPointInAttractor()
+                    self.attractionField = attractor.flowField
                 
         # If there is no sheepdog nearby but the timer has not runout   
         else:
@@ -418,7 +1029,8 @@ class Sheep(Moveable):
             
         # If the sheep is scared               
         if(self.isScared):
-            if(self.applySheepdogAvoidance):
+            # The threat map does not have a sheepdog if the sheep is still scared but the sheepdogs are far away
+            if(self.applySheepdogAvoidance and not closestSheepdog == None):
                 # Apply Sheepdog Avoidance
                 directionToClosestSheepdog = direction(self.position, closestSheepdog.position)
                 self.attractionPoint = None
@@ -436,12 +1048,23 @@ class Sheep(Moveable):
                 
                 if(self.applyAttraction):
                     # Apply Attraction
-                    # Only appy attraction is the sheep can see the attraction point
-                    if(distance(self.position, self.attractionPoint) < self.visualRange):
-                        directionToAttractionPoint = direction(self.position, self.attractionPoint) % 360
-                        directionToAttractionPoint -= self.rotationAngle
+                    isInRange = distance(self.position, self.attractionPoint) < self.visualRange
+                    
+                    # Follow the path around the walls if the attraction point is too far away or behind a wall
+                    flowDirection = None
+                    if(not self.attractionField == None and (not isInRange or not self.canSeePoint(self.attractionPoint, walls, wallGrid))):
+                        flowDirection = self.attractionField.getDirection(self.position)
+                    
+                    if(not flowDirection == None):
+                        directionToAttractionPoint = relativeAngle(direction([0, 0], flowDirection), self.rotationAngle)
+                        
+                        finalVector[0] += directionToAttractionPoint * self.attraction
+                        finalVector[1] += self.attraction 
+                    
+                    # Without a path only appy attraction is the sheep can see the attraction point
+                    elif(isInRange):
+                        directionToAttractionPoint = relativeAngle(direction(self.position, self.attractionPoint), self.rotationAngle)
                         
-                        if(directionToAttractionPoint > 180): directionToAttractionPoint = -360 + directionToAttractionPoint
                         finalVector[0] += directionToAttractionPoint * self.attraction
                         finalVector[1] += self.attraction 
         
@@ -459,11 +1082,11 @@ class Sheep(Moveable):
         # alignment: average rotaion of nearby sheep
         # cohestion: average position of nearby sheep
         # seperation: position of the nearest sheep
-        for sheep in herd:
-            distanceToOtherSheep = distance(sheep.position, self.position)
-            # if the sheep can be seen and is not this sheep
-            if(distanceToOtherSheep < self.visualRange and not distanceToOtherSheep == 0):
-                
+        if(self.topologicalNeighbours > 0):
+            # Only use the nearest sheep so crowded sheep do not test the whole crowd
+            nearestSheep = self.findNearestSheep(herd, herdGrid)
+            
+            for sheep in nearestSheep:
                 # Add its position to the midpoint
                 midpoint[0] += sheep.position[0]
                 midpoint[1] += sheep.position[1]
@@ -473,11 +1096,46 @@ class Sheep(Moveable):
                 
                 # Increment nearbySheep
                 nearbySheep += 1
-
-            # If the sheep is closer than the closest sheep store its position    
-            if(distanceToOtherSheep < self.seperationDistance):
-                if(distanceToOtherSheep < closestSheepDistance and not distanceToOtherSheep == 0):
-                    closestSheepPosition = sheep.position
+            
+            # The true nearest sheep is the first one
+            if(not len(nearestSheep) == 0 and distance(nearestSheep[0].position, self.position) < self.seperationDistance):
+                closestSheepPosition = nearestSheep[0].position
+        elif(not herdTree == None):
+            # Use the sums of groups of sheep so far away sheep are not tested one at a time
+            nearbySheep, midpoint[0], midpoint[1], averageRotation = herdTree.query(self.position, self.visualRange, self)
+            
+            # Seperation only needs the nearest sheep
+            nearestSheep = self.findNearestSheep(herd, herdGrid, 1, self.seperationDistance)
+            if(not len(nearestSheep) == 0):
+                closestSheepPosition = nearestSheep[0].position
+        else:
+            # Only test the sheep in this sheep's neighbour list or in nearby cells
+            if(not neighbourList == None):
+                nearbyHerd = neighbourList.getNeighbours(self)
+            elif(not herdGrid == None):
+                nearbyHerd = herdGrid.getNearby(self.position, max(self.visualRange, self.seperationDistance))
+            else:
+                nearbyHerd = herd
+            
+            for sheep in nearbyHerd:
+                distanceToOtherSheep = distance(sheep.position, self.position)
+                # if the sheep can be seen and is not this sheep
+                if(distanceToOtherSheep < self.visualRange and not distanceToOtherSheep == 0):
+                    
+                    # Add its position to the midpoint
+                    midpoint[0] += sheep.position[0]
+                    midpoint[1] += sheep.position[1]
+                    
+                    # Add its rotation to the average rotation
+                    averageRotation += sheep.rotationAngle
+                    
+                    # Increment nearbySheep
+                    nearbySheep += 1
+    
+                # If the sheep is closer than the closest sheep store its position    
+                if(distanceToOtherSheep < self.seperationDistance):
+                    if(distanceToOtherSheep < closestSheepDistance and not distanceToOtherSheep == 0):
+                        closestSheepPosition = sheep.position
         
         if(self.applyCohesion):
             # Apple Cohesion
@@ -487,9 +1145,7 @@ class Sheep(Moveable):
                 midpoint[1] = midpoint[1]/nearbySheep      
                 
                 # Calculate the relative direction to the midpoint
-                directionToMidpoint = direction(self.position, midpoint) % 360
-                directionToMidpoint -= self.rotationAngle
-                if(directionToMidpoint > 180): directionToMidpoint = -360 + directionToMidpoint
+                directionToMidpoint = relativeAngle(direction(self.position, midpoint), self.rotationAngle)
                 
                 # Add the direction with the cohesion scaler to the final vector 
                 finalVector[0] += directionToMidpoint * self.cohesion
@@ -499,9 +1155,7 @@ class Sheep(Moveable):
             # Apply Seperation
             if(not closestSheepPosition == []):
                 # Calculate the relative direction to the closest sheep
-                directionToClosestSheep = direction(self.position, closestSheepPosition) % 360
-                directionToClosestSheep -= self.rotationAngle
-                if(directionToClosestSheep > 180): directionToClosestSheep = -360 + directionToClosestSheep
+                directionToClosestSheep = relativeAngle(direction(self.position, closestSheepPosition), self.rotationAngle)
                 
                 # Add the direction with the seperation scaler to the final vector 
                 finalVector[0] += -1 * directionToClosestSheep * self.seperation
@@ -514,46 +1168,62 @@ class Sheep(Moveable):
                 averageRotation /= nearbySheep
                 
                 # Make that value relative to the sheep's rotation
-                averageRotation -= self.rotationAngle
-                if(averageRotation > 180): averageRotation = -360 + averageRotation
+                averageRotation = relativeAngle(averageRotation, self.rotationAngle)
                 
                 # Add the averageRoation with the alignment scaler to the final vector 
                 finalVector[0] += averageRotation * self.alignment
                 finalVector[1] += self.alignment
                 
-        if(self.applyWallAvoidance):
+        if(self.applyWallAvoidance and not wallField == None):
+            # Wall Avoidance from the distance to the nearest wall
+            wallDistance, awayFromWallX, awayFromWallY = wallField.sample(self.position)
+            
+            if(wallDistance < self.avoidanceRange and not (awayFromWallX == 0 and awayFromWallY == 0)):
+                # Calculate the relative direction away from the nearest wall
+                directionAwayFromWall = relativeDirection(self.heading, [0, 0], [awayFromWallX, awayFromWallY])
+                
+                # If the sheep is facing the wall turn until it is moving along the wall
+                # Turn harder when the wall is closer
+                if(abs(directionAwayFromWall) > 90):
+                    closeness = 1 - max(wallDistance, 0) / self.avoidanceRange
+                    
+                    finalVector[0] += (directionAwayFromWall - math.copysign(90, directionAwayFromWall)) * self.avoidance * closeness
+                    finalVector[1] += self.avoidance * closeness
+                    
+        elif(self.applyWallAvoidance):
             # Wall Avoidance
             averageAvoidanceRotation = 0
             avoidanceRays = 0
             
+            # Only the walls within the length of the rays can be hit
+            if(self.avoidanceRayDistances == None):
+                nearbyWalls = wallGrid.getNearby(self.position, self.avoidanceRange) if not wallGrid == None else walls
+            
             # Angle of each ray that will be tested
-            for angle in [60, 30, -30, -60]:
-                relativeAngle = angle - self.rotationAngle
-                
-                # End point of the ray
-                visualRay = (self.position[0] + self.avoidanceRange * math.cos(math.radians(relativeAngle)),
-                             self.position[1] + self.avoidanceRange * math.sin(math.radians(relativeAngle)))
-                
-                # check if the ray is colliding with a wall
-                closestCollision = None
-                for wall in walls:
-                    rayCollision = wall.isLineSegmentColliding(self.position, visualRay)
+            for rayNumber, (angle, cosine, sine) in enumerate(AVOIDANCERAYS):
+                # Use the distance found when the rays of the whole herd were cast
+                if(not self.avoidanceRayDistances == None):
+                    closestCollisionDistance = self.avoidanceRayDistances[rayNumber]
+                else:
+                    # Direction of the ray with a length of 1 so the hits are distances
+                    # The heading is turned by the ray's angle
+                    rayDirection = (self.heading[0] * cosine - self.heading[1] * sine,
+                                    self.heading[0] * sine + self.heading[1] * cosine)
                     
-                    # Store the nearest collision to the sheep
-                    if(rayCollision == None): continue
-                    if(closestCollision == None): closestCollision = rayCollision
-                    
-                    if(distance(self.position, rayCollision) < distance(self.position, closestCollision)):
-                        closestCollision = rayCollision
-            
+                    # check if the ray is colliding with a wall
+                    # Only walls closer than the nearest hit so far are tested
+                    closestCollisionDistance = None
+                    for wall in nearbyWalls:
+                        rayCollision = wall.raycast(self.position, rayDirection, self.avoidanceRange if closestCollisionDistance == None else closestCollisionDistance)
+                        
+                        # Store the nearest collision to the sheep
+                        if(not rayCollision == None): closestCollisionDistance = rayCollision
                 
-                if(not closestCollision == None):
+                if(not closestCollisionDistance == None):
                     
                     # Determine how the sheep should turn based on this ray
                     # If the collision is near then turn further
                     # Ture towards the opposite direction of the collision
-                    closestCollisionDistance = distance(self.position, closestCollision)
-                    
                     averageAvoidanceRotation += (angle / abs(angle)) * 180 - ((closestCollisionDistance / self.visualRange) * 180)
                     avoidanceRays += 1
 
@@ -0,0 +1,164 @@
+import math
+
+class NeighbourList():
+    '''
+    NeighbourList
+
+    Stores the objects near each object so they do not need to be searched for every frame.
+
+    Each list contains every object within the radius plus a skin distance.
+    While no object has moved more than half the skin since the lists were built,
+    every object within the radius of another object is still in its list.
+    Once an object moves further than that the lists are rebuilt.
+
+    FUNCTIONS
+        __init__(self, radiusIn, skinIn)
+            Creates empty neighbour lists.
+
+        build(self, objects, grid)
+            Finds the neighbours of every object.
+
+        update(self, objectIn, objects, grid)
+            Rebuilds the lists if an object has moved too far since they were built.
+
+        remove(self, objectIn)
+            Removes an object from the lists.
+
+        getNeighbours(self, objectIn)
+            Returns the objects that might be within the radius of an object.
+    '''
+    def __init__(self, radiusIn, skinIn):
+        '''
+        Initializes a NeighbourList
+
+        Parameters
+        ----------
+        radiusIn: int or float
+            The largest distance between neighbours that matters.
+
+        skinIn: int or float
+            Extra distance added to the radius when the lists are built.
+            A larger skin means the lists are rebuilt less often but are longer.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(radiusIn) in (int, float)): raise ValueError(f'Parameter 1 radiusIn must be of type int or float not {type(radiusIn)}')
+        if(not type(skinIn) in (int, float)): raise ValueError(f'Parameter 2 skinIn must be of type int or float not {type(skinIn)}')
+        if(not skinIn > 0): raise ValueError(f'Parameter 2 skinIn must be greater than 0 not {skinIn}')
+
+        self.radius = radiusIn
+        self.skin = skinIn
+
+        # object -> objects within radius + skin when the lists were built
+        self.neighbours = {}
+
+        # object -> position when the lists were built
+        self.buildPositions = {}
+
+        # The number of times the lists have been built
+        self.buildCount = 0
+
+    def build(self, objects, grid = None):
+        '''
+        Builds the neighbour list of every object.
+
+        Parameters
+        ----------
+        objects: List<object>
+            Objects with a position attribute [x, y].
+            Neighbours are stored in the same order as this list.
+
+        grid: SpatialHash() or None
+            An up to date grid containing the objects.
+            If given, only nearby cells are searched.
+
+        Returns
+        -------
+        None
+        '''
+        self.neighbours.clear()
+        self.buildPositions.clear()
+        self.buildCount += 1
+
+        listRadius = self.radius + self.skin
+
+        for objectIn in objects:
+            candidates = grid.getNearby(objectIn.position, listRadius) if not grid == None else objects
+
+            self.neighbours[objectIn] = [candidate for candidate in candidates
+                                         if not candidate is objectIn and
+                                         math.sqrt((candidate.position[0] - objectIn.position[0])**2 + (candidate.position[1] - objectIn.position[1])**2) < listRadius]
+            self.buildPositions[objectIn] = list(objectIn.position)
+
+    def update(self, objectIn, objects, grid = None):
+        '''
+        Checks if the lists need to be rebuilt after an object has moved.
+
+        Call this after an object moves. If the object has moved more than half the skin
+        since the lists were built, they are rebuilt right away.
+
+        Parameters
+        ----------
+        objectIn: object
+            The object that has moved.
+
+        objects: List<object>
+            Every object, used if the lists need to be rebuilt.
+
+        grid: SpatialHash() or None
+            An up to date grid containing the objects.
+
+        Returns
+        -------
+        None
+        '''
+        buildPosition = self.buildPositions.get(objectIn)
+        if(buildPosition == None): return
+
+        # Two objects that have each moved half the skin could now be within the radius
+        if(math.sqrt((objectIn.position[0] - buildPosition[0])**2 + (objectIn.position[1] - buildPosition[1])**2) > self.skin / 2):
+            self.build(objects, grid)
+
+    def remove(self, objectIn):
+        '''
+        Removes an object from the lists.
+
+        Parameters
+        ----------
+        objectIn: object
+            The object that will be removed.
+
+        Returns
+        -------
+        None
+        '''
+        self.buildPositions.pop(objectIn, None)
+
+        # Remove the object from the list of each of its neighbours
+        for neighbour in self.neighbours.pop(objectIn, []):
+            if(neighbour in self.neighbours): self.neighbours[neighbour].remove(objectIn)
+
+    def getNeighbours(self, objectIn):
+        '''
+        Returns the neighbours of an object.
+
+        Parameters
+        ----------
+        objectIn: object
+            An object that was in the lists when they were built.
+
+        Returns
+        -------
+        List<object>
+            Every object that might be within the radius of objectIn.
+            An empty list if objectIn was not in the lists.
+        '''
+        return self.neighbours.get(objectIn, [])
@@ -0,0 +1,322 @@
+import random
+import numpy as np
+import multiprocessing
+from multiprocessing import shared_memory
+from herd import Herd, SETTINGS, STATEARRAYS
+from gate import Gate
+
+# Number of columns each state array uses in a shared buffer row
+STATECOLUMNS = {'position': 2, 'attractionPoint': 2}
+
+# Values used by this worker process, set once by initializeWorker
+workerState = {}
+
+def getColumns():
+    '''
+    Finds where each state array is stored in a shared buffer row.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    Dictionary<str, slice>
+        The columns of each state array in a row.
+
+    int
+        The number of columns in a row.
+    '''
+    columns = {}
+    columnCount = 0
+    for name in STATEARRAYS:
+        width = STATECOLUMNS.get(name, 1)
+        columns[name] = slice(columnCount, columnCount + width)
+        columnCount += width
+
+    return columns, columnCount
+
+def initializeWorker(inputName, outputName, capacity, settings, attractors, walls):
+    '''
+    Sets up a worker process.
+
+    Attaches to the shared buffers and stores the values that do not change between steps.
+    Each worker seeds its own random numbers, since forked workers would otherwise
+    all start from the same state and make the same random choices.
+
+    Parameters
+    ----------
+    inputName: str
+        Name of the shared buffer that the herd state is read from.
+
+    outputName: str
+        Name of the shared buffer that the new herd state is written to.
+
+    capacity: int
+        The most sheep that the buffers can hold.
+
+    settings: Dictionary<str, dynamic>
+        The algorithm settings of the herd.
+
+    attractors: List<Attractor()>
+        Attractor objects that are in the level
+
+    walls: List<Wall()>
+        Wall objects that are in the level
+
+    Returns
+    -------
+    None
+    '''
+    columns, columnCount = getColumns()
+
+    workerState['inputMemory'] = shared_memory.SharedMemory(name = inputName)
+    workerState['outputMemory'] = shared_memory.SharedMemory(name = outputName)
+    workerState['input'] = np.ndarray((capacity, columnCount), dtype = float, buffer = workerState['inputMemory'].buf)
+    workerState['output'] = np.ndarray((capacity, columnCount), dtype = float, buffer = workerState['outputMemory'].buf)
+
+    # An empty herd with the same settings, filled with a strip of sheep each step
+    stripHerd = Herd([])
+    for name, value in settings.items():
+        setattr(stripHerd, name, value)
+
+    workerState['herd'] = stripHerd
+    workerState['attractors'] = attractors
+    workerState['walls'] = walls
+    workerState['gates'] = [wall for wall in walls if isinstance(wall, Gate)]
+
+    random.seed()
+
+def updateStrip(task):
+    '''
+    Runs the movement algorithm for one strip of the herd.
+
+    Reads the strip and its halo (sheep close enough to the strip to be seen by it)
+    from the input buffer and writes the new state of the strip to the output buffer.
+    The halo sheep are only read.
+
+    Parameters
+    ----------
+    task: Tuple
+        (haloStart, stripStart, stripEnd, haloEnd, sheepdogs, gateStates, deltatime)
+        Rows of the input buffer, the sheepdogs, whether each gate is open and its rectangle, and the elapsed time.
+
+    Returns
+    -------
+    None
+    '''
+    haloStart, stripStart, stripEnd, haloEnd, sheepdogs, gateStates, deltatime = task
+    columns, columnCount = getColumns()
+
+    # The worker's copies of the gates are changed to match the level
+    for gate, (isOpen, rectangle) in zip(workerState['gates'], gateStates):
+        gate.isOpen = isOpen
+        gate.rectangle = rectangle
+
+    rows = workerState['input'][haloStart:haloEnd]
+    stripHerd = workerState['herd']
+
+    # Copy the strip and its halo into the herd
+    for name in STATEARRAYS:
+        values = rows[:, columns[name]].copy()
+        if(not name in STATECOLUMNS): values = values[:, 0]
+        if(name in ('isScared', 'hasAttractionPoint')): values = values.astype(bool)
+        setattr(stripHerd, name, values)
+
+    stripHerd.applyMovementAlgorithm(sheepdogs, workerState['attractors'], workerState['walls'], deltatime)
+
+    # Only write back the sheep this strip owns
+    owned = slice(stripStart - haloStart, stripEnd - haloStart)
+    output = workerState['output'][stripStart:stripEnd]
+    for name in STATEARRAYS:
+        output[:, columns[name]] = getattr(stripHerd, name)[owned].reshape(stripEnd - stripStart, -1)
+
+class ParallelHerd(Herd):
+    '''
+    ParallelHerd
+
+    A Herd that runs the movement algorithm in a pool of worker processes.
+
+    The herd is split into vertical strips with the same number of sheep.
+    Each step the herd is written to a shared buffer sorted by x position, so every
+    strip and its halo (the sheep within visualRange of the strip) are one block of rows.
+    Each worker reads its block and writes the new state of its strip to a second
+    shared buffer, which is gathered back into the herd.
+
+    Moving and wall collisions are done in the main process since they are cheap.
+
+    FUNCTIONS
+        __init__(self, herdIn, attractors, walls, processes)
+            Copies the sheep into arrays and starts the worker processes.
+
+        update(self, sheepdogs, attractors, walls, deltatime)
+            Moves the herd then runs the movement algorithm in the workers.
+
+        close(self)
+            Stops the worker processes and frees the shared buffers.
+    '''
+    def __init__(self, herdIn, attractors, walls, processes = None):
+        '''
+        Initializes a ParallelHerd
+
+        Parameters
+        ----------
+        herdIn: List<Sheep()>
+            The sheep that are in the level.
+
+        attractors: List<Attractor()>
+            Attractor objects that are in the level.
+            These are sent to the workers once.
+
+        walls: List<Wall()>
+            Wall objects that are in the level.
+            These are sent to the workers once, then the state of each gate is sent every step.
+
+        processes: int or None
+            The number of worker processes. Uses every core if None.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        super().__init__(herdIn)
+
+        if(not processes == None and not type(processes) is int): raise ValueError(f'Parameter 4 processes must be of type int not {type(processes)}')
+
+        self.processes = processes if processes else multiprocessing.cpu_count()
+        self.capacity = max(len(self), 1)
+
+        self.columns, self.columnCount = getColumns()
+
+        # Buffers for the herd state before and after the movement algorithm
+        bufferSize = self.capacity * self.columnCount * np.dtype(float).itemsize
+        self.inputMemory = shared_memory.SharedMemory(create = True, size = bufferSize)
+        self.outputMemory = shared_memory.SharedMemory(create = True, size = bufferSize)
+        self.input = np.ndarray((self.capacity, self.columnCount), dtype = float, buffer = self.inputMemory.buf)
+        self.output = np.ndarray((self.capacity, self.columnCount), dtype = float, buffer = self.outputMemory.buf)
+
+        # The gates are the only walls that change
+        self.gates = [wall for wall in walls if isinstance(wall, Gate)]
+
+        settings = {name: getattr(self, name) for name in SETTINGS}
+        self.pool = multiprocessing.Pool(self.processes, initializeWorker,
+                                         (self.inputMemory.name, self.outputMemory.name, self.capacity, settings, attractors, walls))
+
+    def update(self, sheepdogs, attractors, walls, deltatime):
+        '''
+        Updates every sheep in the herd.
+
+        Moves the herd and pushes it out of walls, then runs the movement algorithm
+        for each strip in the worker processes and gathers the results.
+        The attractors and walls given to the constructor are used by the workers,
+        with the current state of each gate.
+
+        Parameters
+        ----------
+        sheepdogs: List<Moveable()>
+            Moveable objects that are in the level
+
+        attractors: List<Attractor()>
+            Attractor objects that are in the level
+
+        walls: List<Wall()>
+            Wall objects that are in the level
+
+        deltatime: float
+            The time that has passed between frames
+
+        Returns
+        -------
+        None
+        '''
+        sheepCount = len(self)
+        if(sheepCount == 0): return
+
+        self.move(deltatime)
+        self.detectCollisions(walls)
+
+        # Write the herd to the input buffer sorted by x position
+        order = np.argsort(self.position[:, 0], kind = 'stable')
+        for name in STATEARRAYS:
+            self.input[:sheepCount, self.columns[name]] = getattr(self, name)[order].reshape(sheepCount, -1)
+
+        # Split the herd into strips with the same number of sheep
+        sortedX = self.input[:sheepCount, 0]
+        haloWidth = max(self.visualRange, self.seperationDistance)
+        boundaries = np.linspace(0, sheepCount, min(self.processes, sheepCount) + 1).astype(int)
+
+        # Only the positions of the sheepdogs are sent to the workers
+        sheepdogPositions = [SheepdogPosition(list(sheepdog.position)) for sheepdog in sheepdogs]
+        gateStates = [(gate.isOpen, list(gate.rectangle)) for gate in self.gates]
+
+        tasks = []
+        for stripStart, stripEnd in zip(boundaries[:-1], boundaries[1:]):
+            # Include every sheep that a sheep in the strip could see
+            haloStart = int(np.searchsorted(sortedX, sortedX[stripStart] - haloWidth, 'left'))
+            haloEnd = int(np.searchsorted(sortedX, sortedX[stripEnd - 1] + haloWidth, 'right'))
+
+            tasks.append((haloStart, int(stripStart), int(stripEnd), haloEnd, sheepdogPositions, gateStates, deltatime))
+
+        self.pool.map(updateStrip, tasks)
+
+        # Gather the results back into the original order
+        for name in STATEARRAYS:
+            values = self.output[:sheepCount, self.columns[name]]
+            if(not name in STATECOLUMNS): values = values[:, 0]
+
+            gathered = np.empty_like(getattr(self, name))
+            gathered[order] = values
+            setattr(self, name, gathered)
+
+    def close(self):
+        '''
+        Stops the worker processes and frees the shared buffers.
+
+        Call this once the herd is no longer used. Does nothing if the herd is already closed.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        if(self.pool == None): return
+
+        # Let the workers exit on their own since pygame can stop them from being terminated
+        self.pool.close()
+        self.pool.join()
+        self.pool = None
+
+        self.inputMemory.close()
+        self.inputMemory.unlink()
+        self.outputMemory.close()
+        self.outputMemory.unlink()
+
+class SheepdogPosition():
+    '''
+    SheepdogPosition
+
+    Stores the position of a sheepdog so that it can be sent to a worker process.
+    Worker processes only read the position of each sheepdog.
+    '''
+    def __init__(self, positionIn):
+        '''
+        Initializes a SheepdogPosition
+
+        Parameters
+        ----------
+        positionIn: List<float> [x, y]
+            The position of the sheepdog.
+
+        Returns
+        -------
+        None
+        '''
+        self.position = positionIn
@@ -0,0 +1,307 @@
+import math
+
+class QuadTreeNode():
+    '''
+    QuadTreeNode
+
+    A square area of a QuadTree.
+    Stores the number of objects in the area and the sums of their positions and rotations.
+
+    FUNCTIONS
+        __init__(self, left, top, size)
+            Creates an empty node that covers a square.
+
+        add(self, objectValues)
+            Adds an object's values to the node's sums.
+    '''
+    def __init__(self, left, top, size):
+        '''
+        Initializes a QuadTreeNode
+
+        Parameters
+        ----------
+        left: float
+            The left side of the square.
+
+        top: float
+            The top side of the square.
+
+        size: float
+            The width and height of the square.
+
+        Returns
+        -------
+        None
+        '''
+        self.left = left
+        self.top = top
+        self.size = size
+
+        # Sums of every object in the node
+        self.count = 0
+        self.sumX = 0
+        self.sumY = 0
+        self.sumRotation = 0
+
+        # 4 child nodes, or None if this node is a leaf
+        self.children = None
+
+        # (object, x, y, rotation) of each object if this node is a leaf
+        self.objects = []
+
+    def add(self, objectValues):
+        '''
+        Adds an object's values to the node's sums.
+
+        Parameters
+        ----------
+        objectValues: Tuple (object, x, y, rotation)
+            The object and its position and rotation.
+
+        Returns
+        -------
+        None
+        '''
+        self.count += 1
+        self.sumX += objectValues[1]
+        self.sumY += objectValues[2]
+        self.sumRotation += objectValues[3]
+
+class QuadTree():
+    '''
+    QuadTree
+
+    A tree of squares that stores the number of objects and the sums of their
+    positions and rotations in each square. This is used to find the midpoint and
+    average rotation of the objects within a radius without visiting every object.
+
+    Squares that are entirely inside the radius are used as one group.
+    Squares on the edge of the radius that are far away compared to their size are
+    also used as one group if their midpoint is in the radius (like the Barnes-Hut
+    algorithm), so the result is an approximation. The accuracy controls how far away
+    they need to be.
+
+    FUNCTIONS
+        __init__(self, objects, accuracyIn, leafSizeIn)
+            Builds the tree from the positions and rotations of the objects.
+
+        query(self, position, radius, excluded)
+            Returns the count and sums of the positions and rotations within a radius.
+    '''
+    def __init__(self, objects, accuracyIn, leafSizeIn = 8):
+        '''
+        Initializes a QuadTree
+
+        Parameters
+        ----------
+        objects: List<object>
+            Objects with a position [x, y] and a rotationAngle.
+
+        accuracyIn: float
+            The largest size / distance of a square on the edge of the radius that is used
+            as one group. 0 only groups squares entirely inside the radius.
+
+        leafSizeIn: int
+            The most objects in a square before it is split into 4 smaller squares.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(accuracyIn) in (int, float)): raise ValueError(f'Parameter 2 accuracyIn must be of type int or float not {type(accuracyIn)}')
+        if(not type(leafSizeIn) is int): raise ValueError(f'Parameter 3 leafSizeIn must be of type int not {type(leafSizeIn)}')
+        if(not leafSizeIn > 0): raise ValueError(f'Parameter 3 leafSizeIn must be greater than 0 not {leafSizeIn}')
+
+        self.accuracy = accuracyIn
+        self.leafSize = leafSizeIn
+
+        # The values of each object when the tree was built
+        self.objectValues = {objectIn: (objectIn, objectIn.position[0], objectIn.position[1], objectIn.rotationAngle) for objectIn in objects}
+
+        # Make a square that covers every object
+        if(len(self.objectValues) == 0):
+            self.root = QuadTreeNode(0, 0, 1)
+            return
+
+        left = min([values[1] for values in self.objectValues.values()])
+        top = min([values[2] for values in self.objectValues.values()])
+        right = max([values[1] for values in self.objectValues.values()])
+        bottom = max([values[2] for values in self.objectValues.values()])
+
+        self.root = QuadTreeNode(left, top, max(right - left, bottom - top, 1) * 1.0001)
+        self.buildNode(self.root, list(self.objectValues.values()), 0)
+
+    def buildNode(self, node, objectValues, depth):
+        '''
+        Adds objects to a node and splits it if it has too many.
+
+        Parameters
+        ----------
+        node: QuadTreeNode()
+            The node that the objects are in.
+
+        objectValues: List<Tuple> [(object, x, y, rotation), ...]
+            The objects in the node.
+
+        depth: int
+            How many times the root has been split to make this node.
+
+        Returns
+        -------
+        None
+        '''
+        for values in objectValues:
+            node.add(values)
+
+        # Stop splitting small nodes so objects in the same place do not split forever
+        if(len(objectValues) <= self.leafSize or depth >= 16):
+            node.objects = objectValues
+            return
+
+        halfSize = node.size / 2
+        centerX = node.left + halfSize
+        centerY = node.top + halfSize
+
+        node.children = [QuadTreeNode(node.left, node.top, halfSize),
+                         QuadTreeNode(centerX, node.top, halfSize),
+                         QuadTreeNode(node.left, centerY, halfSize),
+                         QuadTreeNode(centerX, centerY, halfSize)]
+
+        # Split the objects into the 4 quarters
+        quarters = [[], [], [], []]
+        for values in objectValues:
+            quarters[(values[1] >= centerX) + 2 * (values[2] >= centerY)].append(values)
+
+        for child, quarter in zip(node.children, quarters):
+            self.buildNode(child, quarter, depth + 1)
+
+    def query(self, position, radius, excluded = None):
+        '''
+        Finds the objects within a radius of a position.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            The position to search around.
+
+        radius: float
+            Only objects closer than this distance are counted.
+
+        excluded: object or None
+            An object that will not be counted.
+
+        Returns
+        -------
+        int
+            The number of objects within the radius.
+
+        float
+            The sum of their x positions.
+
+        float
+            The sum of their y positions.
+
+        float
+            The sum of their rotations.
+        '''
+        # [count, sumX, sumY, sumRotation]
+        sums = [0, 0, 0, 0]
+        self.queryNode(self.root, position, radius, sums)
+
+        # Take out the excluded object if it was counted
+        excludedValues = self.objectValues.get(excluded)
+        if(not excludedValues == None and math.sqrt((excludedValues[1] - position[0])**2 + (excludedValues[2] - position[1])**2) < radius):
+            sums[0] -= 1
+            sums[1] -= excludedValues[1]
+            sums[2] -= excludedValues[2]
+            sums[3] -= excludedValues[3]
+
+        return sums[0], sums[1], sums[2], sums[3]
+
+    def queryNode(self, node, position, radius, sums):
+        '''
+        Adds the objects in a node that are within a radius to the sums.
+
+        Parameters
+        ----------
+        node: QuadTreeNode()
+            The node that is searched.
+
+        position: List<float> [x, y]
+            The position to search around.
+
+        radius: float
+            Only objects closer than this distance are counted.
+
+        sums: List<float> [count, sumX, sumY, sumRotation]
+            The sums that the objects are added to.
+
+        Returns
+        -------
+        None
+        '''
+        if(node.count == 0): return
+
+        right = node.left + node.size
+        bottom = node.top + node.size
+
+        # If the closest point of the node is outside the radius skip it
+        closestX = max(node.left - position[0], 0, position[0] - right)
+        closestY = max(node.top - position[1], 0, position[1] - bottom)
+        if(closestX**2 + closestY**2 >= radius**2): return
+
+        # If the furthest point of the node is inside the radius use the whole node
+        furthestX = max(position[0] - node.left, right - position[0])
+        furthestY = max(position[1] - node.top, bottom - position[1])
+        if(furthestX**2 + furthestY**2 < radius**2):
+            self.addNode(node, sums)
+            return
+
+        # If the node is a leaf test each object
+        if(node.children == None):
+            for values in node.objects:
+                if((values[1] - position[0])**2 + (values[2] - position[1])**2 < radius**2):
+                    sums[0] += 1
+                    sums[1] += values[1]
+                    sums[2] += values[2]
+                    sums[3] += values[3]
+            return
+
+        # If the node is far away compared to its size use it as one group at its midpoint
+        midpointX = node.sumX / node.count
+        midpointY = node.sumY / node.count
+        distanceToMidpoint = math.sqrt((midpointX - position[0])**2 + (midpointY - position[1])**2)
+
+        if(distanceToMidpoint > 0 and node.size / distanceToMidpoint < self.accuracy):
+            if(distanceToMidpoint < radius): self.addNode(node, sums)
+            return
+
+        for child in node.children:
+            self.queryNode(child, position, radius, sums)
+
+    def addNode(self, node, sums):
+        '''
+        Adds the sums of a whole node.
+
+        Parameters
+        ----------
+        node: QuadTreeNode()
+            The node that is added.
+
+        sums: List<float> [count, sumX, sumY, sumRotation]
+            The sums that the node is added to.
+
+        Returns
+        -------
+        None
+        '''
+        sums[0] += node.count
+        sums[1] += node.sumX
+        sums[2] += node.sumY
+        sums[3] += node.sumRotation
@@ -0,0 +1,141 @@
+import numpy as np
+
+# Angle of each wall avoidance ray relative to the sheep
+AVOIDANCEANGLES = (60, 30, -30, -60)
+
+def getWallEdges(wall):
+    '''
+    Finds the rows of the edges array for a wall.
+
+    A wall compiled with the level uses the edges stored in wall.edges, any other wall
+    uses the 4 sides of its rectangle. Walls that are not solid, like open gates, are
+    stored as not a number so no ray can hit them but every wall keeps the same rows.
+    Use this to update the rows of a wall that has changed without copying every wall again.
+
+    Parameters
+    ----------
+    wall: Wall()
+        A wall that rays will be cast against.
+
+    Returns
+    -------
+    List<List<float>> [[x1, y1, x2, y2, normalX, normalY], ...]
+        The edges of the wall, from the lower to the higher x and y, and the direction they face.
+    '''
+    if(not wall.edges == None): return wall.edges
+    if(not wall.isSolid()): return [[np.nan] * 6] * 4
+
+    left = wall.rectangle[0]
+    top = wall.rectangle[1]
+    right = wall.rectangle[0] + wall.rectangle[2]
+    bottom = wall.rectangle[1] + wall.rectangle[3]
+
+    return [[left, top, right, top, 0, -1],
+            [left, bottom, right, bottom, 0, 1],
+            [left, top, left, bottom, -1, 0],
+            [right, top, right, bottom, 1, 0]]
+
+def getEdges(walls):
+    '''
+    Copies the edges of the walls into an array.
+
+    Parameters
+    ----------
+    walls: List<Wall()>
+        The walls that rays will be cast against.
+
+    Returns
+    -------
+    numpy.ndarray<float> [[x1, y1, x2, y2, normalX, normalY], ...]
+        The edges of each wall, in the same order as walls.
+    '''
+    return np.array([edge for wall in walls for edge in getWallEdges(wall)], dtype = float).reshape(-1, 6)
+
+def castRays(origins, rayDirections, edges):
+    '''
+    Finds where rays first hit a group of wall edges.
+
+    An edge is only hit from the side it faces, so rays that start inside a wall leave it
+    without hitting it, and edges that are not a number are never hit.
+    Only the edges inside the area the rays cover are tested, and each group of edges
+    that face the same way is only tested against the rays moving into it.
+
+    Parameters
+    ----------
+    origins: numpy.ndarray<float> [[x, y], ...]
+        The start of each ray
+
+    rayDirections: numpy.ndarray<float> [[x, y], ...]
+        The vector from the start to the end of each ray
+
+    edges: numpy.ndarray<float> [[x1, y1, x2, y2, normalX, normalY], ...]
+        The edges that are tested, from getEdges
+
+    Return
+    -------
+    numpy.ndarray<float>
+        The fraction of each ray (0 to 1) where it hits the nearest edge
+        or infinity if it does not hit any edge
+    '''
+    closestHits = np.full(len(origins), np.inf)
+    if(len(edges) == 0 or len(origins) == 0): return closestHits
+
+    # Edges outside the area covered by every ray can not be hit
+    ends = origins + rayDirections
+    lowest = np.minimum(origins, ends).min(axis = 0)
+    highest = np.maximum(origins, ends).max(axis = 0)
+    edges = edges[(edges[:, 2] >= lowest[0]) & (edges[:, 0] <= highest[0]) & (edges[:, 3] >= lowest[1]) & (edges[:, 1] <= highest[1])]
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        # Vertical edges cross the x axis and horizontal edges cross the y axis
+        for axis, alongAxis in ((0, 1), (1, 0)):
+            for facing in (-1, 1):
+                group = edges[edges[:, 4 + axis] == facing]
+                rays = np.flatnonzero(rayDirections[:, axis] * facing < 0)
+                if(len(group) == 0 or len(rays) == 0): continue
+
+                # Where each ray crosses the line of each edge, rays down the rows and edges across the columns
+                t = (group[:, axis] - origins[rays, axis:axis + 1]) / rayDirections[rays, axis:axis + 1]
+                along = origins[rays, alongAxis:alongAxis + 1] + rayDirections[rays, alongAxis:alongAxis + 1] * t
+
+                hits = np.where((t >= 0) & (t <= 1) & (group[:, alongAxis] <= along) & (along <= group[:, 2 + alongAxis]), t, np.inf)
+                closestHits[rays] = np.minimum(closestHits[rays], hits.min(axis = 1))
+
+    return closestHits
+
+def castAvoidanceRays(herd, edges):
+    '''
+    Casts the wall avoidance rays of every sheep at once.
+
+    Stores the distance to the nearest wall along each ray in
+    sheep.avoidanceRayDistances, in the same order as AVOIDANCEANGLES.
+    A distance is None if the ray does not hit a wall.
+
+    Parameters
+    ----------
+    herd: List<Sheep()>
+        Sheep objects that are in the level
+
+    edges: numpy.ndarray<float> [[x1, y1, x2, y2, normalX, normalY], ...]
+        The edges of the walls, from getEdges
+
+    Returns
+    -------
+    None
+    '''
+    sheepCount = len(herd)
+    if(sheepCount == 0): return
+
+    positions = np.array([sheep.position for sheep in herd], dtype = float)
+    rotationAngles = np.array([sheep.rotationAngle for sheep in herd], dtype = float)
+    avoidanceRanges = np.array([sheep.avoidanceRange for sheep in herd], dtype = float)
+
+    # Every ray of every sheep as one (4n x 2) array, one angle after another
+    radians = np.radians(np.array(AVOIDANCEANGLES)[:, np.newaxis] - rotationAngles).reshape(-1)
+    rayRanges = np.tile(avoidanceRanges, len(AVOIDANCEANGLES))
+    rayDirections = np.stack([np.cos(radians), np.sin(radians)], axis = 1) * rayRanges[:, np.newaxis]
+
+    distances = (castRays(np.tile(positions, (len(AVOIDANCEANGLES), 1)), rayDirections, edges) * rayRanges).reshape(len(AVOIDANCEANGLES), sheepCount)
+
+    for sheepNumber, sheep in enumerate(herd):
+        sheep.avoidanceRayDistances = [float(rayDistance) if np.isfinite(rayDistance) else None for rayDistance in distances[:, sheepNumber]]
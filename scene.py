@@ -12,7 +12,7 @@ class Scene():
     __init__(surfaceSizeIn, backgroundColorIn)
         Initialize the surface where the objects will be drawn
         
-    render(cameraRect, outputSize)
+    render(renderedObjects, cameraRect, outputSize, interpolation)
         Gets a section of the surface, resizes it, then returns it.
         
     boundCameraPosition(cameraPosition, cameraSize)
@@ -49,7 +49,7 @@ class Scene():
         self.surfaceSize = surfaceSizeIn
         self.sceneSurface = pygame.Surface((self.surfaceSize[0], self.surfaceSize[1]))
         
-    def render(self, renderedObjects, cameraRect, outputSize):
+    def render(self, renderedObjects, cameraRect, outputSize, interpolation = None):
         '''
         Renders and returns a scetion of the scene
         
@@ -68,6 +68,10 @@ class Scene():
             If the aspect ratio of the cameraRect's width and height are not the same,
             then the image will be warped
             
+        interpolation: float or None
+            How far between the previous and current simulation step to draw
+            moving objects, from 0 to 1. If None they are drawn at their current position.
+            
         Returns
         -------
         pygame.Surface()
@@ -78,7 +82,11 @@ class Scene():
         # Draw each renderedObject onto the scene
         for renderedObject in renderedObjects:
             try:
-                renderedObject.draw(self.sceneSurface)
+                # Objects that store their previous state are drawn between simulation steps
+                if(not interpolation == None and hasattr(renderedObject, 'previousPosition')):
+                    renderedObject.draw(self.sceneSurface, interpolation)
+                else:
+                    renderedObject.draw(self.sceneSurface)
             except Exception as e:
                 print(f'{renderedObject} could not be drawn: {e}')
         
@@ -0,0 +1,214 @@
+import math
+from spatial_hash import SpatialHash
+
+# The cells each cell is tested against so that each pair of cells is only tested once
+FORWARDCELLS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+class SeparationSolver():
+    '''
+    SeparationSolver
+
+    Pushes sheep apart so they do not overlap each other or the sheepdogs.
+
+    The bodies are bucketed in a grid with cells as large as the largest body, so each
+    body is only tested against the bodies in its own and neighbouring cells.
+    Sheepdogs push sheep but are not moved themselves.
+    After the last pass the sheep that were pushed into a wall are moved back along that axis.
+
+    FUNCTIONS
+        __init__(self, iterationsIn)
+            Creates a solver that runs a number of passes each step.
+
+        separatePair(self, first, second, firstFixed, secondFixed)
+            Pushes two bodies apart if they overlap.
+
+        pushOutOfWalls(self, walls, wallGrid, wallField)
+            Undoes the part of each push that moved a body into a wall.
+
+        solve(self, herd, sheepdogs, walls, wallGrid, wallField)
+            Pushes every overlapping sheep apart.
+    '''
+    def __init__(self, iterationsIn):
+        '''
+        Initializes a SeparationSolver
+
+        Parameters
+        ----------
+        iterationsIn: int
+            The number of passes made each step.
+            Pushing two bodies apart can push them into others, so more passes
+            leave fewer overlaps in crowded herds.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(iterationsIn) is int): raise ValueError(f'Parameter 1 iterationsIn must be of type int not {type(iterationsIn)}')
+        if(not iterationsIn > 0): raise ValueError(f'Parameter 1 iterationsIn must be greater than 0 not {iterationsIn}')
+
+        self.iterations = iterationsIn
+
+        # The grid is kept between steps so its dictionaries are not created again
+        self.grid = None
+
+        # The position of each body pushed during the current solve from before it was first pushed
+        self.startPositions = {}
+
+        # Reused by pushOutOfWalls so no new lists are made for each wall that is tested
+        self.collisionResult = [False, False, False, [0, 0]]
+
+    def separatePair(self, first, second, firstFixed, secondFixed):
+        '''
+        Pushes two bodies apart if they overlap.
+
+        Each body is a circle the size of its sprite. If both can move they are each pushed
+        half of the overlap, otherwise the one that can move is pushed the whole overlap.
+
+        Parameters
+        ----------
+        first, second: Moveable()
+            The bodies that are tested.
+
+        firstFixed, secondFixed: bool
+            True if the body can not be moved.
+
+        Returns
+        -------
+        None
+        '''
+        if(firstFixed and secondFixed): return
+
+        differenceX = second.position[0] - first.position[0]
+        differenceY = second.position[1] - first.position[1]
+        minimumDistance = (first.size + second.size) / 2
+
+        distanceSquared = differenceX * differenceX + differenceY * differenceY
+        if(distanceSquared >= minimumDistance * minimumDistance): return
+
+        # Bodies in the same place are pushed apart along the x axis
+        if(distanceSquared == 0):
+            differenceX, differenceY, distance = 1, 0, 1
+        else:
+            distance = math.sqrt(distanceSquared)
+
+        # How far each body is pushed along the line between them
+        push = (minimumDistance - distance) / distance
+        if(not firstFixed and not secondFixed): push /= 2
+
+        # Sleeping sheep that are pushed are woken up so they collide with the walls on their next update
+        if(not firstFixed):
+            if(not first in self.startPositions): self.startPositions[first] = (first.position[0], first.position[1])
+            first.position[0] -= differenceX * push
+            first.position[1] -= differenceY * push
+            if(first.isSleeping): first.wake()
+
+        if(not secondFixed):
+            if(not second in self.startPositions): self.startPositions[second] = (second.position[0], second.position[1])
+            second.position[0] += differenceX * push
+            second.position[1] += differenceY * push
+            if(second.isSleeping): second.wake()
+
+    def pushOutOfWalls(self, walls, wallGrid = None, wallField = None):
+        '''
+        Undoes the part of each push that moved a body into a wall.
+
+        The bodies were already moved out of the walls when they were updated, so a body
+        that now collides with a wall is put back where it started on the axis of the collision.
+        The heading is not changed since it was already reflected when the body was updated.
+
+        Parameters
+        ----------
+        walls: List<Wall()>
+            Walls that the bodies might have been pushed into.
+
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only nearby walls are tested.
+
+        wallField: DistanceField() or None
+            The distance to the nearest wall. If given, bodies far from the walls are not tested.
+
+        Returns
+        -------
+        None
+        '''
+        for body, (startX, startY) in self.startPositions.items():
+            # The body can not be touching a wall if the nearest wall is further than its size
+            if(not wallField == None and wallField.sample(body.position)[0] > body.size * 2 + wallField.cellSize): continue
+
+            nearbyWalls = wallGrid.getNearby(body.position, body.size * 2) if not wallGrid == None else walls
+
+            for wall in nearbyWalls:
+                result = wall.isCircleColliding(body.position, body.size, self.collisionResult)
+                if(not result[0]): continue
+
+                # A centre inside the wall has no axis, so the whole push is undone
+                if(result[1] or not result[2]): body.position[0] = startX
+                if(result[2] or not result[1]): body.position[1] = startY
+
+    def solve(self, herd, sheepdogs, walls, wallGrid = None, wallField = None):
+        '''
+        Pushes every overlapping sheep apart.
+
+        A sheep can be pushed into a wall, so the pushes are undone on the axis
+        of any wall the sheep are touching after the last pass.
+
+        Parameters
+        ----------
+        herd: List<Sheep()>
+            Sheep objects that are in the level.
+
+        sheepdogs: List<Sheepdog()>
+            Sheepdog objects that are in the level. They push sheep but do not move.
+
+        walls: List<Wall()>
+            Walls that the sheep might be pushed into.
+
+        wallGrid: WallGrid() or None
+            A grid containing the walls. If given, only nearby walls are tested.
+
+        wallField: DistanceField() or None
+            The distance to the nearest wall. If given, sheep far from the walls are not tested.
+
+        Returns
+        -------
+        None
+        '''
+        bodies = sheepdogs + list(herd)
+        if(len(bodies) < 2): return
+
+        # Overlapping bodies are always in the same or neighbouring cells
+        cellSize = max([body.size for body in bodies])
+        if(self.grid == None or not self.grid.cellSize == cellSize): self.grid = SpatialHash(cellSize)
+
+        dogCount = len(sheepdogs)
+
+        for iteration in range(self.iterations):
+            self.grid.build(bodies)
+
+            for (column, row), cell in self.grid.cells.items():
+                # Bodies in the same cell
+                for firstNumber in range(len(cell)):
+                    first = cell[firstNumber]
+                    firstFixed = self.grid.objectOrder[first] < dogCount
+                    for secondNumber in range(firstNumber + 1, len(cell)):
+                        second = cell[secondNumber]
+                        self.separatePair(first, second, firstFixed, self.grid.objectOrder[second] < dogCount)
+
+                # Bodies in the neighbouring cells
+                for offsetX, offsetY in FORWARDCELLS:
+                    otherCell = self.grid.cells.get((column + offsetX, row + offsetY))
+                    if(otherCell == None): continue
+
+                    for first in cell:
+                        firstFixed = self.grid.objectOrder[first] < dogCount
+                        for second in otherCell:
+                            self.separatePair(first, second, firstFixed, self.grid.objectOrder[second] < dogCount)
+
+        self.pushOutOfWalls(walls, wallGrid, wallField)
+        self.startPositions.clear()
@@ -0,0 +1,273 @@
+import math
+import heapq
+
+class SpatialHash():
+    '''
+    SpatialHash
+
+    A uniform grid that buckets objects by their position so that
+    nearby objects can be found without testing every object.
+
+    FUNCTIONS
+        __init__(self, cellSizeIn)
+            Creates an empty grid with square cells of the given size.
+
+        getCell(self, position)
+            Returns the cell that a position is in.
+
+        build(self, objects)
+            Clears the grid and inserts every object.
+
+        insert(self, objectIn)
+            Adds an object to the cell at its position.
+
+        remove(self, objectIn)
+            Removes an object from the grid.
+
+        update(self, objectIn)
+            Moves an object to a new cell if its position has changed cells.
+
+        getNearby(self, position, radius)
+            Returns the objects in the block of cells that covers a radius around a position.
+            
+        getNearest(self, position, count, radius, excluded)
+            Returns the nearest objects to a position.
+    '''
+    def __init__(self, cellSizeIn):
+        '''
+        Initializes a SpatialHash
+
+        Initializes an empty grid with square cells.
+
+        Parameters
+        ----------
+        cellSizeIn: int or float
+            The width and height of each cell.
+            Any object within this distance of a point will be in
+            the 3x3 block of cells around that point.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(cellSizeIn) in (int, float)): raise ValueError(f'Parameter 1 cellSizeIn must be of type int or float not {type(cellSizeIn)}')
+        if(not cellSizeIn > 0): raise ValueError(f'Parameter 1 cellSizeIn must be greater than 0 not {cellSizeIn}')
+
+        self.cellSize = cellSizeIn
+
+        # cell -> objects in that cell
+        self.cells = {}
+
+        # object -> the cell it is stored in
+        self.objectCells = {}
+
+        # object -> the order it was inserted in
+        # used to return nearby objects in the same order as the original list
+        self.objectOrder = {}
+        self.insertCount = 0
+
+    def getCell(self, position):
+        '''
+        Finds the cell that a position is in.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            A position in the scene.
+
+        Returns
+        -------
+        Tuple<int> (column, row)
+            The cell that contains the position.
+        '''
+        return (math.floor(position[0] / self.cellSize), math.floor(position[1] / self.cellSize))
+
+    def build(self, objects):
+        '''
+        Rebuilds the grid.
+
+        Clears the grid then inserts each object in order.
+
+        Parameters
+        ----------
+        objects: List<object>
+            Objects with a position attribute [x, y].
+
+        Returns
+        -------
+        None
+        '''
+        self.cells.clear()
+        self.objectCells.clear()
+        self.objectOrder.clear()
+        self.insertCount = 0
+
+        for objectIn in objects:
+            self.insert(objectIn)
+
+    def insert(self, objectIn):
+        '''
+        Adds an object to the grid.
+
+        Parameters
+        ----------
+        objectIn: object
+            An object with a position attribute [x, y].
+
+        Returns
+        -------
+        None
+        '''
+        cell = self.getCell(objectIn.position)
+
+        self.cells.setdefault(cell, []).append(objectIn)
+        self.objectCells[objectIn] = cell
+        self.objectOrder[objectIn] = self.insertCount
+        self.insertCount += 1
+
+    def remove(self, objectIn):
+        '''
+        Removes an object from the grid.
+
+        Does nothing if the object is not in the grid.
+
+        Parameters
+        ----------
+        objectIn: object
+            An object that was inserted into the grid.
+
+        Returns
+        -------
+        None
+        '''
+        cell = self.objectCells.pop(objectIn, None)
+        if(cell == None): return
+
+        self.objectOrder.pop(objectIn)
+
+        self.cells[cell].remove(objectIn)
+        if(len(self.cells[cell]) == 0): del self.cells[cell]
+
+    def update(self, objectIn):
+        '''
+        Updates the cell of an object.
+
+        Call this after an object moves so that later queries see its new position.
+        Objects that have not changed cells are not touched.
+
+        Parameters
+        ----------
+        objectIn: object
+            An object that was inserted into the grid.
+
+        Returns
+        -------
+        None
+        '''
+        oldCell = self.objectCells.get(objectIn)
+        if(oldCell == None): return
+
+        newCell = self.getCell(objectIn.position)
+        if(newCell == oldCell): return
+
+        # Move the object to its new cell
+        self.cells[oldCell].remove(objectIn)
+        if(len(self.cells[oldCell]) == 0): del self.cells[oldCell]
+
+        self.cells.setdefault(newCell, []).append(objectIn)
+        self.objectCells[objectIn] = newCell
+
+    def getNearby(self, position, radius = None):
+        '''
+        Finds the objects near a position.
+
+        Returns every object in the block of cells that covers the radius around the position.
+        This includes every object within the radius of the position.
+        The objects are returned in the order they were inserted.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            The position to search around.
+            
+        radius: float or None
+            The distance to search. If None the 3x3 block of cells is searched.
+
+        Returns
+        -------
+        List<object>
+            The objects that are near the position.
+        '''
+        column, row = self.getCell(position)
+        rings = 1 if radius == None else math.ceil(radius / self.cellSize)
+
+        nearbyObjects = []
+        for x in range(column - rings, column + rings + 1):
+            for y in range(row - rings, row + rings + 1):
+                cell = self.cells.get((x, y))
+                if(not cell == None): nearbyObjects.extend(cell)
+
+        # Keep the same order as the original list so results do not depend on the grid
+        nearbyObjects.sort(key = self.objectOrder.__getitem__)
+
+        return nearbyObjects
+    
+    def getNearest(self, position, count, radius, excluded = None):
+        '''
+        Finds the nearest objects to a position.
+        
+        Searches rings of cells outward from the position and stops once the
+        nearest objects are known to be found, so crowded areas only search a few cells.
+        
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            The position to search around.
+            
+        count: int
+            The most objects to return.
+            
+        radius: float
+            Only objects closer than this distance are returned.
+            
+        excluded: object or None
+            An object that will not be returned.
+            
+        Returns
+        -------
+        List<object>
+            Up to count objects within the radius, nearest first.
+            Empty if count is 0.
+        '''
+        if(count <= 0): return []
+        
+        column, row = self.getCell(position)
+        maxRing = math.ceil(radius / self.cellSize)
+        
+        # (distance, insert order, object) for each object found so far
+        candidates = []
+        
+        for ring in range(maxRing + 1):
+            # Test the cells on the edge of this ring
+            for x in range(column - ring, column + ring + 1):
+                for y in range(row - ring, row + ring + 1):
+                    if(not (abs(x - column) == ring or abs(y - row) == ring)): continue
+                    
+                    for objectIn in self.cells.get((x, y), ()):
+                        if(objectIn is excluded): continue
+                        
+                        distanceToObject = math.sqrt((objectIn.position[0] - position[0])**2 + (objectIn.position[1] - position[1])**2)
+                        if(distanceToObject < radius):
+                            candidates.append((distanceToObject, self.objectOrder[objectIn], objectIn))
+            
+            # Every object in the next ring is at least ring * cellSize away
+            if(len(candidates) >= count and heapq.nsmallest(count, candidates)[-1][0] <= ring * self.cellSize):
+                break
+        
+        return [candidate[2] for candidate in heapq.nsmallest(count, candidates)]
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Run pygame without a window or sound so the tests work without a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# The game modules are imported from the folder above the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,72 @@
+import math
+import random
+import numpy as np
+import pygame
+import pytest
+from wall import Wall
+from gate import Gate
+from wall_grid import WallGrid
+from distance_field import DistanceField
+
+def findDistance(walls, position):
+    '''Finds the distance from a position to the nearest wall, negative inside a wall.'''
+    nearest = math.inf
+    for wall in walls:
+        if(not wall.isSolid()): continue
+
+        left, top, width, height = wall.rectangle
+        outsideX = max(left - position[0], position[0] - left - width)
+        outsideY = max(top - position[1], position[1] - top - height)
+        wallDistance = math.hypot(max(outsideX, 0), max(outsideY, 0)) + min(max(outsideX, outsideY), 0)
+        nearest = min(nearest, wallDistance)
+
+    return nearest
+
+def makeWalls(generator, count):
+    return [Wall([generator.uniform(0, 350), generator.uniform(0, 350), generator.uniform(5, 80), generator.uniform(5, 80)], pygame.Color(0, 0, 0)) for wall in range(count)]
+
+def testGridPointsMatchBruteForce():
+    '''The distance stored at each point of the grid is the distance to the nearest wall.'''
+    walls = makeWalls(random.Random(9), 12)
+    field = DistanceField(walls, [400, 400], 10)
+
+    for row in range(field.rows):
+        for column in range(field.columns):
+            assert field.distances[row][column] == pytest.approx(findDistance(walls, [column * 10, row * 10]))
+
+def testSampleIsCloseToBruteForce():
+    '''Blending the grid points is never further off than the size of a cell.'''
+    generator = random.Random(10)
+    walls = makeWalls(generator, 12)
+    field = DistanceField(walls, [400, 400], 10)
+
+    for sample in range(2000):
+        position = [generator.uniform(0, 400), generator.uniform(0, 400)]
+        assert abs(field.sample(position)[0] - findDistance(walls, position)) <= 10
+
+def testUpdateMatchesNewField():
+    '''Opening, closing and moving a gate gives the same distances near it as building the field again.'''
+    generator = random.Random(11)
+    walls = makeWalls(generator, 8)
+    gate = Gate([200, 100, 20, 150], pygame.Color(0, 0, 0))
+    walls.append(gate)
+
+    margin = 60
+    wallGrid = WallGrid(walls, 50)
+    field = DistanceField(walls, [400, 400], 10)
+
+    for change in range(6):
+        if(change % 3 == 2):
+            changedArea = gate.moveTo([generator.uniform(50, 300), generator.uniform(50, 300), 20, 150])
+        else:
+            changedArea = gate.setOpen(not gate.isOpen)
+
+        wallGrid.update(gate)
+        field.update(wallGrid, changedArea, margin)
+
+        fresh = np.array(DistanceField(walls, [400, 400], 10).distances)
+        updated = np.array(field.distances)
+
+        # Distances past the margin are not found again by the update
+        isNear = fresh < margin
+        assert np.allclose(updated[isNear], fresh[isNear])
@@ -0,0 +1,143 @@
+import math
+import random
+import numpy as np
+import pygame
+from goal import Goal
+from wall import Wall
+from gate import Gate
+from wall_grid import WallGrid
+from flow_field import NEIGHBOURS, findBlockedCells, findCosts, findDirections, FlowField, FlowFields
+
+def makeBlocked(generator, columns, rows, chance):
+    return [[generator.random() < chance for column in range(columns)] for row in range(rows)]
+
+def findCostsByRelaxing(blocked, targetCells):
+    '''Lowers the cost of every cell from the cells around it until nothing changes.'''
+    rows = len(blocked)
+    columns = len(blocked[0])
+    costs = [[math.inf] * columns for row in range(rows)]
+    for column, row in targetCells:
+        costs[row][column] = 0
+
+    isChanged = True
+    while(isChanged):
+        isChanged = False
+        for row in range(rows):
+            for column in range(columns):
+                if(blocked[row][column]): continue
+
+                for offsetX, offsetY, moveCost in NEIGHBOURS:
+                    previousColumn = column - offsetX
+                    previousRow = row - offsetY
+                    if(not (0 <= previousColumn < columns and 0 <= previousRow < rows)): continue
+                    if(not offsetX == 0 and not offsetY == 0 and (blocked[previousRow][column] or blocked[row][previousColumn])): continue
+
+                    if(costs[previousRow][previousColumn] + moveCost < costs[row][column] - 0.000001):
+                        costs[row][column] = costs[previousRow][previousColumn] + moveCost
+                        isChanged = True
+
+    return costs
+
+def findDirectionsOneCellAtATime(costs, blocked):
+    '''Points each cell at the first cell around it with the lowest cost.'''
+    rows = len(costs)
+    columns = len(costs[0])
+    directionsX = np.zeros((rows, columns))
+    directionsY = np.zeros((rows, columns))
+
+    for row in range(rows):
+        for column in range(columns):
+            lowestCost = costs[row][column]
+            for offsetX, offsetY, moveCost in NEIGHBOURS:
+                nextColumn = column + offsetX
+                nextRow = row + offsetY
+                if(not (0 <= nextColumn < columns and 0 <= nextRow < rows)): continue
+                if(not offsetX == 0 and not offsetY == 0 and (blocked[row][nextColumn] or blocked[nextRow][column])): continue
+
+                if(costs[nextRow][nextColumn] < lowestCost):
+                    lowestCost = costs[nextRow][nextColumn]
+                    directionsX[row, column] = offsetX / moveCost
+                    directionsY[row, column] = offsetY / moveCost
+
+    return directionsX, directionsY
+
+def testFindCostsMatchesRelaxing():
+    '''Dijkstra's algorithm finds the same path lengths as relaxing every cell until nothing changes.'''
+    for seed in range(10):
+        generator = random.Random(seed)
+        blocked = makeBlocked(generator, 25, 20, 0.3)
+        targetCells = [(generator.randrange(25), generator.randrange(20)) for target in range(generator.randint(1, 3))]
+        for column, row in targetCells:
+            blocked[row][column] = False
+
+        assert np.allclose(findCosts(blocked, targetCells), findCostsByRelaxing(blocked, targetCells))
+
+def testFindDirectionsMatchesOneCellAtATime():
+    '''Comparing the whole grid at once points each cell the same way as comparing one cell at a time.'''
+    for seed in range(10):
+        generator = random.Random(seed)
+        blocked = makeBlocked(generator, 30, 25, 0.25)
+        blocked[0][0] = False
+        costs = findCosts(blocked, [(0, 0)])
+
+        directionsX, directionsY = findDirections(costs, blocked)
+        expectedX, expectedY = findDirectionsOneCellAtATime(costs, blocked)
+
+        assert np.array_equal(directionsX, expectedX)
+        assert np.array_equal(directionsY, expectedY)
+
+def testUpdateMatchesNewField():
+    '''Blocking and unblocking cells gives the same field as finding every path again.'''
+    generator = random.Random(16)
+    columns, rows = 30, 25
+    blocked = makeBlocked(generator, columns, rows, 0.2)
+    targetCells = [(2, 2), (3, 2)]
+    for column, row in targetCells:
+        blocked[row][column] = False
+
+    flowField = FlowField(findCosts(blocked, targetCells), blocked, targetCells, 10)
+
+    for change in range(30):
+        # Block or unblock a small area of cells away from the target
+        left = generator.randrange(5, columns - 3)
+        top = generator.randrange(5, rows - 3)
+        isBlocked = generator.random() < 0.5
+
+        changedCells = []
+        for row in range(top, top + 3):
+            for column in range(left, left + 3):
+                if(blocked[row][column] == isBlocked): continue
+                blocked[row][column] = isBlocked
+                changedCells.append((column, row))
+
+        flowField.update(blocked, changedCells)
+
+        expected = FlowField(findCosts(blocked, targetCells), blocked, targetCells, 10)
+        assert np.allclose(flowField.costs, expected.costs)
+        assert flowField.directionsX == expected.directionsX
+        assert flowField.directionsY == expected.directionsY
+
+def testGateChangesMatchNewFields():
+    '''Each arrangement of the gates gives the same fields as loading the level with the gates that way.'''
+    walls = [Wall([0, 100, 140, 20], pygame.Color(0, 0, 0)), Wall([180, 100, 120, 20], pygame.Color(0, 0, 0))]
+    gate = Gate([140, 100, 40, 20], pygame.Color(0, 0, 0))
+    walls.append(gate)
+    goal = Goal([10, 10, 20, 20])
+
+    wallGrid = WallGrid(walls, 50)
+    flowFields = FlowFields(walls, wallGrid, [300, 300], 10, 5, [goal])
+
+    for change in range(4):
+        changedArea = gate.setOpen(not gate.isOpen)
+        wallGrid.update(gate)
+        flowFields.update(wallGrid, changedArea)
+
+        expected = FlowFields(walls, WallGrid(walls, 50), [300, 300], 10, 5, [Goal([10, 10, 20, 20])])
+        assert flowFields.blocked == expected.blocked
+        assert np.allclose(flowFields.flowFields[0].costs, expected.flowFields[0].costs)
+        assert flowFields.flowFields[0].directionsX == expected.flowFields[0].directionsX
+
+        # The cells below the gate only have a path when it is open
+        assert (goal.flowField.getDirection([160, 200]) == None) == (not gate.isOpen)
+
+    assert flowFields.blocked == findBlockedCells(walls, 30, 30, 10, 5)
@@ -0,0 +1,59 @@
+import random
+from goal import Goal
+from goal_capture import GoalGrid, captureSheep
+
+class Body():
+    '''
+    An object with only a position, used as a sheep.
+    '''
+    def __init__(self, position):
+        self.position = position
+
+def findGoal(goals, position):
+    '''Finds the first goal that contains a position by testing every goal.'''
+    for goal in goals:
+        if(goal.isSheepInGoal(position)): return goal
+
+    return None
+
+def makeGoals(generator, count):
+    return [Goal([generator.uniform(0, 400), generator.uniform(0, 400), generator.uniform(5, 150), generator.uniform(5, 150)]) for goal in range(count)]
+
+def testGetGoalMatchesBruteForce():
+    '''The grid finds the same goal as testing every goal in order.'''
+    generator = random.Random(12)
+
+    for cellSize in (7, 50, 300):
+        goals = makeGoals(generator, 6)
+        goalGrid = GoalGrid(goals, cellSize)
+
+        for sample in range(3000):
+            position = [generator.uniform(-20, 580), generator.uniform(-20, 580)]
+            assert goalGrid.getGoal(position) is findGoal(goals, position)
+
+def testCaptureSheepRemovesSheepInGoals():
+    '''Every sheep in a goal is removed and counted once, and every other sheep is kept.'''
+    generator = random.Random(13)
+    goals = makeGoals(generator, 4)
+    herd = [Body([generator.uniform(0, 500), generator.uniform(0, 500)]) for sheep in range(300)]
+
+    expectedCaptured = [sheep for sheep in herd if not findGoal(goals, sheep.position) == None]
+    expectedCounts = {}
+    for sheep in expectedCaptured:
+        goal = findGoal(goals, sheep.position)
+        expectedCounts[goal] = expectedCounts.get(goal, 0) + 1
+    expectedLeft = [sheep for sheep in herd if findGoal(goals, sheep.position) == None]
+
+    capturedSheep, events = captureSheep(herd, GoalGrid(goals, 50), 12.5)
+
+    assert set(capturedSheep) == set(expectedCaptured) and len(capturedSheep) == len(expectedCaptured)
+    assert set(herd) == set(expectedLeft) and len(herd) == len(expectedLeft)
+    assert {goal: sheepCount for captureTime, goal, sheepCount in events} == expectedCounts
+    assert all([captureTime == 12.5 for captureTime, goal, sheepCount in events])
+
+def testNoSheepCaptured():
+    '''Nothing happens when no sheep is in a goal.'''
+    herd = [Body([1000, 1000])]
+
+    assert captureSheep(herd, GoalGrid([Goal([0, 0, 10, 10])], 50), 0) == ([], [])
+    assert len(herd) == 1
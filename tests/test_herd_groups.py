@@ -0,0 +1,54 @@
+import math
+import random
+from herd_groups import HerdGroups
+
+class Body():
+    '''
+    An object with only a position, used as a sheep.
+    '''
+    def __init__(self, position):
+        self.position = position
+
+def findGroupRoots(herd, radius):
+    '''Joins every pair of sheep within the radius and returns the root of the group of each sheep.'''
+    parents = list(range(len(herd)))
+
+    def findRoot(index):
+        while(not parents[index] == index): index = parents[index]
+        return index
+
+    for first in range(len(herd)):
+        for second in range(first + 1, len(herd)):
+            if(math.dist(herd[first].position, herd[second].position) < radius): parents[findRoot(first)] = findRoot(second)
+
+    return [findRoot(index) for index in range(len(herd))]
+
+def testGroupsMatchBruteForce():
+    '''Two sheep share a group exactly when a chain of sheep within the radius joins them.'''
+    generator = random.Random(15)
+
+    for case in range(100):
+        radius = generator.choice([30, 80, 200])
+        herd = [Body([generator.uniform(0, 800), generator.uniform(0, 600)]) for sheep in range(generator.randint(0, 120))]
+
+        herdGroups = HerdGroups(radius)
+        herdGroups.update(herd)
+        roots = findGroupRoots(herd, radius)
+
+        # The same sheep are grouped together
+        for first in range(len(herd)):
+            for second in range(len(herd)):
+                assert (herdGroups.groupNumbers[first] == herdGroups.groupNumbers[second]) == (roots[first] == roots[second])
+
+        # The groups are counted and ordered from largest to smallest
+        sizes = sorted([roots.count(root) for root in set(roots)], reverse = True)
+        assert [sheepCount for sheepCount, center in herdGroups.groups] == sizes
+
+def testGroupCenters():
+    '''The center of a group is the average position of its sheep.'''
+    herd = [Body([0, 0]), Body([10, 0]), Body([500, 500])]
+    herdGroups = HerdGroups(20)
+    herdGroups.update(herd)
+
+    assert herdGroups.groups == [(2, [5, 0]), (1, [500, 500])]
+    assert herdGroups.groupNumbers == [0, 0, 1]
@@ -0,0 +1,63 @@
+import math
+import random
+from spatial_hash import SpatialHash
+from neighbour_list import NeighbourList
+
+class Body():
+    '''
+    An object with only a position, used to fill the lists.
+    '''
+    def __init__(self, position):
+        self.position = position
+
+def testListsHaveEveryObjectInRadius():
+    '''After any number of moves every object within the radius is in the neighbour list.'''
+    generator = random.Random(4)
+    radius = 40
+    bodies = [Body([generator.uniform(0, 300), generator.uniform(0, 300)]) for body in range(120)]
+
+    grid = SpatialHash(radius + 10)
+    grid.build(bodies)
+    neighbourList = NeighbourList(radius, 10)
+    neighbourList.build(bodies, grid)
+
+    for step in range(40):
+        for body in bodies:
+            body.position[0] += generator.uniform(-3, 3)
+            body.position[1] += generator.uniform(-3, 3)
+            grid.update(body)
+            neighbourList.update(body, bodies, grid)
+
+        for body in bodies:
+            expected = [other for other in bodies if not other is body and math.dist(other.position, body.position) < radius]
+            assert set(expected) <= set(neighbourList.getNeighbours(body))
+
+    # Small moves should not rebuild the lists every step
+    assert neighbourList.buildCount < 40
+
+def testBuildWithGridMatchesBuildWithoutGrid():
+    '''The grid only speeds up the build and does not change the lists.'''
+    generator = random.Random(5)
+    bodies = [Body([generator.uniform(0, 500), generator.uniform(0, 500)]) for body in range(200)]
+
+    grid = SpatialHash(30)
+    grid.build(bodies)
+    withGrid = NeighbourList(50, 8)
+    withGrid.build(bodies, grid)
+    withoutGrid = NeighbourList(50, 8)
+    withoutGrid.build(bodies)
+
+    for body in bodies:
+        assert withGrid.getNeighbours(body) == withoutGrid.getNeighbours(body)
+
+def testRemovedObjectIsNotANeighbour():
+    '''Removing an object takes it out of the list of every other object.'''
+    bodies = [Body([0, 0]), Body([5, 0]), Body([0, 5])]
+    neighbourList = NeighbourList(20, 5)
+    neighbourList.build(bodies)
+
+    neighbourList.remove(bodies[0])
+
+    assert neighbourList.getNeighbours(bodies[0]) == []
+    assert not bodies[0] in neighbourList.getNeighbours(bodies[1])
+    assert not bodies[0] in neighbourList.getNeighbours(bodies[2])
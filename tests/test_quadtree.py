@@ -0,0 +1,61 @@
+import math
+import random
+import pytest
+from quadtree import QuadTree
+
+class Body():
+    '''
+    An object with a position and rotation, used to fill the tree.
+    '''
+    def __init__(self, position, rotationAngle):
+        self.position = position
+        self.rotationAngle = rotationAngle
+
+def findSums(bodies, position, radius, excluded = None):
+    '''Adds up the bodies within the radius one at a time.'''
+    inRange = [body for body in bodies if not body is excluded and math.dist(body.position, position) < radius]
+    return (len(inRange), sum([body.position[0] for body in inRange]), sum([body.position[1] for body in inRange]), sum([body.rotationAngle for body in inRange]))
+
+def makeBodies(generator, count):
+    return [Body([generator.gauss(200, 80), generator.gauss(200, 80)], generator.uniform(0, 360)) for body in range(count)]
+
+def testExactWithNoAccuracy():
+    '''An accuracy of 0 only groups squares inside the radius so the sums are exact.'''
+    generator = random.Random(6)
+
+    for leafSize in (1, 4, 8):
+        bodies = makeBodies(generator, 300)
+        tree = QuadTree(bodies, 0, leafSize)
+
+        for query in range(100):
+            excluded = generator.choice(bodies)
+            radius = generator.choice([20, 80, 250])
+
+            count, sumX, sumY, sumRotation = tree.query(excluded.position, radius, excluded)
+            expected = findSums(bodies, excluded.position, radius, excluded)
+
+            assert count == expected[0]
+            assert (sumX, sumY, sumRotation) == pytest.approx(expected[1:])
+
+def testFarGroupsAreNearTheRadius():
+    '''With an accuracy above 0 only bodies near the edge of the radius can be counted wrongly.'''
+    generator = random.Random(7)
+    bodies = makeBodies(generator, 400)
+    accuracy = 0.25
+    tree = QuadTree(bodies, accuracy)
+
+    # A square used as one group is less than accuracy * distance wide, so its bodies
+    # are within its diagonal of its midpoint
+    spread = accuracy * math.sqrt(2)
+
+    for query in range(100):
+        position = [generator.uniform(0, 400), generator.uniform(0, 400)]
+        radius = 150
+
+        count = tree.query(position, radius)[0]
+
+        assert findSums(bodies, position, radius * (1 - spread))[0] <= count <= findSums(bodies, position, radius * (1 + spread))[0]
+
+def testEmptyTree():
+    '''A tree with nothing in it finds nothing.'''
+    assert QuadTree([], 0.5).query([0, 0], 100) == (0, 0, 0, 0)
@@ -0,0 +1,68 @@
+import random
+import numpy as np
+import pygame
+from wall import Wall
+from gate import Gate
+from ray_caster import getEdges, castRays
+
+def makeWalls(generator, count):
+    return [Wall([generator.randrange(0, 400, 10), generator.randrange(0, 400, 10), generator.randrange(10, 120, 10), generator.randrange(10, 120, 10)], pygame.Color(0, 0, 0)) for wall in range(count)]
+
+def castRaysOneWallAtATime(origins, rayDirections, walls):
+    '''Finds the nearest hit of each ray with Wall.raycast.'''
+    closestHits = np.full(len(origins), np.inf)
+
+    for rayNumber, (origin, direction) in enumerate(zip(origins, rayDirections)):
+        for wall in walls:
+            if(not wall.isSolid()): continue
+
+            hit = wall.raycast(origin, direction, 1)
+            if(not hit == None): closestHits[rayNumber] = min(closestHits[rayNumber], hit)
+
+    return closestHits
+
+def isInsideAnyWall(position, walls):
+    return any([wall.rectangle[0] <= position[0] <= wall.rectangle[0] + wall.rectangle[2] and
+                wall.rectangle[1] <= position[1] <= wall.rectangle[1] + wall.rectangle[3] for wall in walls])
+
+def testCastRaysMatchesWallRaycast():
+    '''Casting every ray against the edge array finds the same hits as testing each wall.'''
+    for seed in range(10):
+        generator = random.Random(seed)
+        walls = makeWalls(generator, 15)
+
+        origins = []
+        while(len(origins) < 300):
+            origin = [generator.uniform(-20, 520), generator.uniform(-20, 520)]
+            if(not isInsideAnyWall(origin, walls)): origins.append(origin)
+        origins = np.array(origins)
+
+        rayDirections = np.array([[generator.uniform(-200, 200), generator.uniform(-200, 200)] for ray in range(300)])
+
+        # Rays along the axes take a different path through both tests
+        rayDirections[:30, 1] = 0
+        rayDirections[30:60, 0] = 0
+
+        expected = castRaysOneWallAtATime(origins, rayDirections, walls)
+        hits = castRays(origins, rayDirections, getEdges(walls))
+
+        assert np.array_equal(np.isinf(hits), np.isinf(expected))
+        assert np.allclose(hits[np.isfinite(hits)], expected[np.isfinite(expected)])
+
+def testOpenGateIsNotHit():
+    '''A gate that is open has edges that no ray can hit.'''
+    gate = Gate([100, 0, 20, 200], pygame.Color(0, 0, 0))
+    gate.setOpen(True)
+
+    origins = np.array([[0.0, 100.0]])
+    rayDirections = np.array([[300.0, 0.0]])
+
+    assert np.isinf(castRays(origins, rayDirections, getEdges([gate]))[0])
+
+    gate.setOpen(False)
+    assert castRays(origins, rayDirections, getEdges([gate]))[0] == 100 / 300
+
+def testNoEdgesOrRays():
+    '''Nothing is hit when there are no edges or no rays.'''
+    assert castRays(np.zeros((3, 2)), np.ones((3, 2)), getEdges([])).tolist() == [np.inf] * 3
+    assert len(castRays(np.zeros((0, 2)), np.zeros((0, 2)), getEdges(makeWalls(random.Random(0), 3)))) == 0
@@ -0,0 +1,78 @@
+import os
+import random
+import pytest
+import assignment
+from spatial_hash import SpatialHash
+from wall_grid import WallGrid
+
+# The folder with the level files and images
+GAMEFOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class EveryObjectGrid(SpatialHash):
+    '''
+    A herd grid that returns the whole herd from every search, like the game did before the grid.
+    '''
+    def getNearby(self, position, radius = None):
+        return sorted(self.objectOrder, key = self.objectOrder.__getitem__)
+
+class EveryWallGrid(WallGrid):
+    '''
+    A wall grid that returns every wall from every search, like the game did before the grid.
+    '''
+    def getNearby(self, position, radius):
+        return sorted(self.wallOrder, key = self.wallOrder.__getitem__)
+
+@pytest.fixture(autouse = True)
+def gameFolder(monkeypatch):
+    # The level files use paths from the game folder
+    monkeypatch.chdir(GAMEFOLDER)
+
+def runLevel(levelPath, steps, isBruteForce = False):
+    '''
+    Runs a level with the default settings and scripted sheepdog inputs.
+
+    Returns the state of every sheep and sheepdog after each step.
+    '''
+    random.seed(0)
+    level = assignment.initializeLevel(assignment.loadLevel(levelPath), 0)
+
+    if(isBruteForce):
+        level['herdGrid'] = EveryObjectGrid(level['herdGrid'].cellSize)
+        level['wallGrid'] = EveryWallGrid(level['walls'], level['wallGrid'].cellSize)
+
+    states = []
+    for step in range(steps):
+        # Drive the sheepdogs around the level in wide circles
+        sheepdogInputs = [[1 if step % 200 < 60 else 0, 1], [-1 if step % 150 < 40 else 0, 1 if step % 300 < 250 else -1]]
+        assignment.simulateStep(level, assignment.SIMULATIONSTEP, sheepdogInputs[:len(level['sheepdogs'])])
+
+        states.append(([(list(sheep.position), sheep.rotationAngle, sheep.isScared) for sheep in level['herd']],
+                       [(list(sheepdog.position), sheepdog.rotationAngle) for sheepdog in level['sheepdogs']]))
+
+    return level, states
+
+@pytest.mark.parametrize('levelPath', ['level data/1.txt', 'level data/3.txt'])
+def testRunIsDeterministic(levelPath):
+    '''Running a level twice with the same inputs and random seed gives the same result.'''
+    firstLevel, firstStates = runLevel(levelPath, 400)
+    secondLevel, secondStates = runLevel(levelPath, 400)
+
+    assert firstStates == secondStates
+    assert firstLevel['timeLeft'] == secondLevel['timeLeft']
+
+@pytest.mark.parametrize('levelPath', ['level data/1.txt', 'level data/3.txt'])
+def testGridsMatchSearchingEverything(levelPath):
+    '''With the default settings the grids only skip work, the herd moves the same as testing every sheep and wall.'''
+    level, states = runLevel(levelPath, 400)
+    bruteForceLevel, bruteForceStates = runLevel(levelPath, 400, True)
+
+    assert states == bruteForceStates
+
+def testSheepStayInLevel():
+    '''Every sheep is either captured or still inside the level.'''
+    level, states = runLevel('level data/1.txt', 600)
+    width, height = level['scene'].surfaceSize
+
+    assert len(level['herd']) <= level['herdSize']
+    for sheep in level['herd']:
+        assert 0 <= sheep.position[0] <= width and 0 <= sheep.position[1] <= height
@@ -0,0 +1,81 @@
+import math
+import random
+from spatial_hash import SpatialHash
+
+class Body():
+    '''
+    An object with only a position, used to fill the grid.
+    '''
+    def __init__(self, position):
+        self.position = position
+
+def makeBodies(generator, count, size):
+    return [Body([generator.uniform(-size, size), generator.uniform(-size, size)]) for body in range(count)]
+
+def testGetNearbyHasEveryObjectInRadius():
+    '''The objects returned are a superset of the objects within the radius, in insert order.'''
+    generator = random.Random(1)
+
+    for cellSize in (7, 30, 100):
+        bodies = makeBodies(generator, 300, 250)
+        grid = SpatialHash(cellSize)
+        grid.build(bodies)
+
+        for query in range(100):
+            position = [generator.uniform(-300, 300), generator.uniform(-300, 300)]
+            radius = generator.choice([None, 10, 45, 200])
+
+            nearby = grid.getNearby(position, radius)
+            expected = [body for body in bodies if math.dist(body.position, position) < (cellSize if radius == None else radius)]
+
+            assert set(expected) <= set(nearby)
+            assert nearby == sorted(nearby, key = bodies.index)
+
+def testGetNearestMatchesBruteForce():
+    '''The nearest objects are the same as sorting every object by distance.'''
+    generator = random.Random(2)
+
+    for cellSize in (5, 25, 200):
+        bodies = makeBodies(generator, 200, 200)
+        grid = SpatialHash(cellSize)
+        grid.build(bodies)
+
+        for query in range(200):
+            excluded = generator.choice(bodies)
+            position = list(excluded.position)
+            count = generator.randint(1, 10)
+            radius = generator.choice([15, 60, 300])
+
+            inRange = [body for body in bodies if not body is excluded and math.dist(body.position, position) < radius]
+            expected = sorted(inRange, key = lambda body: (math.dist(body.position, position), bodies.index(body)))[:count]
+
+            assert grid.getNearest(position, count, radius, excluded) == expected
+
+def testGetNearestWithNoCount():
+    '''Asking for no objects returns an empty list.'''
+    grid = SpatialHash(10)
+    grid.build([Body([1, 1]), Body([4, 2])])
+
+    assert grid.getNearest([0, 0], 0, 50) == []
+
+def testUpdateAndRemoveKeepGridCorrect():
+    '''Moving and removing objects gives the same results as building the grid again.'''
+    generator = random.Random(3)
+    bodies = makeBodies(generator, 150, 100)
+    grid = SpatialHash(20)
+    grid.build(bodies)
+
+    for step in range(20):
+        for body in bodies:
+            body.position[0] += generator.uniform(-15, 15)
+            body.position[1] += generator.uniform(-15, 15)
+            grid.update(body)
+
+        removed = bodies.pop(generator.randrange(len(bodies)))
+        grid.remove(removed)
+
+        fresh = SpatialHash(20)
+        fresh.build(bodies)
+        for query in range(20):
+            position = [generator.uniform(-120, 120), generator.uniform(-120, 120)]
+            assert set(grid.getNearby(position, 40)) == set(fresh.getNearby(position, 40))
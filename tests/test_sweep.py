@@ -0,0 +1,53 @@
+import random
+import pygame
+from wall import Wall
+
+def isTouching(wall, position, circleSize):
+    '''True if the center is strictly inside the wall grown by circleSize, like Wall.sweep.'''
+    left, top, width, height = wall.rectangle
+    return (left - circleSize < position[0] < left + width + circleSize and
+            top - circleSize < position[1] < top + height + circleSize)
+
+def testSweepFindsTheFirstTouch():
+    '''The fraction from Wall.sweep is where stepping along the movement first touches the wall.'''
+    generator = random.Random(8)
+    steps = 2000
+    checked = 0
+
+    for case in range(400):
+        wall = Wall([generator.uniform(50, 150), generator.uniform(50, 150), generator.uniform(5, 60), generator.uniform(5, 60)], pygame.Color(0, 0, 0))
+        circleSize = generator.uniform(2, 10)
+        position = [generator.uniform(0, 250), generator.uniform(0, 250)]
+
+        # Most movements head towards the wall so most cases touch it
+        scale = generator.uniform(0.3, 1.5)
+        movement = [(wall.rectangle[0] - position[0]) * scale + generator.uniform(-60, 60), (wall.rectangle[1] - position[1]) * scale + generator.uniform(-60, 60)]
+
+        # Circles that already touch the wall are not counted by the sweep
+        if(isTouching(wall, position, circleSize)): continue
+
+        touches = [step / steps for step in range(steps + 1) if isTouching(wall, [position[0] + movement[0] * step / steps, position[1] + movement[1] * step / steps], circleSize)]
+        result = wall.sweep(position, movement, circleSize)
+
+        if(len(touches) == 0):
+            # Grazing a corner between two steps can be missed by stepping
+            if(not result == None): assert result[0] > 0
+            continue
+
+        assert not result == None
+        assert touches[0] - 1 / steps <= result[0] <= touches[0]
+        checked += 1
+
+    assert checked > 100
+
+def testSweepFindsTheSideThatIsTouched():
+    '''Moving straight into a side reports that side.'''
+    wall = Wall([100, 100, 50, 50], pygame.Color(0, 0, 0))
+
+    fraction, isXSide, isYSide = wall.sweep([0, 125], [200, 0], 10)
+    assert fraction == 90 / 200 and isXSide and not isYSide
+
+    fraction, isXSide, isYSide = wall.sweep([125, 300], [0, -200], 10)
+    assert fraction == 140 / 200 and isYSide and not isXSide
+
+    assert wall.sweep([0, 0], [50, 0], 10) == None
@@ -0,0 +1,47 @@
+import math
+import random
+import pytest
+from threat_map import ThreatMap
+
+class Body():
+    '''
+    An object with only a position, used as a sheepdog.
+    '''
+    def __init__(self, position):
+        self.position = position
+
+def testSampleFindsNearestSheepdog():
+    '''Any sheepdog within the radius is found, and it is the nearest one.'''
+    generator = random.Random(14)
+    checked = 0
+
+    for case in range(100):
+        cellSize = generator.choice([10, 25, 40])
+        radius = generator.choice([50, 120, 200])
+        threatMap = ThreatMap([800, 600], cellSize, radius)
+
+        for build in range(3):
+            sheepdogs = [Body([generator.uniform(-50, 850), generator.uniform(-50, 650)]) for sheepdog in range(generator.randint(0, 5))]
+            threatMap.build(sheepdogs)
+
+            for sample in range(100):
+                position = [generator.uniform(0, 799.9), generator.uniform(0, 599.9)]
+                sheepdogDistance, sheepdog = threatMap.sample(position)
+
+                nearest = min(sheepdogs, key = lambda other: math.dist(other.position, position), default = None)
+                if(not nearest == None and math.dist(nearest.position, position) <= radius):
+                    assert sheepdog is nearest
+                    assert sheepdogDistance == pytest.approx(math.dist(nearest.position, position))
+                    checked += 1
+                else:
+                    assert sheepdog == None or sheepdogDistance > radius
+
+    assert checked > 1000
+
+def testOutsideMapHasNoSheepdog():
+    '''Positions outside the map never have a sheepdog.'''
+    threatMap = ThreatMap([100, 100], 10, 50)
+    threatMap.build([Body([5, 5])])
+
+    assert threatMap.sample([-1, 5]) == (10000000, None)
+    assert threatMap.sample([5, 100]) == (10000000, None)
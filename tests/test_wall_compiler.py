@@ -0,0 +1,48 @@
+import random
+import numpy as np
+import pygame
+from wall import Wall
+from wall_compiler import compileWalls
+from ray_caster import getEdges, castRays
+
+def makeWalls(generator, count):
+    colors = [pygame.Color(0, 0, 0), pygame.Color(100, 100, 100)]
+    return [Wall([generator.randrange(0, 400, 10), generator.randrange(0, 400, 10), generator.randrange(10, 120, 10), generator.randrange(10, 120, 10)], generator.choice(colors)) for wall in range(count)]
+
+def findInside(walls, pointsX, pointsY):
+    '''Finds which points are inside any of the walls.'''
+    inside = np.zeros(pointsX.shape, dtype = bool)
+    for wall in walls:
+        left, top, width, height = wall.rectangle
+        inside |= (pointsX > left) & (pointsX < left + width) & (pointsY > top) & (pointsY < top + height)
+
+    return inside
+
+def testCompiledWallsCoverTheSameArea():
+    '''Removing and joining walls does not change which points are inside a wall.'''
+    pointsX, pointsY = np.meshgrid(np.arange(-2.5, 530, 5), np.arange(-2.5, 530, 5))
+
+    for seed in range(20):
+        walls = makeWalls(random.Random(seed), 25)
+        compiledWalls, edges, removedWalls, removedSides = compileWalls(walls)
+
+        assert len(compiledWalls) == len(walls) - removedWalls
+        assert np.array_equal(findInside(compiledWalls, pointsX, pointsY), findInside(walls, pointsX, pointsY))
+
+def testCompiledEdgesHitLikeTheOriginalWalls():
+    '''Rays that start outside the walls hit the compiled edges where they hit the original walls.'''
+    for seed in range(20):
+        generator = random.Random(seed)
+        walls = makeWalls(generator, 25)
+        originalEdges = getEdges(walls)
+        compiledWalls, edges, removedWalls, removedSides = compileWalls(walls)
+
+        origins = np.array([[generator.uniform(-20, 520), generator.uniform(-20, 520)] for ray in range(1000)])
+        rayDirections = np.array([[generator.uniform(-200, 200), generator.uniform(-200, 200)] for ray in range(1000)])
+        outside = ~findInside(walls, origins[:, 0], origins[:, 1])
+
+        expected = castRays(origins[outside], rayDirections[outside], originalEdges)
+        hits = castRays(origins[outside], rayDirections[outside], getEdges(compiledWalls))
+
+        assert np.array_equal(np.isinf(hits), np.isinf(expected))
+        assert np.allclose(hits[np.isfinite(hits)], expected[np.isfinite(expected)])
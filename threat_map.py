@@ -0,0 +1,161 @@
+import math
+import numpy as np
+from math_utilities import distance
+
+class ThreatMap():
+    '''
+    ThreatMap
+
+    A coarse grid that stores the sheepdogs that can be near each cell.
+
+    Each sheepdog only marks the cells within its radius, so the map is built in
+    time proportional to the number of sheepdogs and the cells they cover, and each
+    sheep finds its nearest sheepdog by looking at the few sheepdogs marked in its cell
+    instead of every sheepdog.
+    The sheepdogs marked in a cell are stored as the bits of one number, so there can be at most 64.
+
+    FUNCTIONS
+        __init__(self, sceneSize, cellSizeIn, radiusIn)
+            Creates an empty map that covers the scene.
+
+        build(self, sheepdogs)
+            Clears the cells marked last time and marks the cells around each sheepdog.
+
+        sample(self, position)
+            Returns the distance to the nearest sheepdog and that sheepdog.
+    '''
+    def __init__(self, sceneSize, cellSizeIn, radiusIn):
+        '''
+        Initializes a ThreatMap
+
+        Parameters
+        ----------
+        sceneSize: List<int> [width, height]
+            The size of the area covered by the map.
+
+        cellSizeIn: int or float
+            The width and height of each cell.
+
+        radiusIn: int or float
+            How far from each sheepdog cells are marked.
+            It should be at least the largest distance the sheep compare with the nearest sheepdog.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(cellSizeIn) in (int, float)): raise ValueError(f'Parameter 2 cellSizeIn must be of type int or float not {type(cellSizeIn)}')
+        if(not cellSizeIn > 0): raise ValueError(f'Parameter 2 cellSizeIn must be greater than 0 not {cellSizeIn}')
+        if(not type(radiusIn) in (int, float)): raise ValueError(f'Parameter 3 radiusIn must be of type int or float not {type(radiusIn)}')
+
+        self.cellSize = cellSizeIn
+        self.radius = radiusIn
+        self.columns = max(math.ceil(sceneSize[0] / self.cellSize), 1)
+        self.rows = max(math.ceil(sceneSize[1] / self.cellSize), 1)
+
+        # Position of the center of each cell
+        self.centersX, self.centersY = np.meshgrid((np.arange(self.columns) + 0.5) * self.cellSize, (np.arange(self.rows) + 0.5) * self.cellSize)
+
+        # The sheepdogs within the radius of any position in each cell
+        # Bit n is set if sheepdog n is, so 0 if no sheepdog is
+        self.coveringSheepdogs = np.zeros((self.rows, self.columns), dtype = np.uint64)
+
+        self.sheepdogs = []
+
+        # (firstRow, lastRow, firstColumn, lastColumn) of the cells marked by the last build
+        self.markedAreas = []
+
+    def build(self, sheepdogs):
+        '''
+        Marks the cells around each sheepdog.
+
+        Call this once each simulation step after the sheepdogs move.
+
+        Parameters
+        ----------
+        sheepdogs: List<Moveable()>
+            The sheepdogs that are in the level.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If there are more sheepdogs than bits in each cell.
+        '''
+        if(len(sheepdogs) > 64): raise ValueError(f'Parameter 1 sheepdogs must have at most 64 sheepdogs not {len(sheepdogs)}')
+
+        # Only clear the cells that were marked so the cost does not depend on the size of the scene
+        for firstRow, lastRow, firstColumn, lastColumn in self.markedAreas:
+            self.coveringSheepdogs[firstRow:lastRow, firstColumn:lastColumn] = 0
+        self.markedAreas.clear()
+
+        self.sheepdogs = list(sheepdogs)
+
+        # Any position in a cell is within half of the cell's diagonal of its center
+        reach = self.radius + self.cellSize * math.sqrt(2) / 2
+
+        for sheepdogNumber, sheepdog in enumerate(self.sheepdogs):
+            firstColumn = max(math.floor((sheepdog.position[0] - reach) / self.cellSize), 0)
+            lastColumn = min(math.floor((sheepdog.position[0] + reach) / self.cellSize) + 1, self.columns)
+            firstRow = max(math.floor((sheepdog.position[1] - reach) / self.cellSize), 0)
+            lastRow = min(math.floor((sheepdog.position[1] + reach) / self.cellSize) + 1, self.rows)
+            if(firstColumn >= lastColumn or firstRow >= lastRow): continue
+
+            distances = np.hypot(self.centersX[firstRow:lastRow, firstColumn:lastColumn] - sheepdog.position[0],
+                                 self.centersY[firstRow:lastRow, firstColumn:lastColumn] - sheepdog.position[1])
+
+            # Mark the cells that have a position within the radius of this sheepdog
+            covered = distances <= reach
+            self.coveringSheepdogs[firstRow:lastRow, firstColumn:lastColumn][covered] |= np.uint64(1 << sheepdogNumber)
+
+            self.markedAreas.append((firstRow, lastRow, firstColumn, lastColumn))
+
+    def sample(self, position):
+        '''
+        Finds the nearest sheepdog to a position.
+
+        Only the sheepdogs marked in the position's cell are compared. The nearest sheepdog
+        is always one of them when it is within the radius.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            A position in the scene.
+
+        Returns
+        -------
+        float
+            The distance to the sheepdog, or 10000000 if no sheepdog is within the radius.
+
+        Moveable() or None
+            The nearest sheepdog, or None if no sheepdog is within the radius.
+        '''
+        column = math.floor(position[0] / self.cellSize)
+        row = math.floor(position[1] / self.cellSize)
+        if(column < 0 or column >= self.columns or row < 0 or row >= self.rows): return 10000000, None
+
+        nearestDistance = 10000000
+        nearestSheepdog = None
+
+        # Compare the distance to each sheepdog that marked the cell
+        covering = int(self.coveringSheepdogs[row, column])
+        while(covering > 0):
+            bit = covering & -covering
+            covering ^= bit
+
+            sheepdog = self.sheepdogs[bit.bit_length() - 1]
+            sheepdogDistance = distance(sheepdog.position, position)
+            if(sheepdogDistance < nearestDistance):
+                nearestDistance = sheepdogDistance
+                nearestSheepdog = sheepdog
+
+        return nearestDistance, nearestSheepdog
@@ -0,0 +1,479 @@
+import os
+import io
+import copy
+import math
+import random
+import contextlib
+import multiprocessing
+import numpy as np
+
+# Nothing is drawn so pygame does not need a window or a sound device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import assignment
+from herd import Herd
+
+# Number of values in each observation
+# 5 for each sheepdog, 4 for the herd, 4 for the goal and 1 for the time
+OBSERVATIONSIZE = 19
+
+class SheepdogEnv():
+    '''
+    SheepdogEnv
+
+    One level that is simulated without drawing so controllers for the sheepdogs can be trained.
+
+    Each step takes an action for both sheepdogs and runs the same fixed simulation
+    steps as the game with assignment.simulateStep, using the settings in assignment.py.
+    The level ends when every sheep has been captured or the time runs out.
+
+    An action is [[rotate, accelerate], [rotate, accelerate]], one row for each sheepdog,
+    with values from -1 to 1 that are used like the keyboard and microbit inputs.
+
+    An observation has OBSERVATIONSIZE values scaled to about -1 to 1:
+        The position, heading and speed of each sheepdog.
+        The part of the herd that is left, its center and how spread out it is.
+        The center of the first goal and the direction of the path to it from the center of the herd.
+        The part of the time that is left.
+
+    The reward of a step is the part of the herd captured during the step, plus the part of
+    the time that is left when the last sheep is captured.
+
+    FUNCTIONS
+        __init__(self, levelPathIn, stepsPerActionIn)
+            Loads the level.
+
+        reset(self)
+            Starts the level again from a copy of the loaded level and returns the first observation.
+
+        getObservation(self)
+            Returns the observation of the level.
+
+        simulate(self, action)
+            Runs one simulation step and returns the number of sheep captured.
+
+        step(self, action)
+            Applies an action and returns the observation, reward, done and info.
+    '''
+    def __init__(self, levelPathIn, stepsPerActionIn = 1):
+        '''
+        Initializes a SheepdogEnv
+
+        Parameters
+        ----------
+        levelPathIn: str
+            The filepath of the level file.
+
+        stepsPerActionIn: int
+            The number of simulation steps each action is used for.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+
+        FileNotFoundError
+            If the level file is not found
+        '''
+        # Check if the input values are bad
+        if(not type(levelPathIn) is str): raise ValueError(f'Parameter 1 levelPathIn must be of type str not {type(levelPathIn)}')
+        if(not type(stepsPerActionIn) is int): raise ValueError(f'Parameter 2 stepsPerActionIn must be of type int not {type(stepsPerActionIn)}')
+        if(not stepsPerActionIn > 0): raise ValueError(f'Parameter 2 stepsPerActionIn must be greater than 0 not {stepsPerActionIn}')
+
+        self.levelPath = levelPathIn
+        self.stepsPerAction = stepsPerActionIn
+
+        # The level file is only read once, each reset starts from a copy of the loaded level
+        # Loading prints a message that is not needed for every level
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.levelData = assignment.loadLevel(self.levelPath)
+
+        # The images are never changed so every copy shares them instead of copying them
+        self.sharedObjects = {}
+        for gameObject in [self.levelData[0]] + [gameObject for objects in self.levelData if type(objects) is list for gameObject in objects]:
+            for value in vars(gameObject).values():
+                if(isinstance(value, pygame.Surface)): self.sharedObjects[id(value)] = value
+
+        # The kept flow fields are never changed either, each change is made to copies of them
+        flowFields = self.levelData[7]
+        if(not flowFields == None):
+            for blocked, fieldLists in flowFields.variants.values():
+                for sharedList in [blocked] + [fieldList for lists in fieldLists for fieldList in lists]:
+                    self.sharedObjects[id(sharedList)] = sharedList
+
+        self.reset()
+
+    def reset(self):
+        '''
+        Starts the level again.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        numpy.ndarray
+            The first observation of the level.
+        '''
+        # The levels are already run in separate processes so the herd engine uses one process
+        self.level = assignment.initializeLevel(copy.deepcopy(self.levelData, dict(self.sharedObjects)), 0)
+
+        return self.getObservation()
+
+    def getObservation(self):
+        '''
+        Finds the observation of the level.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        numpy.ndarray
+            The OBSERVATIONSIZE values described in the class.
+        '''
+        level = self.level
+        width, height = level['scene'].surfaceSize
+        observation = []
+
+        for sheepdog in level['sheepdogs'][:2]:
+            observation += [sheepdog.position[0] / width, sheepdog.position[1] / height,
+                            sheepdog.heading[0], sheepdog.heading[1], sheepdog.speed / sheepdog.maxSpeed]
+
+        # The goal is used as the center of an empty herd
+        goalCenter = [level['goals'][0].rect[0] + level['goals'][0].rect[2] / 2, level['goals'][0].rect[1] + level['goals'][0].rect[3] / 2] if len(level['goals']) > 0 else [width / 2, height / 2]
+
+        if(len(level['herd']) == 0):
+            herdCenter = goalCenter
+            herdSpread = 0
+        else:
+            # The herd engine stores its positions in one array
+            positions = level['herd'].position if isinstance(level['herd'], Herd) else np.array([sheep.position for sheep in level['herd']])
+            herdCenter = positions.mean(axis = 0)
+            herdSpread = np.hypot(positions[:, 0] - herdCenter[0], positions[:, 1] - herdCenter[1]).mean()
+
+        observation += [len(level['herd']) / max(level['herdSize'], 1), herdCenter[0] / width, herdCenter[1] / height, herdSpread / math.hypot(width, height)]
+        observation += [goalCenter[0] / width, goalCenter[1] / height]
+
+        # Follow the path around the walls if the goal has a flow field, otherwise point straight at the goal
+        goalDirection = level['goals'][0].flowField.getDirection(herdCenter) if len(level['goals']) > 0 and not level['goals'][0].flowField == None else None
+        if(goalDirection == None):
+            goalDistance = math.hypot(goalCenter[0] - herdCenter[0], goalCenter[1] - herdCenter[1])
+            goalDirection = ((goalCenter[0] - herdCenter[0]) / goalDistance, (goalCenter[1] - herdCenter[1]) / goalDistance) if goalDistance > 0 else (0, 0)
+        observation += [goalDirection[0], goalDirection[1]]
+
+        observation.append(max(level['timeLeft'], 0) / level['timeToComplete'])
+
+        return np.array(observation, dtype = float)
+
+    def simulate(self, action):
+        '''
+        Runs one simulation step of the level, the same as one step of the game.
+
+        Parameters
+        ----------
+        action: List<List<float>> or numpy.ndarray
+            [rotate, accelerate] for each sheepdog.
+
+        Returns
+        -------
+        int
+            The number of sheep captured during the step.
+        '''
+        # The actions are limited to the range of the keyboard and microbit inputs
+        sheepdogInputs = [[min(max(float(value), -1), 1) for value in sheepdogAction] for sheepdogAction in action]
+
+        return assignment.simulateStep(self.level, assignment.SIMULATIONSTEP, sheepdogInputs)
+
+    def step(self, action):
+        '''
+        Applies an action for stepsPerAction simulation steps.
+
+        Parameters
+        ----------
+        action: List<List<float>> or numpy.ndarray
+            [rotate, accelerate] for each sheepdog.
+
+        Returns
+        -------
+        numpy.ndarray
+            The observation after the steps.
+
+        float
+            The reward for the steps.
+
+        bool
+            True if the level is over.
+
+        Dictionary<str, dynamic>
+            {'captured': int, 'sheepLeft': int, 'timeLeft': float}
+        '''
+        level = self.level
+        captured = 0
+        done = False
+        for stepNumber in range(self.stepsPerAction):
+            captured += self.simulate(action)
+
+            done = len(level['herd']) == 0 or level['timeLeft'] < 0.000001
+            if(done): break
+
+        reward = captured / max(level['herdSize'], 1)
+        if(len(level['herd']) == 0 and captured > 0): reward += max(level['timeLeft'], 0) / level['timeToComplete']
+
+        return self.getObservation(), reward, done, {'captured': captured, 'sheepLeft': len(level['herd']), 'timeLeft': max(level['timeLeft'], 0)}
+
+def stepEnvs(envs, actions):
+    '''
+    Steps a list of levels, restarting each one that ends.
+
+    Parameters
+    ----------
+    envs: List<SheepdogEnv()>
+        The levels.
+
+    actions: numpy.ndarray
+        The action of each level, with a shape of (len(envs), 2, 2).
+
+    Returns
+    -------
+    numpy.ndarray
+        The observation of each level, with a shape of (len(envs), OBSERVATIONSIZE).
+        The first observation of the next attempt is returned for levels that ended.
+
+    numpy.ndarray
+        The reward of each level.
+
+    numpy.ndarray
+        True for each level that ended.
+
+    List<Dictionary<str, dynamic>>
+        The info of each level. Levels that ended also have their last observation in 'finalObservation'.
+    '''
+    observations = np.empty((len(envs), OBSERVATIONSIZE))
+    rewards = np.empty(len(envs))
+    dones = np.empty(len(envs), dtype = bool)
+    infos = []
+
+    for envNumber, env in enumerate(envs):
+        observation, rewards[envNumber], dones[envNumber], info = env.step(actions[envNumber])
+
+        if(dones[envNumber]):
+            info['finalObservation'] = observation
+            observation = env.reset()
+
+        observations[envNumber] = observation
+        infos.append(info)
+
+    return observations, rewards, dones, infos
+
+def runWorker(connection, levelPaths, stepsPerAction, seed):
+    '''
+    Runs levels in a worker process until it is told to stop.
+
+    Parameters
+    ----------
+    connection: multiprocessing.connection.Connection()
+        The end of the pipe that commands are received on and results are sent back through.
+        Each command is a tuple of ('reset', None), ('step', actions) or ('close', None).
+
+    levelPaths: List<str>
+        The filepath of the level file of each level this worker runs.
+
+    stepsPerAction: int
+        The number of simulation steps each action is used for.
+
+    seed: int or None
+        The seed of the random numbers in this process, or None to not seed them.
+
+    Returns
+    -------
+    None
+    '''
+    if(not seed == None): random.seed(seed)
+
+    envs = [SheepdogEnv(levelPath, stepsPerAction) for levelPath in levelPaths]
+
+    while(True):
+        command, data = connection.recv()
+
+        if(command == 'reset'):
+            connection.send(np.array([env.reset() for env in envs]))
+        elif(command == 'step'):
+            connection.send(stepEnvs(envs, data))
+        elif(command == 'close'):
+            break
+
+    connection.close()
+
+class VectorEnv():
+    '''
+    VectorEnv
+
+    Many levels that are stepped together, with an action, observation and reward for each level.
+
+    The levels are split between worker processes that step their levels at the same time.
+    Each worker keeps its levels for as long as it runs so only the actions and results are
+    sent between processes each step. A level that ends is restarted in the same step and
+    its last observation is put in its info.
+
+    FUNCTIONS
+        __init__(self, levelPaths, processes, stepsPerAction, seed)
+            Creates the levels and starts the worker processes.
+
+        reset(self)
+            Restarts every level and returns their observations.
+
+        step(self, actions)
+            Applies an action to each level and returns their results.
+
+        close(self)
+            Stops the worker processes.
+    '''
+    def __init__(self, levelPaths, processes = 0, stepsPerAction = 1, seed = None):
+        '''
+        Initializes a VectorEnv
+
+        Parameters
+        ----------
+        levelPaths: List<str>
+            The filepath of the level file of each level. A path can be used more than once.
+
+        processes: int
+            The number of worker processes. If 0 the levels are stepped in this process.
+
+        stepsPerAction: int
+            The number of simulation steps each action is used for.
+
+        seed: int or None
+            If not None each process seeds its random numbers with seed plus its number.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(levelPaths) is list): raise ValueError(f'Parameter 1 levelPaths must be of type list not {type(levelPaths)}')
+        if(not type(processes) is int): raise ValueError(f'Parameter 2 processes must be of type int not {type(processes)}')
+        if(not seed == None and not type(seed) is int): raise ValueError(f'Parameter 4 seed must be of type int not {type(seed)}')
+
+        self.envCount = len(levelPaths)
+        self.processes = min(processes, self.envCount)
+
+        self.envs = []
+        self.connections = []
+        self.workers = []
+
+        if(self.processes == 0):
+            if(not seed == None): random.seed(seed)
+            self.envs = [SheepdogEnv(levelPath, stepsPerAction) for levelPath in levelPaths]
+            return
+
+        # Give each worker a strip of the levels so the results come back in order
+        self.strips = [slice(self.envCount * workerNumber // self.processes, self.envCount * (workerNumber + 1) // self.processes) for workerNumber in range(self.processes)]
+
+        for workerNumber, strip in enumerate(self.strips):
+            connection, workerConnection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target = runWorker, args = (workerConnection, levelPaths[strip], stepsPerAction, None if seed == None else seed + workerNumber), daemon = True)
+            worker.start()
+            workerConnection.close()
+
+            self.connections.append(connection)
+            self.workers.append(worker)
+
+    def reset(self):
+        '''
+        Restarts every level.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        numpy.ndarray
+            The observation of each level, with a shape of (number of levels, OBSERVATIONSIZE).
+        '''
+        if(self.processes == 0): return np.array([env.reset() for env in self.envs])
+
+        for connection in self.connections:
+            connection.send(('reset', None))
+
+        return np.concatenate([connection.recv() for connection in self.connections])
+
+    def step(self, actions):
+        '''
+        Applies an action to each level.
+
+        Parameters
+        ----------
+        actions: List or numpy.ndarray
+            [[rotate, accelerate], [rotate, accelerate]] for each level, with a shape of (number of levels, 2, 2).
+
+        Returns
+        -------
+        numpy.ndarray
+            The observation of each level, with a shape of (number of levels, OBSERVATIONSIZE).
+
+        numpy.ndarray
+            The reward of each level.
+
+        numpy.ndarray
+            True for each level that ended and was restarted.
+
+        List<Dictionary<str, dynamic>>
+            The info of each level.
+        '''
+        actions = np.asarray(actions, dtype = float)
+
+        if(self.processes == 0): return stepEnvs(self.envs, actions)
+
+        # Send every command before waiting so the workers step at the same time
+        for connection, strip in zip(self.connections, self.strips):
+            connection.send(('step', actions[strip]))
+
+        results = [connection.recv() for connection in self.connections]
+
+        observations = np.concatenate([result[0] for result in results])
+        rewards = np.concatenate([result[1] for result in results])
+        dones = np.concatenate([result[2] for result in results])
+        infos = [info for result in results for info in result[3]]
+
+        return observations, rewards, dones, infos
+
+    def close(self):
+        '''
+        Stops the worker processes.
+
+        Call this once the levels are no longer used.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        # Let the workers exit on their own since pygame can stop them from being terminated
+        for connection in self.connections:
+            connection.send(('close', None))
+            connection.close()
+
+        for worker in self.workers:
+            worker.join()
+
+        self.connections.clear()
+        self.workers.clear()
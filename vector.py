@@ -0,0 +1,115 @@
+import numbers
+
+class Vec2(list):
+    '''
+    Vec2
+
+    A 2D vector stored as a list of [x, y].
+
+    It can be used anywhere a position list is used, but also has functions that
+    change the vector in place so that moving and colliding objects does not
+    create a new list every frame.
+
+    FUNCTIONS
+        copy(self)
+            Returns a new vector with the same values.
+
+        set(self, x, y)
+            Changes both values of the vector.
+
+        setVector(self, vector)
+            Copies the values of another vector into this one.
+
+        addScaled(self, vector, scale)
+            Adds another vector multiplied by a number to this one.
+    '''
+    # No instance dictionary is needed since the values are stored in the list
+    __slots__ = ()
+
+    def __init__(self, x = 0, y = 0):
+        '''
+        Initializes a Vec2
+
+        Parameters
+        ----------
+        x: float or List<float> [x, y]
+            The x value, or a position to copy.
+
+        y: float
+            The y value. Not used if x is a position.
+
+        Returns
+        -------
+        None
+        '''
+        # Any number, including numpy numbers, is an x value
+        if(isinstance(x, numbers.Real)):
+            list.__init__(self, (x, y))
+        else:
+            list.__init__(self, (x[0], x[1]))
+
+    def copy(self):
+        '''
+        Copies the vector.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Vec2()
+            A new vector with the same values.
+        '''
+        return Vec2(self[0], self[1])
+
+    def set(self, x, y):
+        '''
+        Changes both values of the vector.
+
+        Parameters
+        ----------
+        x, y: float
+            The new values.
+
+        Returns
+        -------
+        None
+        '''
+        self[0] = x
+        self[1] = y
+
+    def setVector(self, vector):
+        '''
+        Copies the values of another vector into this one.
+
+        Parameters
+        ----------
+        vector: List<float> [x, y]
+            The vector that is copied.
+
+        Returns
+        -------
+        None
+        '''
+        self[0] = vector[0]
+        self[1] = vector[1]
+
+    def addScaled(self, vector, scale):
+        '''
+        Adds another vector multiplied by a number to this one.
+
+        Parameters
+        ----------
+        vector: List<float> [x, y]
+            The vector that is added.
+
+        scale: float
+            The number the vector is multiplied by.
+
+        Returns
+        -------
+        None
+        '''
+        self[0] += vector[0] * scale
+        self[1] += vector[1] * scale
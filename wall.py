@@ -1,4 +1,5 @@
 import pygame
+import math
 from math_utilities import *
 
 # Wall class adapted from maze-game project
@@ -15,11 +16,17 @@ class Wall():
         draw(self, surfaceIn)
             Draws the wall as a rectangle on a surface.
         
-        isCircleColliding(self, circlePos, circleSize)
+        isSolid(self)
+            Returns true if moveable objects can collide with the wall.
+        
+        isCircleColliding(self, circlePos, circleSize, result = None)
             Returns true if the circle is colliding with the wall.
             
-        isLineSegmentColliding(self, p1, p1)
-            Returns the closest POI of a line segment and the wall.
+        raycast(self, origin, direction, maxT)
+            Returns how far along a ray the wall is entered.
+            
+        sweep(self, circlePosition, movement, circleSize)
+            Returns when and on which axis a moving circle first touches the wall.
     '''
     def __init__(self, rectangleIn, colorIn):
         '''
@@ -59,6 +66,10 @@ class Wall():
         # Color
         self.color = colorIn
         
+        # Edges of the wall that can be reached, set when the walls of a level are compiled
+        # None if every side can be reached
+        self.edges = None
+        
     def draw(self, surfaceIn):
         '''
         Draws the wall.
@@ -75,8 +86,25 @@ class Wall():
         None
         '''
         pygame.draw.rect(surfaceIn, self.color, self.rectangle)
+    
+    def isSolid(self):
+        '''
+        Checks if the wall can be collided with.
+        
+        Walls are always solid, but walls that can open like gates are not solid while they are open.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        bool
+            True if moveable objects can collide with the wall.
+        '''
+        return True
             
-    def isCircleColliding(self, circlePosition, circleSize):
+    def isCircleColliding(self, circlePosition, circleSize, result = None):
         '''
         Determine if a circle is colliding with the wall.
 
@@ -92,6 +120,11 @@ class Wall():
         playerSize: int
             The radius of the circle.
             
+        result: List or None [bool, bool, bool, List<float>]
+            If given, the results are written into this list instead of a new tuple
+            and the new position is written into result[3], so nothing is created
+            when this is called every frame.
+            
         Returns
         -------
         bool
@@ -124,7 +157,9 @@ class Wall():
         wallLeft = self.rectangle[0]
         wallRight = self.rectangle[0] + self.rectangle[2]
         
-        newPosition = circlePosition.copy()
+        # How far the circle is pushed out of the wall
+        moveX = 0
+        moveY = 0
         
         xCollision = False
         yCollision = False
@@ -135,7 +170,7 @@ class Wall():
         if(circlePosition[0] < wallLeft):
             # if the circle's right side is colliding with the wall
             if(circleRight > wallLeft):
-                newPosition[0] -= 1
+                moveX = -1
                 xCollision = True
                 conditionsMet += 1
                 
@@ -143,7 +178,7 @@ class Wall():
         elif(circlePosition[0] > wallRight):
             # if the circle's left side is colliding with the wall
             if(circleLeft < wallRight):
-                newPosition[0] += 1
+                moveX = 1
                 xCollision = True
                 conditionsMet += 1
                 
@@ -156,7 +191,7 @@ class Wall():
         if(circlePosition[1] < wallTop):
             # if the circle's bottom side is colliding with the wall
             if(circleBottom > wallTop):
-                newPosition[1] -= 1
+                moveY = -1
                 yCollision = True
                 conditionsMet += 1
                 
@@ -164,7 +199,7 @@ class Wall():
         elif(circlePosition[1] > wallBottom):
             # if the circle's top side is colliding with the wall
             if(circleTop < wallBottom):
-                newPosition[1] += 1
+                moveY = 1
                 yCollision = True
                 conditionsMet += 1
         
@@ -172,60 +207,141 @@ class Wall():
         else:
             conditionsMet += 1
                  
-        return (conditionsMet == 2, xCollision, yCollision, newPosition)
+        if(result == None):
+            newPosition = circlePosition.copy()
+            newPosition[0] += moveX
+            newPosition[1] += moveY
+            return (conditionsMet == 2, xCollision, yCollision, newPosition)
+        
+        result[0] = conditionsMet == 2
+        result[1] = xCollision
+        result[2] = yCollision
+        result[3][0] = circlePosition[0] + moveX
+        result[3][1] = circlePosition[1] + moveY
+        
+        return result
     
-    def isLineSegmentColliding(self, p1, p2):
+    def raycast(self, origin, direction, maxT):
         '''
-        Checks if a line segment is colliding with the rectangle
+        Finds where a ray enters the wall.
         
-        Test for collisions with each of the 4 edges of the wall and returns the closest collision
-        or None if there are no collisions.
+        Uses the slab method to find how far along the ray the wall's rectangle is entered.
+        Rays that start inside the wall or miss it are not counted.
+        If direction has a length of 1 the result is the distance to the wall, so the
+        closest hit so far can be given as maxT to skip walls that are further away.
         
         Parameters
         ----------
-        p1: List<float> [x, y]
-            The starting point of the line segment
+        origin: List<float> [x, y]
+            The start of the ray
+            
+        direction: List<float> [x, y]
+            The direction of the ray
             
-        p2: List<float> [x, y]
-            The ending point of the line segment
+        maxT: float
+            The furthest along the ray that is tested, in multiples of direction
         
         Returns
         -------
-        Tuple<float> (x, y)
-            The closest point of intersection
+        float
+            How far along the ray the wall is entered, in multiples of direction
             
         None
-            If there are no collisions with the wall
+            If the ray does not enter the wall before maxT
         '''
-        # verticies of the wall
-        topLeft = [self.rectangle[0], self.rectangle[1]]
-        topRight = [self.rectangle[0] + self.rectangle[2], self.rectangle[1]]
-        bottomLeft = [self.rectangle[0], self.rectangle[1] + self.rectangle[3]]
-        bottomRight = [self.rectangle[0] + self.rectangle[2], self.rectangle[1] + self.rectangle[3]]
-        
-        # edges of the wall
-        wallTop = [topLeft, topRight]
-        wallBottom = [bottomLeft, bottomRight]
-        wallLeft = [topLeft, bottomLeft]
-        wallRight = [topRight, bottomRight]
-        
-        closestCollision = None
-        
-        # test a for collisions with each edge
-        for edge in (wallTop, wallBottom, wallLeft, wallRight):
-            intersection = findPointOfIntersection(p1, p2, edge[0], edge[1])
-            
-            # store the closest collision
-            if(not intersection == None):
-                # if there is no closest point
-                if(closestCollision == None):
-                    # made this intersection the new closest point
-                    closestCollision = intersection
-                    continue
-                
-                # if this intersection is closer than the previous closest point
-                if(distance(p1, intersection) < distance(p1, closestCollision)):
-                    # made this intersection the new closest point
-                    closestCollision = intersection
+        tEnter = -math.inf
+        tExit = math.inf
+        
+        # Where the ray crosses the left and right sides
+        if(direction[0] == 0):
+            # A vertical ray can only hit the wall if it is between the sides
+            if(origin[0] < self.rectangle[0] or origin[0] > self.rectangle[0] + self.rectangle[2]): return None
+        else:
+            t1 = (self.rectangle[0] - origin[0]) / direction[0]
+            t2 = (self.rectangle[0] + self.rectangle[2] - origin[0]) / direction[0]
+            tEnter = min(t1, t2)
+            tExit = max(t1, t2)
+            
+        # Where the ray crosses the top and bottom sides
+        if(direction[1] == 0):
+            # A horizontal ray can only hit the wall if it is between the top and bottom
+            if(origin[1] < self.rectangle[1] or origin[1] > self.rectangle[1] + self.rectangle[3]): return None
+        else:
+            t1 = (self.rectangle[1] - origin[1]) / direction[1]
+            t2 = (self.rectangle[1] + self.rectangle[3] - origin[1]) / direction[1]
+            tEnter = max(tEnter, min(t1, t2))
+            tExit = min(tExit, max(t1, t2))
+        
+        # The ray misses if it leaves one pair of sides before it enters the other
+        if(tEnter > tExit or tEnter < 0 or tEnter > maxT): return None
+        
+        return tEnter
+    
+    def sweep(self, circlePosition, movement, circleSize):
+        '''
+        Finds when a moving circle first touches the wall.
+        
+        Like isCircleColliding the circle is treated as the square around it, so the circle
+        touches the wall when its center enters the wall's rectangle grown by circleSize on each side.
+        Circles that are already touching the wall are not counted.
+        
+        Parameters
+        ----------
+        circlePosition: List<float> [x, y]
+            The position of the circle before it moves.
+            
+        movement: List<float> [x, y]
+            How far the circle moves.
+            
+        circleSize: float
+            The radius of the circle.
+        
+        Returns
+        -------
+        float
+            The fraction of the movement (0 to 1) when the circle touches the wall.
+            
+        bool
+            True if the circle touches the left or right side.
+            
+        bool
+            True if the circle touches the top or bottom side.
+            
+        None
+            If the circle does not touch the wall during the movement.
+        '''
+        left = self.rectangle[0] - circleSize
+        right = self.rectangle[0] + self.rectangle[2] + circleSize
+        top = self.rectangle[1] - circleSize
+        bottom = self.rectangle[1] + self.rectangle[3] + circleSize
+        
+        tEnterX = -math.inf
+        tExitX = math.inf
+        tEnterY = -math.inf
+        tExitY = math.inf
+        
+        # When the circle is between the left and right sides
+        if(movement[0] == 0):
+            if(circlePosition[0] <= left or circlePosition[0] >= right): return None
+        else:
+            t1 = (left - circlePosition[0]) / movement[0]
+            t2 = (right - circlePosition[0]) / movement[0]
+            tEnterX = min(t1, t2)
+            tExitX = max(t1, t2)
+            
+        # When the circle is between the top and bottom sides
+        if(movement[1] == 0):
+            if(circlePosition[1] <= top or circlePosition[1] >= bottom): return None
+        else:
+            t1 = (top - circlePosition[1]) / movement[1]
+            t2 = (bottom - circlePosition[1]) / movement[1]
+            tEnterY = min(t1, t2)
+            tExitY = max(t1, t2)
+        
+        tEnter = max(tEnterX, tEnterY)
+        tExit = min(tExitX, tExitY)
+        
+        # The circle does not touch the wall if it leaves one pair of sides before it enters the other
+        if(tEnter >= tExit or tEnter < 0 or tEnter > 1): return None
         
-        return closestCollision
\ No newline at end of file
+        return (tEnter, tEnterX >= tEnterY, tEnterY >= tEnterX)
@@ -0,0 +1,212 @@
+from wall import Wall
+
+def containsRectangle(rectangle1, rectangle2):
+    '''
+    Checks if one rectangle covers another.
+
+    Parameters
+    ----------
+    rectangle1: List<float> [left, top, width, height]
+        The outer rectangle
+
+    rectangle2: List<float> [left, top, width, height]
+        The inner rectangle
+
+    Returns
+    -------
+    bool
+        True if every point of rectangle2 is in rectangle1
+    '''
+    return (rectangle1[0] <= rectangle2[0] and rectangle2[0] + rectangle2[2] <= rectangle1[0] + rectangle1[2] and
+            rectangle1[1] <= rectangle2[1] and rectangle2[1] + rectangle2[3] <= rectangle1[1] + rectangle1[3])
+
+def mergeRectangles(rectangle1, rectangle2):
+    '''
+    Joins two rectangles if together they make a rectangle.
+
+    Rectangles that are in the same row or column and touch or overlap are joined.
+
+    Parameters
+    ----------
+    rectangle1: List<float> [left, top, width, height]
+        The first rectangle
+
+    rectangle2: List<float> [left, top, width, height]
+        The second rectangle
+
+    Returns
+    -------
+    List<float> [left, top, width, height]
+        The rectangle that covers both rectangles
+
+    None
+        If the rectangles can not be joined into one rectangle
+    '''
+    if(containsRectangle(rectangle1, rectangle2)): return list(rectangle1)
+    if(containsRectangle(rectangle2, rectangle1)): return list(rectangle2)
+
+    left = min(rectangle1[0], rectangle2[0])
+    top = min(rectangle1[1], rectangle2[1])
+    right = max(rectangle1[0] + rectangle1[2], rectangle2[0] + rectangle2[2])
+    bottom = max(rectangle1[1] + rectangle1[3], rectangle2[1] + rectangle2[3])
+
+    # Same row and touching on the left or right
+    if(rectangle1[1] == rectangle2[1] and rectangle1[3] == rectangle2[3] and
+       rectangle1[0] <= rectangle2[0] + rectangle2[2] and rectangle2[0] <= rectangle1[0] + rectangle1[2]):
+        return [left, top, right - left, bottom - top]
+
+    # Same column and touching on the top or bottom
+    if(rectangle1[0] == rectangle2[0] and rectangle1[2] == rectangle2[2] and
+       rectangle1[1] <= rectangle2[1] + rectangle2[3] and rectangle2[1] <= rectangle1[1] + rectangle1[3]):
+        return [left, top, right - left, bottom - top]
+
+    return None
+
+def subtractIntervals(start, end, coveredIntervals):
+    '''
+    Finds the parts of an interval that are not covered.
+
+    Parameters
+    ----------
+    start: float
+        The start of the interval
+
+    end: float
+        The end of the interval
+
+    coveredIntervals: List<Tuple<float>> [(start, end), ...]
+        The parts of the interval that are covered
+
+    Returns
+    -------
+    List<Tuple<float>> [(start, end), ...]
+        The parts of the interval that are not covered, in order
+    '''
+    uncovered = []
+    position = start
+    for coveredStart, coveredEnd in sorted(coveredIntervals):
+        if(coveredEnd <= position): continue
+        if(coveredStart >= end): break
+
+        if(coveredStart > position): uncovered.append((position, coveredStart))
+        position = max(position, coveredEnd)
+
+    if(position < end): uncovered.append((position, end))
+
+    return uncovered
+
+def findEdges(rectangle, rectangles):
+    '''
+    Finds the edges of a rectangle that are not covered by other rectangles.
+
+    A part of an edge is covered if the area just outside of it is inside another rectangle,
+    so it can never be reached from outside the walls.
+
+    Parameters
+    ----------
+    rectangle: List<float> [left, top, width, height]
+        The rectangle whose edges are found
+
+    rectangles: List<List<float>> [[left, top, width, height], ...]
+        Every rectangle, including this one
+
+    Returns
+    -------
+    List<List<float>> [[x1, y1, x2, y2, normalX, normalY], ...]
+        The uncovered parts of the edges, from the lower to the higher x and y, and the direction they face
+
+    int
+        The number of sides that are covered completely
+    '''
+    left = rectangle[0]
+    top = rectangle[1]
+    right = rectangle[0] + rectangle[2]
+    bottom = rectangle[1] + rectangle[3]
+
+    coveredTop = []
+    coveredBottom = []
+    coveredLeft = []
+    coveredRight = []
+
+    for other in rectangles:
+        if(other is rectangle): continue
+
+        otherLeft = other[0]
+        otherTop = other[1]
+        otherRight = other[0] + other[2]
+        otherBottom = other[1] + other[3]
+
+        # Rectangles that cover the area just outside each edge
+        if(otherTop < top <= otherBottom): coveredTop.append((otherLeft, otherRight))
+        if(otherTop <= bottom < otherBottom): coveredBottom.append((otherLeft, otherRight))
+        if(otherLeft < left <= otherRight): coveredLeft.append((otherTop, otherBottom))
+        if(otherLeft <= right < otherRight): coveredRight.append((otherTop, otherBottom))
+
+    sides = [[[start, top, end, top, 0, -1] for start, end in subtractIntervals(left, right, coveredTop)],
+             [[start, bottom, end, bottom, 0, 1] for start, end in subtractIntervals(left, right, coveredBottom)],
+             [[left, start, left, end, -1, 0] for start, end in subtractIntervals(top, bottom, coveredLeft)],
+             [[right, start, right, end, 1, 0] for start, end in subtractIntervals(top, bottom, coveredRight)]]
+
+    return [edge for side in sides for edge in side], sum(len(side) == 0 for side in sides)
+
+def compileWalls(walls):
+    '''
+    Simplifies the walls of a level.
+
+    Removes walls that are covered by other walls, joins walls of the same color that
+    together make a rectangle, then finds the edges of each wall that are not covered
+    by other walls. The edges are stored in wall.edges and are the only ones rays are cast against.
+
+    Parameters
+    ----------
+    walls: List<Wall()>
+        The walls that are in the level
+
+    Returns
+    -------
+    List<Wall()>
+        The simplified walls
+
+    List<List<float>> [[x1, y1, x2, y2, normalX, normalY], ...]
+        Every edge of the simplified walls that can be reached
+
+    int
+        The number of walls that were removed
+
+    int
+        The number of sides of the simplified walls that were removed
+    '''
+    rectangles = [(list(wall.rectangle), wall.color) for wall in walls]
+
+    # Keep joining walls until no more can be joined
+    merged = True
+    while(merged):
+        merged = False
+
+        for firstNumber in range(len(rectangles)):
+            secondNumber = firstNumber + 1
+            while(secondNumber < len(rectangles)):
+                first, firstColor = rectangles[firstNumber]
+                second, secondColor = rectangles[secondNumber]
+
+                mergedRectangle = mergeRectangles(first, second) if firstColor == secondColor else None
+
+                # Replace the first wall with the joined wall and check the rest of the walls again
+                if(not mergedRectangle == None):
+                    rectangles[firstNumber] = (mergedRectangle, firstColor)
+                    del rectangles[secondNumber]
+                    secondNumber = firstNumber + 1
+                    merged = True
+                else:
+                    secondNumber += 1
+
+    compiledWalls = [Wall(rectangle, color) for rectangle, color in rectangles]
+
+    edges = []
+    removedSides = 0
+    for wall in compiledWalls:
+        wall.edges, coveredSides = findEdges(wall.rectangle, [compiledWall.rectangle for compiledWall in compiledWalls])
+        edges += wall.edges
+        removedSides += coveredSides
+
+    return compiledWalls, edges, len(walls) - len(compiledWalls), removedSides
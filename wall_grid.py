@@ -0,0 +1,167 @@
+import math
+
+class WallGrid():
+    '''
+    WallGrid
+
+    A uniform grid that stores each wall in every cell its rectangle overlaps
+    so that only the walls near a position need to be tested.
+
+    FUNCTIONS
+        __init__(self, walls, cellSizeIn)
+            Creates a grid containing the walls.
+
+        getCells(self, left, top, right, bottom)
+            Returns the cells that overlap an area.
+
+        insert(self, wall)
+            Adds a wall to the cells its rectangle overlaps.
+
+        update(self, wall)
+            Moves a wall to the cells its rectangle now overlaps.
+
+        getNearby(self, position, radius)
+            Returns the walls in the cells that cover a radius around a position.
+    '''
+    def __init__(self, walls, cellSizeIn):
+        '''
+        Initializes a WallGrid
+
+        Parameters
+        ----------
+        walls: List<Wall()>
+            The walls that are in the level.
+
+        cellSizeIn: int or float
+            The width and height of each cell.
+
+        Returns
+        -------
+        None
+
+        Raises:
+        -------
+        ValueError
+            If one of the given values is not of the correct type and will cause errors later in the code.
+        '''
+        # Check if the input values are bad
+        if(not type(walls) is list): raise ValueError(f'Parameter 1 walls must be of type list not {type(walls)}')
+        if(not type(cellSizeIn) in (int, float)): raise ValueError(f'Parameter 2 cellSizeIn must be of type int or float not {type(cellSizeIn)}')
+        if(not cellSizeIn > 0): raise ValueError(f'Parameter 2 cellSizeIn must be greater than 0 not {cellSizeIn}')
+
+        self.cellSize = cellSizeIn
+
+        # cell -> walls that overlap that cell
+        self.cells = {}
+
+        # wall -> the cells it is stored in
+        self.wallCells = {}
+
+        # wall -> the order it was inserted in
+        # used to return walls in the same order as the original list
+        self.wallOrder = {}
+        self.insertCount = 0
+
+        for wall in walls:
+            self.insert(wall)
+
+    def getCells(self, left, top, right, bottom):
+        '''
+        Finds the cells that overlap an area.
+
+        Parameters
+        ----------
+        left, top, right, bottom: float
+            The sides of the area.
+
+        Returns
+        -------
+        List<Tuple<int>> [(column, row), ...]
+            The cells that overlap the area.
+        '''
+        return [(column, row)
+                for column in range(math.floor(left / self.cellSize), math.floor(right / self.cellSize) + 1)
+                for row in range(math.floor(top / self.cellSize), math.floor(bottom / self.cellSize) + 1)]
+
+    def insert(self, wall):
+        '''
+        Adds a wall to the grid.
+
+        Parameters
+        ----------
+        wall: Wall()
+            The wall that will be added.
+
+        Returns
+        -------
+        None
+        '''
+        cells = self.getCells(wall.rectangle[0], wall.rectangle[1],
+                              wall.rectangle[0] + wall.rectangle[2], wall.rectangle[1] + wall.rectangle[3])
+
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(wall)
+
+        self.wallCells[wall] = cells
+        self.wallOrder[wall] = self.insertCount
+        self.insertCount += 1
+
+    def update(self, wall):
+        '''
+        Updates the cells of a wall.
+
+        Call this after a wall moves. Only the cells of that wall are changed
+        and it keeps its place in the order walls are returned in.
+
+        Parameters
+        ----------
+        wall: Wall()
+            A wall that was inserted into the grid.
+
+        Returns
+        -------
+        None
+        '''
+        oldCells = self.wallCells.get(wall)
+        if(oldCells == None): return
+
+        newCells = self.getCells(wall.rectangle[0], wall.rectangle[1],
+                                 wall.rectangle[0] + wall.rectangle[2], wall.rectangle[1] + wall.rectangle[3])
+        if(newCells == oldCells): return
+
+        for cell in oldCells:
+            self.cells[cell].remove(wall)
+            if(len(self.cells[cell]) == 0): del self.cells[cell]
+
+        for cell in newCells:
+            self.cells.setdefault(cell, []).append(wall)
+
+        self.wallCells[wall] = newCells
+
+    def getNearby(self, position, radius):
+        '''
+        Finds the walls near a position.
+
+        Returns every wall in the cells that cover the square around the position.
+        This includes every wall within the radius of the position.
+        The walls are returned in the order they were inserted.
+
+        Parameters
+        ----------
+        position: List<float> [x, y]
+            The position to search around.
+
+        radius: float
+            The distance to search.
+
+        Returns
+        -------
+        List<Wall()>
+            The walls that are near the position.
+        '''
+        nearbyWalls = set()
+        for cell in self.getCells(position[0] - radius, position[1] - radius, position[0] + radius, position[1] + radius):
+            nearbyWalls.update(self.cells.get(cell, ()))
+
+        # Keep the same order as the original list so results do not depend on the grid
+        return sorted(nearbyWalls, key = self.wallOrder.__getitem__)